@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Throughput and memory of the review pipeline
+Demonstrates reproducible performance measurement with regression checks
+
+Generates a deterministic synthetic corpus (synthetic_data.py) and times
+each pipeline stage: JSONL import, columnar load, statistics, topic
+extraction (words and phrases), sentiment, merge, export and - against a
+local mock Ollama server (mock_ollama.py) - the LLM insight paths. Every
+stage reports items/second and the process peak RSS so far.
+
+Usage:
+    python scripts/benchmark.py --scale 10k --save-baseline
+    python scripts/benchmark.py --scale 10k          # compare to baseline
+    python scripts/benchmark.py --scale 10k --check  # CI: a missing baseline fails too
+
+Baselines for 10k and 1m are committed in benchmark_baseline.json; 10m
+has none until one is recorded with --save-baseline.
+
+A stage whose throughput falls more than
+PerformanceConfig.BENCHMARK_REGRESSION_TOLERANCE below the baseline is
+reported as a regression and the exit status is 1. With --check, a
+missing baseline for the scale is an error (exit status 2) rather than a
+note.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+from config import PerformanceConfig
+from data_import import DataImporter
+from mock_ollama import MockOllamaServer
+from ollama_integration import OllamaClient, OllamaConfig, ProductReviewAnalyzer
+from review_analyzer import ReviewAnalyzer
+from synthetic_data import SCALES, SyntheticCorpus
+from topic_tokens import count_topic_phrases, count_topic_words
+
+
+BASELINE_FILE = Path(__file__).parent / "benchmark_baseline.json"
+
+# LLM stages use a fixed workload regardless of corpus scale
+LLM_PRODUCTS = 48
+LLM_MAP_REDUCE_REVIEWS = 2000
+
+
+def legacy_topic_counts(texts: Iterable[str]) -> Counter:
+    """
+    Topic word counts the way ReviewAnalyzer computed them before the
+    streaming tokenizer: every token of the corpus in one list, filtered
+    in a second pass. Kept as the reference for --compare-topics.
+    """
+    all_words = []
+
+    for text in texts:
+        words = re.findall(r'\b\w+\b', text.lower())
+        all_words.extend(words)
+
+    stop_words = {
+        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+        'of', 'is', 'was', 'are', 'be', 'been', 'it', 'this', 'that', 'with'
+    }
+
+    filtered_words = [w for w in all_words if w not in stop_words and len(w) > 3]
+    return Counter(filtered_words)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+@dataclass
+class StageResult:
+    """Timing of one benchmark stage"""
+    name: str
+    items: int
+    seconds: float
+    items_per_second: float
+    peak_rss_mb: Optional[float]
+
+
+class PipelineBenchmark:
+    """Runs the pipeline stages on a synthetic corpus in a scratch directory"""
+
+    def __init__(self, scale: str = "10k", seed: int = 42, workers: Optional[int] = None,
+                 llm_latency: float = 0.05, repeat: int = 3, verbose: bool = False,
+                 compare_topics: bool = False):
+        """
+        Args:
+            scale: Corpus size name from synthetic_data.SCALES
+            seed: Corpus seed (same seed, same corpus)
+            workers: Processes for the parallel stages (defaults to CPU count)
+            llm_latency: Mock Ollama latency per request, in seconds
+            repeat: Runs per stage; the fastest is reported, which keeps
+                scheduler noise out of the regression check
+            verbose: Show the pipeline's own progress output
+            compare_topics: Also time legacy_topic_counts() as a
+                topics_legacy stage (it holds every token of the corpus,
+                so it runs last and raises the peak RSS of later stages)
+        """
+        self.scale = scale
+        self.review_count = SCALES[scale]
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.llm_latency = llm_latency
+        self.repeat = max(1, repeat)
+        self.verbose = verbose
+        self.compare_topics = compare_topics
+        self.results: List[StageResult] = []
+
+    def _stage(self, name: str, items: int, func: Callable[[], Any]) -> Any:
+        """Time one stage (best of `repeat` runs) and record its result"""
+        elapsed = float('inf')
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            if self.verbose:
+                value = func()
+            else:
+                with redirect_stdout(io.StringIO()):
+                    value = func()
+            elapsed = min(elapsed, time.perf_counter() - start)
+
+        result = StageResult(
+            name=name,
+            items=items,
+            seconds=round(elapsed, 3),
+            items_per_second=round(items / elapsed, 1) if elapsed else 0.0,
+            peak_rss_mb=peak_rss_mb()
+        )
+        self.results.append(result)
+        print(f"  {name:<22} {result.items:>11,} items  {result.seconds:>9.3f}s  "
+              f"{result.items_per_second:>12,.0f}/s  peak RSS {result.peak_rss_mb} MB")
+        return value
+
+    def run(self) -> List[StageResult]:
+        """Run every stage and return the results"""
+        count = self.review_count
+        corpus = SyntheticCorpus(self.seed)
+
+        with tempfile.TemporaryDirectory(prefix="review_benchmark_") as work_dir:
+            work = Path(work_dir)
+            reviews_path = str(work / "reviews.jsonl")
+            extra_path = str(work / "additional_reviews.jsonl")
+            importer = DataImporter(data_dir=work_dir)
+
+            self._stage("generate", count, lambda: corpus.write_reviews_jsonl(reviews_path, count))
+            # Overlapping second file for the merge stage (same seed, same IDs)
+            extra_count = max(1, count // 10)
+            SyntheticCorpus(self.seed).write_reviews_jsonl(extra_path, extra_count)
+
+            self._stage("import_jsonl", count, lambda: sum(1 for _ in importer.iter_jsonl_reviews(reviews_path)))
+            self._stage("import_jsonl_parallel", count, lambda: sum(
+                1 for _ in importer.iter_jsonl_reviews_parallel(reviews_path, self.workers)
+            ))
+            store = self._stage("load_review_store", count, lambda: importer.load_review_store(reviews_path))
+
+            self._stage("statistics", count, lambda: importer.get_statistics(store))
+            self._stage("product_statistics", count, lambda: importer.get_product_statistics(store))
+
+            analyzer = ReviewAnalyzer()
+            self._stage("topics", count, lambda: self._topics(store))
+            self._stage("topic_phrases", count, lambda: self._topics(store, phrases=True))
+            self._stage("sentiment", count, lambda: self._sentiment(analyzer, store))
+            self._stage("store_metrics", count, lambda: analyzer.calculate_store_metrics(store))
+
+            self._stage("merge", count + extra_count, lambda: importer.merge_reviews_to_file(
+                reviews_path, extra_path, file_name="merged.jsonl"
+            ))
+            self._stage("export_jsonl", count, lambda: importer.export_reviews_jsonl(
+                importer.iter_jsonl_reviews(reviews_path), "export.jsonl"
+            ))
+            self._stage("export_snapshot", count, lambda: importer.export_reviews_snapshot(store, "export.revsnap"))
+
+            self._llm_stages(corpus)
+
+            if self.compare_topics:
+                self._compare_topics(store)
+            store.close()
+
+        return self.results
+
+    @staticmethod
+    def _review_batches(store, size: int = 10000):
+        """The store's reviews as ReviewAnalyzer dicts, a batch at a time"""
+        for start in range(0, len(store), size):
+            yield [
+                {'product_id': store.product_ids[row], 'rating': store.ratings[row], 'review_text': store.text(row)}
+                for row in range(start, min(start + size, len(store)))
+            ]
+
+    @staticmethod
+    def _topics(store, phrases: bool = False) -> List[str]:
+        """Topic (or two-word phrase) extraction over the whole corpus"""
+        texts = map(store.text, range(len(store)))
+        word_counts = count_topic_phrases(texts) if phrases else count_topic_words(texts)
+        return [word for word, _ in word_counts.most_common(10)]
+
+    def _compare_topics(self, store) -> None:
+        """Time the pre-streaming topic extraction and report the speedup"""
+        legacy = self._stage("topics_legacy", len(store), lambda: [
+            word for word, _ in legacy_topic_counts(map(store.text, range(len(store)))).most_common(10)
+        ])
+        current = next(result for result in self.results if result.name == "topics")
+        speedup = self.results[-1].seconds / current.seconds if current.seconds else 0.0
+        same = "same topics" if legacy == self._topics(store) else "✗ DIFFERENT topics"
+        print(f"  topics vs topics_legacy: {speedup:.1f}x faster, {same}")
+
+    def _sentiment(self, analyzer: ReviewAnalyzer, store) -> str:
+        """Sentiment tally over the whole corpus"""
+        positive = negative = 0
+        for batch in self._review_batches(store):
+            p, n = analyzer.tally_sentiment(batch)
+            positive += p
+            negative += n
+        return analyzer.summarize_sentiment(positive, negative)
+
+    def _llm_stages(self, corpus: SyntheticCorpus) -> None:
+        """Insight generation against the mock server (response cache off)"""
+        reviews = list(corpus.iter_reviews(LLM_MAP_REDUCE_REVIEWS, product_count=LLM_PRODUCTS))
+        by_product: Dict[int, List[Dict]] = {}
+        for review in reviews:
+            by_product.setdefault(review['product_id'], []).append(review)
+        # Long-tail products: a handful of reviews each
+        items = [(f"Product {pid}", by_product.get(pid, [])[:5]) for pid in range(1, LLM_PRODUCTS + 1)]
+
+        with MockOllamaServer(latency=self.llm_latency) as server:
+            config = OllamaConfig(host="http://127.0.0.1", port=server.port)
+            client = OllamaClient(config, cache=False)  # Every call must reach the server
+            insights = ProductReviewAnalyzer(client)
+            try:
+                self._stage("llm_insights", len(items), lambda: [
+                    insights.generate_insights(name, product_reviews, 4.0, len(product_reviews))
+                    for name, product_reviews in items
+                ])
+                self._stage("llm_insights_batched", len(items), lambda: list(
+                    insights.generate_insights_batch(items)
+                ))
+                self._stage("llm_map_reduce", len(reviews), lambda: client.analyze_product_reviews_map_reduce(
+                    "Popular Product", reviews
+                ))
+            finally:
+                client.close()
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> Dict[str, Any]:
+    """Stored baselines keyed by scale, or {} if there are none"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(scale: str, results: List[StageResult], path: Path = BASELINE_FILE) -> None:
+    """Store these results as the baseline for their scale"""
+    baseline = load_baseline(path)
+    baseline[scale] = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'recorded_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'stages': {result.name: asdict(result) for result in results}
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+
+
+def find_regressions(
+    results: List[StageResult],
+    baseline: Dict[str, Any],
+    tolerance: float = PerformanceConfig.BENCHMARK_REGRESSION_TOLERANCE
+) -> List[str]:
+    """Describe every stage that is slower than its baseline by more than tolerance"""
+    stages = baseline.get('stages', {})
+    regressions = []
+    for result in results:
+        previous = stages.get(result.name)
+        if not previous or not previous['items_per_second']:
+            continue
+        ratio = result.items_per_second / previous['items_per_second']
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{result.name}: {result.items_per_second:,.0f}/s vs baseline "
+                f"{previous['items_per_second']:,.0f}/s ({(ratio - 1) * 100:+.0f}%)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point; returns the exit status"""
+    parser = argparse.ArgumentParser(description="Benchmark the review pipeline")
+    parser.add_argument("--scale", choices=sorted(SCALES, key=SCALES.get), default="10k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None, help="Processes for parallel stages")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Mock Ollama latency (seconds)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (fastest is kept)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Fail if there is no baseline to compare to")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="Baseline file")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline output")
+    parser.add_argument("--compare-topics", action="store_true",
+                        help="Also time the original list-based topic extraction (memory-hungry)")
+    args = parser.parse_args(argv)
+
+    print(f"⏱  Review pipeline benchmark - {SCALES[args.scale]:,} reviews (seed {args.seed})\n")
+    benchmark = PipelineBenchmark(
+        args.scale, args.seed, args.workers, args.llm_latency, args.repeat, args.verbose,
+        args.compare_topics
+    )
+    results = benchmark.run()
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        save_baseline(args.scale, results, baseline_path)
+        print(f"\n✓ Baseline for {args.scale} saved to {baseline_path}")
+        return 0
+
+    baseline = load_baseline(baseline_path).get(args.scale)
+    if not baseline:
+        if args.check:
+            print(f"\n✗ Warning: no {args.scale} baseline in {baseline_path}, so nothing was checked; "
+                  f"run with --save-baseline to record one")
+            return 2
+        print(f"\nNo {args.scale} baseline in {baseline_path}; run with --save-baseline to record one")
+        return 0
+
+    regressions = find_regressions(results, baseline)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) against the {args.scale} baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print(f"\n✓ No regressions against the {args.scale} baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
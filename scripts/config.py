@@ -33,11 +33,18 @@ class Config:
     OLLAMA_PORT = 11434
     OLLAMA_MODEL = "llama3.2"
     OLLAMA_TIMEOUT = 60
+    PROMPT_REVIEW_TOKENS = 800  # Estimated tokens of review text quoted per prompt
+    SUMMARY_CHUNK_TOKENS = 2000  # Review tokens per map-reduce summary prompt
+    INSIGHT_BATCH_SIZE = 8  # Products packed into one batched insight prompt
+    BATCH_PRODUCT_REVIEW_TOKENS = 300  # Review tokens per product in a batched prompt
     
     # Data configuration
     DATA_DIRECTORY = str(DATA_DIR)
     PRODUCTS_FILE = "fakestore.json"
     REVIEWS_FILE = "reviews.jsonl"
+    LLM_CACHE_FILE = "llm_cache.sqlite3"
+    TOPIC_DF_FILE = "topic_df.json"  # Corpus document frequencies of topic words
+    TOPIC_PHRASE_DF_FILE = "topic_phrase_df.json"  # ... and of two-word phrases
     BATCH_SIZE = 100
     
     # Database configuration (when PostgreSQL is available)
@@ -56,6 +63,9 @@ class Config:
     MIN_REVIEW_LENGTH = 10  # Minimum characters for a valid review
     MAX_REVIEW_LENGTH = 5000  # Maximum characters for processing
     SENTIMENT_THRESHOLD = 0.6  # Threshold for positive/negative classification
+    NEAR_DUPLICATE_THRESHOLD = 0.8  # Jaccard similarity for near-duplicate reviews
+    MINHASH_PERMUTATIONS = 64  # MinHash signature length
+    DISTINCTIVE_TOPIC_MIN_COUNT = 2  # Occurrences in a product before a term can be distinctive
     
     # Model configuration
     MIN_PRODUCT_RATING = 1
@@ -103,7 +113,8 @@ class SentimentKeywords:
         "disappointed", "disappointing", "poor", "worst", "useless",
         "broken", "defective", "cheap", "slow", "unreliable",
         "hate", "never", "worse", "avoid", "regret",
-        "overpriced", "damaged", "faulty", "fail", "scam"
+        "overpriced", "damaged", "faulty", "fail", "scam",
+        "problem", "issue"
     ]
     
     NEUTRAL_KEYWORDS: List[str] = [
@@ -172,6 +183,13 @@ class LogConfig:
     
     # Number of backup files to keep
     BACKUP_COUNT = 5
+    
+    # Metrics (see metrics.py)
+    METRICS_ENABLED = True
+    METRICS_FILE = SCRIPTS_DIR / "metrics.prom"
+    METRICS_FORMAT = "prometheus"  # or "json"
+    METRICS_PREFIX = "review_intel_"
+    METRICS_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
 
 
 class PerformanceConfig:
@@ -180,11 +198,22 @@ class PerformanceConfig:
     # Cache configuration
     CACHE_ENABLED = True
     CACHE_TTL = 3600  # seconds
+    CACHE_MAX_ENTRIES = 10000  # LRU eviction beyond this
     
     # Batch processing
     BATCH_SIZE = 100
     BATCH_TIMEOUT = 30
     
+    # Parallel review analysis
+    PARALLEL_MIN_REVIEWS = 10000  # Below this, process startup outweighs the gain
+    SHARDS_PER_WORKER = 4
+    PARSE_CHUNK_BYTES = 64 * 1024 * 1024  # Byte range per parallel JSONL parse task
+    MERGE_MEMORY_BYTES = 256 * 1024 * 1024  # Input bytes per on-disk merge partition
+    MERGE_MAX_PARTITIONS = 512  # Partition files open at once during an on-disk merge
+    
+    # Benchmarks (scripts/benchmark.py)
+    BENCHMARK_REGRESSION_TOLERANCE = 0.2  # Flag stages >20% slower than the baseline
+    
     # Connection pool
     POOL_SIZE = 10
     POOL_MAX_OVERFLOW = 20
@@ -200,7 +229,7 @@ class SecurityConfig:
     
     # Input validation
     MAX_INPUT_LENGTH = 10000
-    ALLOWED_FILE_EXTENSIONS = ['.json', '.jsonl', '.csv']
+    ALLOWED_FILE_EXTENSIONS = ['.json', '.jsonl', '.csv', '.revsnap']
     
     # Rate limiting
     RATE_LIMIT_ENABLED = True
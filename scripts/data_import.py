@@ -6,12 +6,26 @@ Demonstrates data processing and file I/O operations
 
 import json
 import csv
+import heapq
 import os
+import tempfile
+import zlib
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+from config import Config, PerformanceConfig
+from metrics import REGISTRY
+from near_duplicates import NearDuplicateDetector
+from rating_trends import RatingTrends
+from review_store import ReviewStore, SNAPSHOT_EXTENSION
+from vectorized_stats import grouped_statistics
+
 
 @dataclass
 class Product:
@@ -38,6 +52,74 @@ class Review:
     helpful_votes: int = 0
 
 
+def _review_from_json(item: Dict[str, Any], line_num: int) -> Review:
+    """Build a Review from one parsed JSONL object"""
+    return Review(
+        id=item.get('id', f'review_{line_num}'),
+        product_id=int(item.get('product_id', 0)),
+        rating=int(item.get('rating', 0)),
+        text=item.get('text', ''),
+        reviewer=item.get('reviewer', 'Anonymous'),
+        date=item.get('date', datetime.now().isoformat()),
+        helpful_votes=int(item.get('helpful_votes', 0))
+    )
+
+
+@dataclass
+class _ParsedChunk:
+    """Result of parsing one byte range of a JSONL file in a worker"""
+    reviews: List[Review]
+    line_count: int
+    # Line numbers below are relative to the start of the chunk
+    fallback_ids: List[Tuple[int, int]]  # (index into reviews, line_num)
+    warnings: List[Tuple[int, str]]  # (line_num, message)
+    error: Optional[str] = None
+
+
+def _split_on_newlines(file_path: str, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """Split a file into (start, end) byte ranges that end on a newline"""
+    size = os.path.getsize(file_path)
+    ranges = []
+    
+    with open(file_path, 'rb') as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()  # Advance to the end of the current line
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    
+    return ranges
+
+
+def _parse_jsonl_chunk(file_path: str, start: int, end: int) -> _ParsedChunk:
+    """Process pool entry point: parse the JSONL lines in [start, end)"""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    
+    lines = data.split(b'\n')
+    if lines and lines[-1] == b'':
+        lines.pop()  # Chunk ends with a newline
+    
+    chunk = _ParsedChunk(reviews=[], line_count=len(lines), fallback_ids=[], warnings=[])
+    for line_num, line in enumerate(lines, 1):
+        try:
+            if line.strip():
+                item = json.loads(line)
+                if 'id' not in item:
+                    chunk.fallback_ids.append((len(chunk.reviews), line_num))
+                chunk.reviews.append(_review_from_json(item, line_num))
+        except json.JSONDecodeError as e:
+            chunk.warnings.append((line_num, str(e)))
+        except Exception as e:
+            chunk.error = str(e)
+            break
+    
+    return chunk
+
+
 class DataImporter:
     """Import and process product and review data"""
 
@@ -88,68 +170,153 @@ class DataImporter:
             print(f"Error importing products: {e}")
             return []
 
-    def import_jsonl_reviews(self, file_path: str) -> List[Review]:
+    def iter_jsonl_reviews(self, file_path: str) -> Iterator[Review]:
         """
-        Import reviews from JSONL file (one JSON object per line)
+        Lazily yield reviews from a JSONL file (one JSON object per line)
+        
+        Only the current line is held in memory, so arbitrarily large
+        files can be processed in constant memory.
         
         Args:
             file_path: Path to JSONL file containing reviews
             
-        Returns:
-            List of Review objects
+        Yields:
+            Review objects in file order
         """
-        reviews = []
-        
+        parsed = rejected = 0
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 for line_num, line in enumerate(f, 1):
                     try:
                         if line.strip():
-                            item = json.loads(line)
-                            review = Review(
-                                id=item.get('id', f'review_{line_num}'),
-                                product_id=int(item.get('product_id', 0)),
-                                rating=int(item.get('rating', 0)),
-                                text=item.get('text', ''),
-                                reviewer=item.get('reviewer', 'Anonymous'),
-                                date=item.get('date', datetime.now().isoformat()),
-                                helpful_votes=int(item.get('helpful_votes', 0))
-                            )
-                            reviews.append(review)
+                            review = _review_from_json(json.loads(line), line_num)
+                            parsed += 1
+                            yield review
                     except json.JSONDecodeError as e:
+                        rejected += 1
                         print(f"Warning: Invalid JSON on line {line_num}: {e}")
                         continue
             
-            return reviews
-            
         except FileNotFoundError:
             print(f"Error: File not found - {file_path}")
-            return []
         except Exception as e:
             print(f"Error importing reviews: {e}")
-            return []
+        finally:
+            # Counted locally and reported once, to keep the row loop cheap
+            REGISTRY.inc("rows_parsed_total", parsed, format="jsonl")
+            REGISTRY.inc("rows_rejected_total", rejected, format="jsonl")
 
-    def import_csv_reviews(self, file_path: str) -> List[Review]:
+    def iter_jsonl_reviews_parallel(
+        self,
+        file_path: str,
+        workers: Optional[int] = None,
+        chunk_bytes: int = PerformanceConfig.PARSE_CHUNK_BYTES
+    ) -> Iterator[Review]:
         """
-        Import reviews from CSV file
+        Parse a JSONL file in byte-range chunks on a process pool
         
-        Expected columns: id, product_id, rating, text, reviewer, date
+        The file is split on newline boundaries and each chunk is parsed
+        by a worker. Results come back in file order with the same
+        per-line warnings, the same review_{line_num} fallback ids and
+        the same stop-on-error behaviour as iter_jsonl_reviews. Only a
+        few chunks are in flight at once, so memory stays bounded.
         
         Args:
-            file_path: Path to CSV file
+            file_path: Path to JSONL file containing reviews
+            workers: Worker processes (defaults to os.cpu_count())
+            chunk_bytes: Target chunk size in bytes
+            
+        Yields:
+            Review objects in file order
+        """
+        try:
+            ranges = _split_on_newlines(file_path, chunk_bytes)
+        except FileNotFoundError:
+            print(f"Error: File not found - {file_path}")
+            return
+        
+        workers = workers or os.cpu_count() or 1
+        line_offset = 0
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            chunks = iter(ranges)
+            
+            for start, end in islice(chunks, workers * 2):
+                pending.append(executor.submit(_parse_jsonl_chunk, file_path, start, end))
+            
+            while pending:
+                chunk = pending.popleft().result()
+                next_range = next(chunks, None)
+                if next_range is not None:
+                    pending.append(executor.submit(_parse_jsonl_chunk, file_path, *next_range))
+                
+                for index, line_num in chunk.fallback_ids:
+                    chunk.reviews[index].id = f'review_{line_offset + line_num}'
+                for line_num, message in chunk.warnings:
+                    print(f"Warning: Invalid JSON on line {line_offset + line_num}: {message}")
+                # Workers have their own registry, so chunk results are counted here
+                REGISTRY.inc("rows_parsed_total", len(chunk.reviews), format="jsonl")
+                REGISTRY.inc("rows_rejected_total", len(chunk.warnings), format="jsonl")
+                
+                yield from chunk.reviews
+                
+                if chunk.error is not None:
+                    print(f"Error importing reviews: {chunk.error}")
+                    for future in pending:
+                        future.cancel()
+                    return
+                line_offset += chunk.line_count
+
+    def import_jsonl_reviews(
+        self,
+        file_path: str,
+        workers: Optional[int] = None,
+        trends: Optional[RatingTrends] = None,
+        near_duplicate_threshold: Optional[float] = None
+    ) -> List[Review]:
+        """
+        Import reviews from JSONL file (one JSON object per line)
+        
+        Args:
+            file_path: Path to JSONL file containing reviews
+            workers: Parse in parallel chunks on this many processes
+            trends: Also count each imported review into these rating trends
+            near_duplicate_threshold: If set, drop reviews whose text is a
+                near-duplicate (Jaccard >= threshold) of an earlier one
             
         Returns:
             List of Review objects
         """
-        reviews = []
+        with REGISTRY.timer(stage="import_jsonl"):
+            if workers and workers > 1:
+                reviews = self.iter_jsonl_reviews_parallel(file_path, workers)
+            else:
+                reviews = self.iter_jsonl_reviews(file_path)
+            if near_duplicate_threshold is not None:
+                reviews = self.filter_near_duplicates(reviews, near_duplicate_threshold)
+            return list(trends.track(reviews) if trends is not None else reviews)
+
+    def iter_csv_reviews(self, file_path: str) -> Iterator[Review]:
+        """
+        Lazily yield reviews from a CSV file
         
+        Expected columns: id, product_id, rating, text, reviewer, date
+        
+        Args:
+            file_path: Path to CSV file
+            
+        Yields:
+            Review objects in file order
+        """
+        parsed = rejected = 0
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 
                 if reader.fieldnames is None:
                     print("Error: Empty CSV file")
-                    return []
+                    return
                 
                 for row in reader:
                     try:
@@ -162,20 +329,153 @@ class DataImporter:
                             date=row.get('date', datetime.now().isoformat()),
                             helpful_votes=int(row.get('helpful_votes', 0))
                         )
-                        reviews.append(review)
                     except (ValueError, KeyError) as e:
+                        rejected += 1
                         print(f"Warning: Error processing row: {e}")
                         continue
-            
-            return reviews
+                    parsed += 1
+                    yield review
             
         except FileNotFoundError:
             print(f"Error: File not found - {file_path}")
-            return []
         except Exception as e:
             print(f"Error importing CSV: {e}")
-            return []
+        finally:
+            REGISTRY.inc("rows_parsed_total", parsed, format="csv")
+            REGISTRY.inc("rows_rejected_total", rejected, format="csv")
+
+    def import_csv_reviews(
+        self,
+        file_path: str,
+        trends: Optional[RatingTrends] = None,
+        near_duplicate_threshold: Optional[float] = None
+    ) -> List[Review]:
+        """
+        Import reviews from CSV file
+        
+        Expected columns: id, product_id, rating, text, reviewer, date
+        
+        Args:
+            file_path: Path to CSV file
+            trends: Also count each imported review into these rating trends
+            near_duplicate_threshold: If set, drop reviews whose text is a
+                near-duplicate (Jaccard >= threshold) of an earlier one
+            
+        Returns:
+            List of Review objects
+        """
+        with REGISTRY.timer(stage="import_csv"):
+            reviews = self.iter_csv_reviews(file_path)
+            if near_duplicate_threshold is not None:
+                reviews = self.filter_near_duplicates(reviews, near_duplicate_threshold)
+            return list(trends.track(reviews) if trends is not None else reviews)
+
+    def iter_snapshot_reviews(self, file_path: str) -> Iterator[Review]:
+        """
+        Lazily yield reviews from a binary snapshot
+        
+        Rows come back exactly as they were stored (same id types and
+        date strings), so a snapshot merges with its source files by ID.
+        The memory mapping is released once iteration ends.
+        
+        Args:
+            file_path: Path to snapshot file
+            
+        Yields:
+            Review objects in snapshot order
+        """
+        store = self.import_review_snapshot(file_path)
+        if store is None:
+            return
+        try:
+            yield from store
+        finally:
+            store.close()
+
+    def iter_reviews(self, file_path: str) -> Iterator[Review]:
+        """
+        Lazily yield reviews from a JSONL, CSV or snapshot file, chosen by extension
+        
+        Args:
+            file_path: Path to review file
+            
+        Yields:
+            Review objects in file order
+        """
+        if file_path.endswith('.jsonl'):
+            return self.iter_jsonl_reviews(file_path)
+        elif file_path.endswith('.csv'):
+            return self.iter_csv_reviews(file_path)
+        elif file_path.endswith(SNAPSHOT_EXTENSION):
+            return self.iter_snapshot_reviews(file_path)
+        else:
+            print(f"Warning: Unsupported file format - {file_path}")
+            return iter(())
+
+    def load_review_store(
+        self,
+        file_path: str,
+        trends: Optional[RatingTrends] = None,
+        near_duplicate_threshold: Optional[float] = None
+    ) -> ReviewStore:
+        """
+        Import reviews into a compact columnar ReviewStore
+        
+        Reviews are streamed from the file straight into the store, so
+        no intermediate list of Review objects is built. A review whose
+        numbers do not fit the store's columns is skipped with a warning.
+        
+        Args:
+            file_path: Path to JSONL or CSV review file
+            trends: Also count each stored review into these rating trends
+            near_duplicate_threshold: If set, drop reviews whose text is a
+                near-duplicate (Jaccard >= threshold) of an earlier one
+            
+        Returns:
+            ReviewStore holding every storable review in the file
+        """
+        with REGISTRY.timer(stage="load_review_store"):
+            reviews = self.iter_reviews(file_path)
+            if near_duplicate_threshold is not None:
+                reviews = self.filter_near_duplicates(reviews, near_duplicate_threshold)
+            store = ReviewStore()
+            stored = self._append_to_store(store, reviews)
+            for _ in (trends.track(stored) if trends is not None else stored):
+                pass
+            return store
+
+    @staticmethod
+    def _append_to_store(store: ReviewStore, reviews: Iterable[Review]) -> Iterator[Review]:
+        """Append reviews to a store, yielding each one that fit"""
+        for review in reviews:
+            try:
+                store.append(review)
+            except (OverflowError, TypeError) as e:
+                print(f"Warning: Review {review.id} does not fit the store: {e}")
+                continue
+            yield review
+
+    @staticmethod
+    def iter_batches(reviews: Iterable[Review], batch_size: Optional[int] = None) -> Iterator[List[Review]]:
+        """
+        Group a review stream into fixed-size batches
+        
+        Args:
+            reviews: Any iterable of Review objects (list or generator)
+            batch_size: Reviews per batch (defaults to Config.BATCH_SIZE)
+            
+        Yields:
+            Lists of at most batch_size reviews; the last may be shorter
+        """
+        batch_size = batch_size or Config.BATCH_SIZE
+        iterator = iter(reviews)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
 
+    @REGISTRY.timed("export_products_json")
     def export_products_json(self, products: List[Product], file_name: str = "products.json") -> bool:
         """
         Export products to JSON file
@@ -205,12 +505,13 @@ class DataImporter:
             print(f"Error exporting products: {e}")
             return False
 
-    def export_reviews_jsonl(self, reviews: List[Review], file_name: str = "reviews.jsonl") -> bool:
+    @REGISTRY.timed("export_jsonl")
+    def export_reviews_jsonl(self, reviews: Iterable[Review], file_name: str = "reviews.jsonl") -> bool:
         """
         Export reviews to JSONL file
         
         Args:
-            reviews: List of Review objects
+            reviews: Any iterable of Review objects (list or generator)
             file_name: Output file name
             
         Returns:
@@ -219,23 +520,26 @@ class DataImporter:
         try:
             file_path = self.data_dir / file_name
             
+            count = 0
             with open(file_path, 'w', encoding='utf-8') as f:
                 for review in reviews:
                     f.write(json.dumps(asdict(review), ensure_ascii=False) + '\n')
+                    count += 1
             
-            print(f"✓ Exported {len(reviews)} reviews to {file_path}")
+            print(f"✓ Exported {count} reviews to {file_path}")
             return True
             
         except Exception as e:
             print(f"Error exporting reviews: {e}")
             return False
 
-    def export_reviews_csv(self, reviews: List[Review], file_name: str = "reviews.csv") -> bool:
+    @REGISTRY.timed("export_csv")
+    def export_reviews_csv(self, reviews: Iterable[Review], file_name: str = "reviews.csv") -> bool:
         """
         Export reviews to CSV file
         
         Args:
-            reviews: List of Review objects
+            reviews: Any iterable of Review objects (list or generator)
             file_name: Output file name
             
         Returns:
@@ -249,105 +553,414 @@ class DataImporter:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 
                 writer.writeheader()
+                count = 0
                 for review in reviews:
                     writer.writerow(asdict(review))
+                    count += 1
             
-            print(f"✓ Exported {len(reviews)} reviews to {file_path}")
+            print(f"✓ Exported {count} reviews to {file_path}")
             return True
             
         except Exception as e:
             print(f"Error exporting to CSV: {e}")
             return False
 
-    def merge_reviews(self, *file_paths: str) -> List[Review]:
+    def iter_merged_reviews(
+        self,
+        *file_paths: str,
+        near_duplicate_threshold: Optional[float] = None
+    ) -> Iterator[Review]:
+        """
+        Lazily merge reviews from multiple files, skipping duplicate IDs
+        
+        Only the set of seen review IDs is kept in memory; reviews are
+        streamed straight through, so the result can be fed to an exporter
+        or get_statistics without materializing the merged corpus.
+        
+        Args:
+            *file_paths: Variable number of file paths to merge
+            near_duplicate_threshold: If set, also drop reviews whose text
+                is a near-duplicate (Jaccard >= threshold) of an earlier one
+            
+        Yields:
+            Unique Review objects, first occurrence wins
+        """
+        reviews = self._iter_unique_ids(file_paths)
+        if near_duplicate_threshold is not None:
+            reviews = self.filter_near_duplicates(reviews, near_duplicate_threshold)
+        yield from reviews
+
+    def _iter_unique_ids(self, file_paths: Iterable[str]) -> Iterator[Review]:
+        """Stream reviews from each file, skipping IDs already seen"""
+        seen_ids = set()
+        
+        for file_path in file_paths:
+            for review in self.iter_reviews(file_path):
+                if review.id not in seen_ids:
+                    seen_ids.add(review.id)
+                    yield review
+
+    @staticmethod
+    def filter_near_duplicates(
+        reviews: Iterable[Review],
+        threshold: float = Config.NEAR_DUPLICATE_THRESHOLD
+    ) -> Iterator[Review]:
+        """
+        Drop reviews whose text nearly repeats an earlier review's
+        
+        Uses MinHash/LSH (see near_duplicates.py), so memory grows with
+        the reviews kept rather than with pairwise comparisons.
+        
+        Args:
+            reviews: Reviews in ingest order
+            threshold: Estimated Jaccard similarity that counts as a duplicate
+            
+        Yields:
+            Reviews that are not near-duplicates, first occurrence wins
+        """
+        detector = NearDuplicateDetector(threshold=threshold)
+        yield from detector.filter(reviews)
+        
+        stats = detector.stats()
+        if stats['duplicates']:
+            print(f"Skipped {stats['duplicates']} near-duplicate reviews out of {stats['checked']}")
+
+    @REGISTRY.timed("merge")
+    def merge_reviews(
+        self,
+        *file_paths: str,
+        near_duplicate_threshold: Optional[float] = None
+    ) -> List[Review]:
         """
         Merge reviews from multiple files
         
         Args:
             *file_paths: Variable number of file paths to merge
+            near_duplicate_threshold: If set, also drop near-duplicate texts
             
         Returns:
             Combined list of Review objects
         """
-        all_reviews = []
+        return list(self.iter_merged_reviews(
+            *file_paths, near_duplicate_threshold=near_duplicate_threshold
+        ))
+
+    def iter_merged_reviews_external(
+        self,
+        *file_paths: str,
+        memory_budget: int = PerformanceConfig.MERGE_MEMORY_BYTES,
+        temp_dir: Optional[str] = None
+    ) -> Iterator[Review]:
+        """
+        Merge and deduplicate reviews in bounded memory
         
-        for file_path in file_paths:
-            if file_path.endswith('.jsonl'):
-                reviews = self.import_jsonl_reviews(file_path)
-            elif file_path.endswith('.csv'):
-                reviews = self.import_csv_reviews(file_path)
-            else:
-                print(f"Warning: Unsupported file format - {file_path}")
-                continue
+        Pass 1 streams every input once and hash-partitions the reviews
+        by ID into temporary files, each tagged with its position in the
+        input. Pass 2 deduplicates one partition at a time, so only that
+        partition's IDs are held in memory. The surviving reviews are then
+        k-way merged by position, which gives exactly the output order of
+        iter_merged_reviews (first occurrence wins).
+        
+        At most PerformanceConfig.MERGE_MAX_PARTITIONS partitions are
+        used, since all of them are open during pass 1; inputs larger
+        than that many budgets get bigger partitions, with a warning.
+        
+        Args:
+            *file_paths: Variable number of file paths to merge
+            memory_budget: Approximate bytes of input per partition
+            temp_dir: Directory for partition files (system default if None)
             
-            all_reviews.extend(reviews)
+        Yields:
+            Unique Review objects in first-occurrence order
+        """
+        input_bytes = sum(os.path.getsize(p) for p in file_paths if os.path.exists(p))
+        partition_count = max(1, -(-input_bytes // max(1, memory_budget)))
+        # Every partition is open at once during pass 1; stay under fd limits
+        if partition_count > PerformanceConfig.MERGE_MAX_PARTITIONS:
+            partition_count = PerformanceConfig.MERGE_MAX_PARTITIONS
+            print(f"Warning: {input_bytes} input bytes need more than {partition_count} partitions; "
+                  f"each will hold about {input_bytes // partition_count} bytes, over the "
+                  f"{memory_budget}-byte memory budget")
         
-        # Remove duplicates based on review ID
-        unique_reviews = {}
-        for review in all_reviews:
-            if review.id not in unique_reviews:
-                unique_reviews[review.id] = review
+        with tempfile.TemporaryDirectory(prefix="review_merge_", dir=temp_dir) as work_dir:
+            work_path = Path(work_dir)
+            
+            # Pass 1: hash-partition by review ID
+            partitions = [
+                open(work_path / f"partition_{i}.jsonl", 'w', encoding='utf-8')
+                for i in range(partition_count)
+            ]
+            try:
+                position = 0
+                for file_path in file_paths:
+                    for review in self.iter_reviews(file_path):
+                        review_id = str(review.id)
+                        partition = zlib.crc32(review_id.encode('utf-8')) % partition_count
+                        partitions[partition].write(
+                            json.dumps([position, asdict(review)], ensure_ascii=False) + '\n'
+                        )
+                        position += 1
+            finally:
+                for partition in partitions:
+                    partition.close()
+            
+            # Pass 2: deduplicate each partition; survivors stay in position order
+            runs = []
+            for i in range(partition_count):
+                seen_ids = set()
+                run_path = work_path / f"run_{i}.jsonl"
+                with open(work_path / f"partition_{i}.jsonl", 'r', encoding='utf-8') as src, \
+                        open(run_path, 'w', encoding='utf-8') as dst:
+                    for line in src:
+                        review_id = json.loads(line)[1]['id']
+                        if review_id not in seen_ids:
+                            seen_ids.add(review_id)
+                            dst.write(line)
+                (work_path / f"partition_{i}.jsonl").unlink()
+                runs.append(run_path)
+            
+            # Pass 3: k-way merge of the runs by input position
+            run_files = [open(run, 'r', encoding='utf-8') for run in runs]
+            try:
+                streams = [map(json.loads, f) for f in run_files]
+                for _, item in heapq.merge(*streams, key=lambda entry: entry[0]):
+                    yield Review(**item)
+            finally:
+                for f in run_files:
+                    f.close()
+
+    @REGISTRY.timed("merge_to_file")
+    def merge_reviews_to_file(
+        self,
+        *file_paths: str,
+        file_name: str = "merged_reviews.jsonl",
+        memory_budget: int = PerformanceConfig.MERGE_MEMORY_BYTES,
+        near_duplicate_threshold: Optional[float] = None
+    ) -> bool:
+        """
+        Merge review files of any total size straight into a JSONL export
         
-        return list(unique_reviews.values())
+        Args:
+            *file_paths: Variable number of file paths to merge
+            file_name: Output file name (written to the data directory)
+            memory_budget: Approximate bytes of input per partition
+            near_duplicate_threshold: If set, also drop near-duplicate texts
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        reviews = self.iter_merged_reviews_external(*file_paths, memory_budget=memory_budget)
+        if near_duplicate_threshold is not None:
+            reviews = self.filter_near_duplicates(reviews, near_duplicate_threshold)
+        return self.export_reviews_jsonl(reviews, file_name)
 
-    def get_statistics(self, reviews: List[Review]) -> Dict[str, Any]:
+    @REGISTRY.timed("export_snapshot")
+    def export_reviews_snapshot(
+        self,
+        reviews: Iterable[Review],
+        file_name: str = "reviews" + SNAPSHOT_EXTENSION
+    ) -> bool:
+        """
+        Export reviews to a binary columnar snapshot
+        
+        Snapshots reload through memory mapping without any parsing; see
+        ReviewStore.save_snapshot for the layout.
+        
+        Args:
+            reviews: Any iterable of Review objects or a ReviewStore
+            file_name: Output file name
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            file_path = self.data_dir / file_name
+            store = reviews if isinstance(reviews, ReviewStore) else ReviewStore.from_reviews(reviews)
+            store.save_snapshot(str(file_path))
+            
+            print(f"✓ Exported {len(store)} reviews to {file_path}")
+            return True
+            
+        except Exception as e:
+            print(f"Error exporting snapshot: {e}")
+            return False
+
+    def import_review_snapshot(self, file_path: str) -> Optional[ReviewStore]:
+        """
+        Open a binary review snapshot
+        
+        Args:
+            file_path: Path to snapshot file
+            
+        Returns:
+            Read-only, memory-mapped ReviewStore, or None on error
+        """
+        try:
+            return ReviewStore.load_snapshot(file_path)
+        except FileNotFoundError:
+            print(f"Error: File not found - {file_path}")
+            return None
+        except Exception as e:
+            print(f"Error importing snapshot: {e}")
+            return None
+
+    @REGISTRY.timed("statistics")
+    def get_statistics(self, reviews: Iterable[Review]) -> Dict[str, Any]:
         """
         Calculate statistics from reviews
         
+        Works in a single pass, so a generator from one of the iter_*
+        methods can be passed in without building a list first. A
+        ReviewStore is summarized straight from its numeric columns.
+        
         Args:
-            reviews: List of Review objects
+            reviews: Any iterable of Review objects (list or generator)
+                or a ReviewStore
             
         Returns:
             Dictionary with review statistics
         """
-        if not reviews:
+        if isinstance(reviews, ReviewStore):
+            return reviews.statistics()
+        
+        total = 0
+        rating_sum = 0
+        min_rating = None
+        max_rating = None
+        rating_dist = {}
+        helpful_votes = 0
+        text_length = 0
+        
+        for review in reviews:
+            rating = review.rating
+            total += 1
+            rating_sum += rating
+            if min_rating is None or rating < min_rating:
+                min_rating = rating
+            if max_rating is None or rating > max_rating:
+                max_rating = rating
+            rating_dist[rating] = rating_dist.get(rating, 0) + 1
+            helpful_votes += review.helpful_votes
+            text_length += len(review.text)
+        
+        if total == 0:
             return {
                 'total_reviews': 0,
                 'average_rating': 0,
                 'rating_distribution': {}
             }
         
-        ratings = [r.rating for r in reviews]
-        rating_dist = {}
-        for rating in ratings:
-            rating_dist[rating] = rating_dist.get(rating, 0) + 1
-        
         return {
-            'total_reviews': len(reviews),
-            'average_rating': sum(ratings) / len(ratings),
-            'min_rating': min(ratings),
-            'max_rating': max(ratings),
+            'total_reviews': total,
+            'average_rating': rating_sum / total,
+            'min_rating': min_rating,
+            'max_rating': max_rating,
             'rating_distribution': rating_dist,
-            'total_helpful_votes': sum(r.helpful_votes for r in reviews),
-            'average_text_length': sum(len(r.text) for r in reviews) / len(reviews)
+            'total_helpful_votes': helpful_votes,
+            'average_text_length': text_length / total
         }
 
+    @REGISTRY.timed("product_statistics")
+    def get_product_statistics(self, reviews: Iterable[Review]) -> Dict[int, Dict[str, Any]]:
+        """
+        Calculate get_statistics() for every product in one call
+        
+        The review stream is read once into numeric columns, which are
+        then grouped and reduced in bulk (with NumPy when installed).
+        
+        Args:
+            reviews: Any iterable of Review objects or a ReviewStore
+            
+        Returns:
+            Dictionary mapping product_id to its statistics
+        """
+        if isinstance(reviews, ReviewStore):
+            return reviews.grouped_statistics()
+        
+        product_ids = array('q')
+        ratings = array('q')
+        helpful_votes = array('q')
+        text_lengths = array('q')
+        
+        for review in reviews:
+            product_ids.append(review.product_id)
+            ratings.append(review.rating)
+            helpful_votes.append(review.helpful_votes)
+            text_lengths.append(len(review.text))
+        
+        return grouped_statistics(product_ids, ratings, helpful_votes, text_lengths)
+
+    @REGISTRY.timed("rating_trends")
+    def get_rating_trends(self, reviews: Iterable[Review]) -> RatingTrends:
+        """
+        Build daily, weekly and monthly rating aggregates per product
+        
+        To avoid a second pass, pass a RatingTrends as `trends` to one of
+        the import methods instead; this is for reviews already loaded.
+        
+        Args:
+            reviews: Any iterable of Review objects or a ReviewStore
+            
+        Returns:
+            RatingTrends answering window and series queries
+        """
+        if isinstance(reviews, ReviewStore):
+            return RatingTrends.from_store(reviews)
+        return RatingTrends.from_reviews(reviews)
+
 
 if __name__ == "__main__":
+    import argparse
+    from profiling import PipelineProfiler, add_profile_arguments
+
+    parser = argparse.ArgumentParser(description="Import, summarize and export reviews and products")
+    parser.add_argument("--products", default="data/fakestore.json", help="Products JSON file")
+    parser.add_argument("--reviews", default="data/reviews.jsonl", help="Reviews JSONL file")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = PipelineProfiler.from_args(args)
+
     print("📊 Data Import Utility\n")
     
     importer = DataImporter()
     
     # Example 1: Import products from JSON
     print("Importing products...")
-    products = importer.import_json_products("data/fakestore.json")
+    with profiler.stage("import_products"):
+        products = importer.import_json_products(args.products)
     if products:
         print(f"✓ Imported {len(products)} products")
         print(f"  First product: {products[0].title} (${products[0].price})")
     
     # Example 2: Import reviews from JSONL
     print("\nImporting reviews...")
-    reviews = importer.import_jsonl_reviews("data/reviews.jsonl")
+    trends = RatingTrends()
+    with profiler.stage("import_reviews"):
+        reviews = importer.import_jsonl_reviews(args.reviews, trends=trends)
     if reviews:
         print(f"✓ Imported {len(reviews)} reviews")
         
         # Calculate statistics
-        stats = importer.get_statistics(reviews)
+        with profiler.stage("statistics"):
+            stats = importer.get_statistics(reviews)
         print(f"  Average rating: {stats['average_rating']:.2f}/5")
         print(f"  Rating distribution: {stats['rating_distribution']}")
+        
+        # Rating trend from the buckets filled during import
+        monthly = trends.series(granularity="month")
+        if monthly:
+            latest = monthly[-1]
+            print(f"  Latest month ({latest.period}): {latest.total_reviews} reviews, "
+                  f"average {latest.average_rating}/5")
     
     # Example 3: Export merged data
     if products and reviews:
         print("\nExporting data...")
-        importer.export_products_json(products)
-        importer.export_reviews_jsonl(reviews)
+        with profiler.stage("export"):
+            importer.export_products_json(products)
+            importer.export_reviews_jsonl(reviews)
+    
+    metrics_path = REGISTRY.write()
+    if metrics_path:
+        print(f"✓ Metrics written to {metrics_path}")
+    profiler.print_report()
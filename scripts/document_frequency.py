@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Document Frequency - Corpus-wide term statistics for distinctive topics
+Demonstrates TF-IDF scoring against a precomputed, persisted table
+
+Raw word counts rank the same generic words ("product", "really") first
+for every product. A DocumentFrequencyTable counts, once for the whole
+corpus, how many reviews contain each topic term; scoring a product's
+term counts against it (TF-IDF) surfaces the terms that set that product
+apart. The table can be saved as JSON together with a fingerprint of the
+corpus it counts, so later runs on the same reviews only load it and score.
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from config import Config, DATA_DIR
+from topic_tokens import topic_phrases, topic_words
+
+
+_MASK_64 = (1 << 64) - 1
+
+
+def corpus_fingerprint(review_ids: Iterable[Any]) -> str:
+    """
+    Review count plus an order-independent hash of the reviews' ids
+
+    Saved with a table, so one built for another corpus (or an older
+    state of this one) is recognized instead of silently reused.
+    """
+    count = total = 0
+    for review_id in review_ids:
+        digest = hashlib.blake2b(repr(review_id).encode('utf-8'), digest_size=8).digest()
+        total = (total + int.from_bytes(digest, 'little')) & _MASK_64
+        count += 1
+    return f"{count}:{total:016x}"
+
+
+class DocumentFrequencyTable:
+    """
+    Number of reviews containing each topic term, over a whole corpus
+
+    Build it with from_texts() (one streaming pass), keep it current with
+    add_texts()/remove_texts(), persist it with save() and load(). Each
+    review counts once per term, however often the term appears in it.
+    """
+
+    def __init__(self, tokenizer: Optional[Callable[[str], List[str]]] = None, phrases: bool = False):
+        """
+        Args:
+            tokenizer: Text -> terms (defaults to the topic-word or phrase
+                tokenizer)
+            phrases: Whether the terms are two-word phrases (stored with
+                the table so a word table is not used to score phrases)
+        """
+        self.tokenize = tokenizer or (topic_phrases if phrases else topic_words)
+        self.phrases = phrases
+        self.document_count = 0
+        self.frequencies: Counter = Counter()
+        # corpus_fingerprint() of the reviews counted, when known
+        self.fingerprint: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.frequencies)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: Iterable[str],
+        tokenizer: Optional[Callable[[str], List[str]]] = None,
+        phrases: bool = False
+    ) -> "DocumentFrequencyTable":
+        """Build a table from every review text of the corpus"""
+        table = cls(tokenizer, phrases)
+        table.add_texts(texts)
+        return table
+
+    def add_texts(self, texts: Iterable[str]) -> None:
+        """Count more reviews into the table"""
+        term_sets = map(set, map(self.tokenize, texts))
+        self.frequencies.update(chain.from_iterable(self._counted(term_sets)))
+
+    def remove_texts(self, texts: Iterable[str]) -> None:
+        """Un-count reviews previously passed to add_texts()"""
+        frequencies = self.frequencies
+        for text in texts:
+            self.document_count -= 1
+            for term in set(self.tokenize(text)):
+                value = frequencies[term] - 1
+                if value > 0:
+                    frequencies[term] = value
+                else:
+                    del frequencies[term]
+
+    def _counted(self, term_sets: Iterable[set]) -> Iterator[set]:
+        """Pass term sets through, counting each as one document"""
+        for terms in term_sets:
+            self.document_count += 1
+            yield terms
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency; 0 for a term in every review"""
+        return math.log((self.document_count + 1) / (self.frequencies.get(term, 0) + 1))
+
+    def score(
+        self,
+        term_counts: Mapping[str, int],
+        limit: int = 10,
+        min_count: int = Config.DISTINCTIVE_TOPIC_MIN_COUNT
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank one product's terms by TF-IDF
+
+        Args:
+            term_counts: Term -> occurrences in the product's reviews
+            limit: Number of terms to return
+            min_count: Ignore terms seen fewer times than this in the
+                product (one-off words are noise, not topics)
+
+        Returns:
+            (term, score) pairs, highest score first; ties by term
+        """
+        frequencies = self.frequencies
+        numerator = self.document_count + 1
+        scored = [
+            (term, (1 + math.log(count)) * math.log(numerator / (frequencies.get(term, 0) + 1)))
+            for term, count in term_counts.items() if count >= min_count
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return [(term, round(score, 4)) for term, score in scored[:limit] if score > 0]
+
+    def save(self, path: Optional[str] = None) -> Path:
+        """
+        Write the table as JSON, atomically (written aside, then renamed)
+
+        Args:
+            path: Output file (defaults to the Config file for words/phrases)
+
+        Returns:
+            The path written
+        """
+        path = Path(path) if path else self.default_path(self.phrases)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'phrases': self.phrases,
+                'document_count': self.document_count,
+                'fingerprint': self.fingerprint,
+                'built_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'frequencies': dict(self.frequencies.most_common())
+            }, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        return path
+
+    @classmethod
+    def load(
+        cls,
+        path: Optional[str] = None,
+        tokenizer: Optional[Callable[[str], List[str]]] = None,
+        phrases: bool = False
+    ) -> Optional["DocumentFrequencyTable"]:
+        """
+        Read a table written by save()
+
+        Returns:
+            The table, or None if the file is missing, unreadable or
+            holds the other kind of terms (words vs phrases)
+        """
+        path = Path(path) if path else cls.default_path(phrases)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Error: Could not read document frequencies from {path}: {e}")
+            return None
+
+        if data.get('phrases', False) != phrases:
+            print(f"Warning: {path} holds {'phrase' if data.get('phrases') else 'word'} frequencies")
+            return None
+
+        table = cls(tokenizer, phrases)
+        table.document_count = data.get('document_count', 0)
+        table.frequencies = Counter(data.get('frequencies', {}))
+        table.fingerprint = data.get('fingerprint')
+        return table
+
+    @staticmethod
+    def default_path(phrases: bool = False) -> Path:
+        """Config location of the word or phrase table"""
+        return DATA_DIR / (Config.TOPIC_PHRASE_DF_FILE if phrases else Config.TOPIC_DF_FILE)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache - Persistent, content-addressed cache for Ollama calls
+Demonstrates SQLite-backed caching with TTL expiry and LRU eviction
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from config import Config, PerformanceConfig, DATA_DIR
+
+
+# Hits whose access time is held in memory before it is written
+_ACCESS_FLUSH_SIZE = 256
+
+
+class LLMCache:
+    """
+    Disk cache for LLM responses keyed by a hash of (model, prompt)
+
+    Entries expire after `ttl` seconds. When more than `max_entries` are
+    stored, the least recently used ones are evicted. The cache is safe
+    to share between the threads of AsyncOllamaClient. A hit is a pure
+    read: its access time is buffered and written in one batch before
+    the next eviction (or every _ACCESS_FLUSH_SIZE hits, and on close).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: int = PerformanceConfig.CACHE_TTL,
+        max_entries: int = PerformanceConfig.CACHE_MAX_ENTRIES
+    ):
+        """Initialize cache; the database is opened on first use"""
+        self.path = Path(path) if path else DATA_DIR / Config.LLM_CACHE_FILE
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # key -> last access time not yet written to the database
+        self._pending_access: Dict[str, float] = {}
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Content address for a (model, prompt) pair"""
+        digest = hashlib.sha256()
+        digest.update(model.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, model: str, prompt: str) -> Optional[Dict[str, Any]]:
+        """Get a cached response, or None on a miss or expired entry"""
+        key = self.make_key(model, prompt)
+        now = time.time()
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+
+            self._pending_access[key] = now
+            if len(self._pending_access) >= _ACCESS_FLUSH_SIZE:
+                self._flush_access()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def _flush_access(self) -> None:
+        """Write buffered access times in one transaction (caller holds the lock)"""
+        if not self._pending_access or self._conn is None:
+            return
+        self._conn.executemany(
+            "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self._pending_access.items()]
+        )
+        self._conn.commit()
+        self._pending_access.clear()
+
+    def set(self, model: str, prompt: str, response: Dict[str, Any]) -> None:
+        """Store a response and evict least recently used entries over the limit"""
+        key = self.make_key(model, prompt)
+        now = time.time()
+
+        with self._lock:
+            conn = self._connect()
+            # LRU eviction below must see every recent hit
+            self._flush_access()
+            self._pending_access.pop(key, None)
+            conn.execute(
+                """INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (key, model, json.dumps(response, ensure_ascii=False), now, now)
+            )
+            conn.execute(
+                """DELETE FROM llm_cache WHERE key IN (
+                       SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,)
+            )
+            conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete all expired entries and return how many were removed"""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+        with self._lock:
+            conn = self._connect()
+            self._pending_access.clear()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            size = self._connect().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': size,
+            'max_entries': self.max_entries
+        }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._flush_access()
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Metrics - Lightweight counters, stage timers and latency histograms
+Demonstrates low-overhead instrumentation with Prometheus/JSON export
+
+One process-wide registry (REGISTRY) collects what the utilities do:
+rows parsed and rejected, cache hits, LLM requests, retries and tokens,
+and how long each stage and request took. Hot loops count locally and
+report once per call, so leaving metrics on costs a few dictionary
+updates per file or request, not per row.
+
+Settings come from LogConfig (METRICS_ENABLED, METRICS_FILE,
+METRICS_FORMAT, METRICS_PREFIX, METRICS_LATENCY_BUCKETS).
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from config import LogConfig
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Hashable, order-independent form of a label dict"""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Prometheus label set, e.g. {stage="import",le="0.1"}"""
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    rendered = []
+    for name, value in pairs:
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        rendered.append(f'{name}="{value}"')
+    return "{" + ",".join(rendered) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values (seconds)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        """Initialize with ascending upper bounds (+Inf is implicit)"""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one value"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[float, int]]:
+        """(upper bound, observations <= bound) pairs, ending with +Inf"""
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running += count
+            yield bound, running
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: the upper bound of the bucket containing it"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return bound if bound != float('inf') else self.buckets[-1]
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of counters and histograms
+
+    Counters and histograms are identified by name plus labels. When
+    the registry is disabled every call returns immediately.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = LogConfig.METRICS_ENABLED,
+        prefix: str = LogConfig.METRICS_PREFIX,
+        buckets: Sequence[float] = LogConfig.METRICS_LATENCY_BUCKETS
+    ):
+        """Initialize an empty registry"""
+        self.enabled = enabled
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Attach a HELP line to a metric for the Prometheus export"""
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add to a counter"""
+        if not self.enabled or not value:
+            return
+        key = _label_key(labels) if labels else ()
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a value (usually seconds) in a histogram"""
+        if not self.enabled:
+            return
+        key = _label_key(labels) if labels else ()
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str = "stage_duration_seconds", **labels: Any) -> Iterator[None]:
+        """Time the enclosed block into a histogram (stage=... by convention)"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, stage: str) -> Callable:
+        """Decorator form of timer() for functions that return (not generators)"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage=stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        """Current value of one counter series (0 if never incremented)"""
+        return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        """One histogram series, or None if nothing was observed"""
+        return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def reset(self) -> None:
+        """Drop every recorded value"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable view of every counter and histogram"""
+        with self._lock:
+            counters = {
+                name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [
+                    {
+                        'labels': dict(key),
+                        'count': h.count,
+                        'sum': round(h.total, 6),
+                        'p50': h.quantile(0.5),
+                        'p95': h.quantile(0.95),
+                        'p99': h.quantile(0.99),
+                        'buckets': {('+Inf' if bound == float('inf') else str(bound)): n
+                                    for bound, n in h.cumulative()}
+                    }
+                    for key, h in series.items()
+                ]
+                for name, series in self._histograms.items()
+            }
+        return {'timestamp': time.time(), 'counters': counters, 'histograms': histograms}
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (for the node_exporter textfile collector)"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full_name = self.prefix + name
+                if name in self._help:
+                    lines.append(f"# HELP {full_name} {self._help[name]}")
+                lines.append(f"# TYPE {full_name} counter")
+                for key, value in series.items():
+                    lines.append(f"{full_name}{_format_labels(key)} {value:g}")
+
+            for name, series in sorted(self._histograms.items()):
+                full_name = self.prefix + name
+                if name in self._help:
+                    lines.append(f"# HELP {full_name} {self._help[name]}")
+                lines.append(f"# TYPE {full_name} histogram")
+                for key, h in series.items():
+                    for bound, running in h.cumulative():
+                        le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                        lines.append(f"{full_name}_bucket{_format_labels(key, ('le', le))} {running}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {h.total:.6f}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Optional[str] = None, fmt: Optional[str] = None) -> Optional[Path]:
+        """
+        Export to a file, atomically (written aside, then renamed)
+
+        Args:
+            path: Output file (defaults to LogConfig.METRICS_FILE)
+            fmt: "prometheus" or "json" (defaults to LogConfig.METRICS_FORMAT)
+
+        Returns:
+            The path written, or None if metrics are disabled
+        """
+        if not self.enabled:
+            return None
+        path = Path(path or LogConfig.METRICS_FILE)
+        fmt = fmt or LogConfig.METRICS_FORMAT
+        content = json.dumps(self.snapshot(), indent=2) if fmt == "json" else self.to_prometheus()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+        return path
+
+
+# Process-wide registry used by the utilities
+REGISTRY = MetricsRegistry()
+
+REGISTRY.describe("rows_parsed_total", "Reviews successfully parsed from input files")
+REGISTRY.describe("rows_rejected_total", "Input lines or rows that could not be parsed")
+REGISTRY.describe("stage_duration_seconds", "Wall time of pipeline stages")
+REGISTRY.describe("llm_requests_total", "Requests sent to the Ollama API")
+REGISTRY.describe("llm_errors_total", "Ollama requests that failed")
+REGISTRY.describe("llm_retries_total", "Automatic retries of Ollama requests")
+REGISTRY.describe("llm_tokens_generated_total", "Tokens generated by the model")
+REGISTRY.describe("llm_request_duration_seconds", "Latency of Ollama requests")
+REGISTRY.describe("llm_cache_hits_total", "LLM response cache hits")
+REGISTRY.describe("llm_cache_misses_total", "LLM response cache misses")
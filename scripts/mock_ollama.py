@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Mock Ollama Server - Local stand-in for the Ollama HTTP API
+Demonstrates deterministic, latency-controlled service mocking
+
+Serves /api/tags, /api/generate and /api/chat (streaming and not) with
+a fixed per-request latency and token rate, so the LLM code paths can
+be benchmarked without a model. Batched insight prompts get one
+"### PRODUCT <n>" section per product, as a real model would write.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from config import Config
+
+
+_PRODUCT_HEADER = re.compile(r'^### PRODUCT (\d+): (.*)$', re.MULTILINE)
+
+
+class MockOllamaServer:
+    """
+    Threaded mock of the Ollama API
+
+    Usage:
+        with MockOllamaServer(latency=0.05) as server:
+            client = OllamaClient(OllamaConfig(port=server.port))
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.05, tokens_per_second: float = 2000.0,
+                 response_tokens: int = 40):
+        """
+        Args:
+            port: Port to listen on (0 picks a free one)
+            latency: Seconds before the first token of every response
+            tokens_per_second: Generation rate after the first token
+            response_tokens: Tokens generated per response (per product
+                for batched prompts)
+        """
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MockOllamaServer":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def response_text(self, prompt: str) -> str:
+        """Deterministic reply; one section per product for batched prompts"""
+        words = ["analysis"] * self.response_tokens
+        products = _PRODUCT_HEADER.findall(prompt)
+        if not products:
+            return ' '.join(words)
+        return '\n\n'.join(f"### PRODUCT {number}\n{name}: {' '.join(words)}" for number, name in products)
+
+    def _handler_class(self):
+        """Request handler bound to this server's settings"""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; don't let Nagle delay them
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_chunk(self, payload: Dict[str, Any]) -> None:
+                line = (json.dumps(payload) + '\n').encode('utf-8')
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+
+            def do_GET(self) -> None:
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": [{"name": Config.OLLAMA_MODEL}]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                with mock._lock:
+                    mock.request_count += 1
+
+                if self.path == "/api/generate":
+                    prompt = request.get("prompt", "")
+                elif self.path == "/api/chat":
+                    messages = request.get("messages") or [{}]
+                    prompt = messages[-1].get("content", "")
+                else:
+                    self._send_json(404, {"error": "not found"})
+                    return
+
+                tokens = mock.response_text(prompt).split(' ')
+                time.sleep(mock.latency)
+
+                if not request.get("stream"):
+                    time.sleep(len(tokens) / mock.tokens_per_second)
+                    text = ' '.join(tokens)
+                    self._send_json(200, {
+                        "model": request.get("model"),
+                        "response": text,
+                        "message": {"role": "assistant", "content": text},
+                        "done": True,
+                        "eval_count": len(tokens)
+                    })
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i, token in enumerate(tokens):
+                    piece = token if i == 0 else ' ' + token
+                    if self.path == "/api/chat":
+                        self._send_chunk({"message": {"role": "assistant", "content": piece}, "done": False})
+                    else:
+                        self._send_chunk({"response": piece, "done": False})
+                    time.sleep(1 / mock.tokens_per_second)
+                self._send_chunk({"response": "", "done": True, "eval_count": len(tokens)})
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    server = MockOllamaServer(port=Config.OLLAMA_PORT)
+    print(f"🤖 Mock Ollama server on http://127.0.0.1:{server.port} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
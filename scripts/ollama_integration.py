@@ -4,10 +4,46 @@ Ollama Integration Utility - Python wrapper for Ollama LLM API
 Demonstrates API integration and AI/ML capabilities
 """
 
+import asyncio
 import requests
 import json
-from typing import Optional, Dict, Any
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Iterable, Iterator, Tuple, Union
 from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config, PerformanceConfig
+from llm_cache import LLMCache
+from metrics import REGISTRY
+from review_selection import chunk_reviews, estimate_tokens, select_reviews
+
+
+def _count_retries(response: requests.Response, *args, **kwargs) -> None:
+    """Session response hook: count the urllib3 retries behind a response"""
+    retries = getattr(response.raw, 'retries', None)
+    if retries is not None and retries.history:
+        REGISTRY.inc("llm_retries_total", len(retries.history))
+
+
+def _instrumented(endpoint: str) -> Callable:
+    """Record latency, request, error and token counts of an API call"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Dict[str, Any]:
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            REGISTRY.observe("llm_request_duration_seconds", time.perf_counter() - start, endpoint=endpoint)
+            REGISTRY.inc("llm_requests_total", endpoint=endpoint)
+            if "error" in result:
+                REGISTRY.inc("llm_errors_total", endpoint=endpoint)
+            REGISTRY.inc("llm_tokens_generated_total", result.get("eval_count", 0), endpoint=endpoint)
+            return result
+        return wrapper
+    return decorator
 
 
 @dataclass
@@ -16,6 +52,10 @@ class OllamaConfig:
     host: str = "http://localhost"
     port: int = 11434
     model: str = "llama3.2"
+    timeout: int = Config.OLLAMA_TIMEOUT
+    pool_size: int = PerformanceConfig.POOL_SIZE
+    max_retries: int = Config.MAX_RETRIES
+    retry_delay: float = Config.RETRY_DELAY
     
     @property
     def base_url(self) -> str:
@@ -26,15 +66,84 @@ class OllamaConfig:
 class OllamaClient:
     """Client for interacting with Ollama LLM"""
 
-    def __init__(self, config: Optional[OllamaConfig] = None):
-        """Initialize Ollama client with configuration"""
+    # Transient server-side statuses worth retrying
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    # Endpoints whose requests are retried (see _create_session)
+    RETRY_ENDPOINTS = ("/api/generate", "/api/chat")
+
+    def __init__(
+        self,
+        config: Optional[OllamaConfig] = None,
+        cache: Union[LLMCache, bool, None] = None
+    ):
+        """
+        Initialize Ollama client with configuration
+
+        Args:
+            config: Connection settings
+            cache: Response cache for generate_cached(). None uses a disk
+                cache under DATA_DIR when PerformanceConfig.CACHE_ENABLED is
+                set; False disables caching. The cache is closed by close().
+        """
         self.config = config or OllamaConfig()
         self.base_url = self.config.base_url
+        self.session = self._create_session()
+        if cache is None:
+            cache = PerformanceConfig.CACHE_ENABLED
+        if cache is True:
+            cache = LLMCache()
+        self.cache: Optional[LLMCache] = cache or None
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create a pooled keep-alive session
+
+        Connections are reused across calls, so back-to-back requests
+        skip the TCP handshake. Only generation calls (RETRY_ENDPOINTS)
+        retry connection errors and transient statuses, with exponential
+        backoff (retry_delay * 2^n); health checks and model listing fail
+        at once, so a stopped server is reported immediately. Read
+        timeouts are never retried: the server already has the prompt,
+        and a retry would only queue it again behind the slow one.
+        """
+        retry = Retry(
+            total=self.config.max_retries,
+            read=False,  # Re-raise read timeouts as is, so they report as timeouts
+            backoff_factor=self.config.retry_delay,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=None,  # Ollama generate/chat calls are POSTs
+            raise_on_status=False
+        )
+        pool = {"pool_connections": self.config.pool_size, "pool_maxsize": self.config.pool_size}
+
+        session = requests.Session()
+        # Longest matching prefix wins, so generation calls get the retrying adapter
+        no_retry = HTTPAdapter(**pool)
+        session.mount("http://", no_retry)
+        session.mount("https://", no_retry)
+        retrying = HTTPAdapter(max_retries=retry, **pool)
+        for endpoint in self.RETRY_ENDPOINTS:
+            session.mount(f"{self.base_url}{endpoint}", retrying)
+        session.hooks["response"].append(_count_retries)
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections and the response cache"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self) -> "OllamaClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def is_available(self) -> bool:
         """Check if Ollama server is available"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=2)
             return response.status_code == 200
         except (requests.ConnectionError, requests.Timeout):
             return False
@@ -42,7 +151,7 @@ class OllamaClient:
     def list_models(self) -> list[str]:
         """List all available models in Ollama"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self.config.timeout)
             if response.status_code == 200:
                 data = response.json()
                 return [model['name'] for model in data.get('models', [])]
@@ -51,6 +160,7 @@ class OllamaClient:
             print(f"Error listing models: {e}")
             return []
 
+    @_instrumented("generate")
     def generate(
         self, 
         prompt: str, 
@@ -71,23 +181,27 @@ class OllamaClient:
         model = model or self.config.model
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": model,
                     "prompt": prompt,
                     "stream": stream
                 },
-                timeout=60
+                timeout=self.config.timeout,
+                stream=stream
             )
             
-            if response.status_code == 200:
-                if stream:
-                    return self._parse_stream(response)
+            # A streamed response holds its connection until closed,
+            # including on errors and non-200 statuses
+            with response:
+                if response.status_code == 200:
+                    if stream:
+                        return self._parse_stream(response)
+                    else:
+                        return response.json()
                 else:
-                    return response.json()
-            else:
-                return {"error": f"API returned status {response.status_code}"}
+                    return {"error": f"API returned status {response.status_code}"}
                 
         except requests.Timeout:
             return {"error": "Request timeout - Ollama may be overloaded"}
@@ -96,6 +210,29 @@ class OllamaClient:
         except Exception as e:
             return {"error": f"Unexpected error: {str(e)}"}
 
+    def generate_cached(self, prompt: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate text, reusing a cached response for an identical (model, prompt)
+
+        Only successful responses are cached, so errors are retried on
+        the next call.
+        """
+        model = model or self.config.model
+        if self.cache is None:
+            return self.generate(prompt, model)
+
+        cached = self.cache.get(model, prompt)
+        if cached is not None:
+            REGISTRY.inc("llm_cache_hits_total")
+            return cached
+        REGISTRY.inc("llm_cache_misses_total")
+
+        result = self.generate(prompt, model)
+        if "response" in result:
+            self.cache.set(model, prompt, result)
+        return result
+
+    @_instrumented("chat")
     def chat(
         self,
         messages: list[Dict[str, str]],
@@ -114,14 +251,14 @@ class OllamaClient:
         model = model or self.config.model
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/chat",
                 json={
                     "model": model,
                     "messages": messages,
                     "stream": False
                 },
-                timeout=60
+                timeout=self.config.timeout
             )
             
             if response.status_code == 200:
@@ -143,49 +280,275 @@ class OllamaClient:
         
         Args:
             product_name: Name of the product
-            reviews: List of review texts
+            reviews: Review texts, or review dicts / Review objects (see select_reviews)
             context: Additional context about the product
             
         Returns:
             AI-generated analysis of reviews
         """
-        reviews_text = "\n".join([f"- {review}" for review in reviews[:5]])
+        prompt = self._review_analysis_prompt(product_name, reviews, context)
+
+        result = self.generate_cached(prompt)
+        
+        if "response" in result:
+            return result["response"]
+        else:
+            return result.get("error", "Failed to generate analysis")
+
+    def analyze_product_reviews_map_reduce(
+        self,
+        product_name: str,
+        reviews: list[str],
+        context: Optional[str] = None,
+        chunk_tokens: int = Config.SUMMARY_CHUNK_TOKENS,
+        concurrency: Optional[int] = None
+    ) -> str:
+        """
+        Analyze any number of reviews by hierarchical summarization
+        
+        Map: the reviews are split into chunks of at most `chunk_tokens`
+        and each chunk is summarized, several at a time. Reduce: the
+        partial summaries are combined (in further rounds if they do not
+        fit one prompt) into the usual four-section analysis.
+        
+        Chunk prompts depend only on the chunk content, so with the
+        response cache enabled each chunk summary is cached by its
+        content hash; because chunk_reviews() uses content-defined
+        boundaries, adding reviews only re-summarizes the chunks they
+        land in.
         
-        prompt = f"""Analyze the following reviews for {product_name} and provide:
+        Args:
+            product_name: Name of the product
+            reviews: Review texts, or review dicts / Review objects
+            context: Additional context about the product
+            chunk_tokens: Estimated review tokens per map prompt
+            concurrency: Chunks summarized at once (defaults to the pool size)
+            
+        Returns:
+            AI-generated analysis of reviews
+        """
+        chunks = chunk_reviews(reviews, chunk_tokens)
+        if len(chunks) <= 1:
+            texts = chunks[0] if chunks else []
+            prompt = self._analysis_prompt(product_name, "Reviews", texts, context)
+            return self._response_text(self.generate_cached(prompt), "Failed to generate analysis")
+
+        workers = concurrency or self.config.pool_size
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            prompts = [self._chunk_summary_prompt(product_name, chunk) for chunk in chunks]
+            summaries = self._summarize_all(executor, prompts)
+            
+            # Further reduce rounds until the partial summaries fit one prompt
+            while (summaries is not None and len(summaries) > 1
+                   and sum(estimate_tokens(s) for s in summaries) > chunk_tokens):
+                groups = chunk_reviews(summaries, chunk_tokens)
+                if len(groups) == len(summaries):
+                    break  # Summaries too long to pair up; use them as they are
+                prompts = [self._combine_summaries_prompt(product_name, group) for group in groups]
+                summaries = self._summarize_all(executor, prompts)
+
+        if summaries is None:
+            return "Failed to summarize review chunks"
+        prompt = self._analysis_prompt(product_name, "Summaries of review batches", summaries, context)
+        return self._response_text(self.generate_cached(prompt), "Failed to generate analysis")
+
+    def _summarize_all(self, executor: ThreadPoolExecutor, prompts: list[str]) -> Optional[list[str]]:
+        """Run summary prompts concurrently; None if any of them failed"""
+        summaries = []
+        for result in executor.map(self.generate_cached, prompts):
+            if "response" not in result:
+                print(f"Error summarizing review chunk: {result.get('error', 'unknown error')}")
+                return None
+            summaries.append(result["response"].strip())
+        return summaries
+
+    @staticmethod
+    def _response_text(result: Dict[str, Any], failure: str) -> str:
+        """The generated text, or the error message"""
+        if "response" in result:
+            return result["response"]
+        return result.get("error", failure)
+
+    @staticmethod
+    def _chunk_summary_prompt(product_name: str, reviews: list[str]) -> str:
+        """Map step: summarize one chunk of reviews"""
+        reviews_text = "\n".join([f"- {review}" for review in reviews])
+        
+        return f"""Summarize the following reviews for {product_name}.
+State the overall sentiment, then list the specific positive and negative
+points customers mention and roughly how many reviews mention each.
+
+Reviews:
+{reviews_text}
+
+Be concise and factual; do not add a recommendation."""
+
+    @staticmethod
+    def _combine_summaries_prompt(product_name: str, summaries: list[str]) -> str:
+        """Intermediate reduce step: merge several partial summaries into one"""
+        summaries_text = "\n".join([f"- {summary}" for summary in summaries])
+        
+        return f"""Combine the following partial summaries of reviews for {product_name}
+into one summary. Keep the overall sentiment and the positive and negative
+points, merging points that repeat and keeping how often they are mentioned.
+
+Summaries:
+{summaries_text}
+
+Be concise and factual; do not add a recommendation."""
+
+    @staticmethod
+    def _review_analysis_prompt(
+        product_name: str,
+        reviews: list[str],
+        context: Optional[str] = None
+    ) -> str:
+        """Build the four-section review analysis prompt"""
+        return OllamaClient._analysis_prompt(product_name, "Reviews", select_reviews(reviews), context)
+
+    @staticmethod
+    def _analysis_prompt(
+        product_name: str,
+        heading: str,
+        items: list[str],
+        context: Optional[str] = None
+    ) -> str:
+        """Four-section analysis prompt over reviews or review summaries"""
+        items_text = "\n".join([f"- {item}" for item in items])
+        
+        return f"""Analyze the following reviews for {product_name} and provide:
 1. Overall sentiment summary
 2. Top 3 positive aspects mentioned
 3. Top 3 negative aspects mentioned
 4. Final recommendation
 
-Reviews:
-{reviews_text}
+{heading}:
+{items_text}
 
 {f"Context: {context}" if context else ""}
 
 Provide a concise, professional analysis."""
 
-        result = self.generate(prompt)
-        
-        if "response" in result:
-            return result["response"]
-        else:
-            return result.get("error", "Failed to generate analysis")
-
     def _parse_stream(self, response) -> Dict[str, Any]:
         """Parse streamed response from Ollama"""
-        full_response = ""
+        return {"response": "".join(TokenStream.iter_tokens(response))}
+
+    def stream_generate(self, prompt: str, model: Optional[str] = None) -> "TokenStream":
+        """
+        Stream generated tokens as they arrive
+        
+        Args:
+            prompt: Input prompt for the model
+            model: Model name (uses default if not specified)
+            
+        Returns:
+            TokenStream to iterate over; its stats and error are filled in
+            as the stream is consumed
+        """
+        payload = {"model": model or self.config.model, "prompt": prompt, "stream": True}
+        return TokenStream(lambda: self.session.post(
+            f"{self.base_url}/api/generate",
+            json=payload,
+            timeout=self.config.timeout,
+            stream=True
+        ))
+
+    def stream_chat(
+        self,
+        messages: list[Dict[str, str]],
+        model: Optional[str] = None
+    ) -> "TokenStream":
+        """Stream a chat reply token by token (see stream_generate)"""
+        payload = {"model": model or self.config.model, "messages": messages, "stream": True}
+        return TokenStream(lambda: self.session.post(
+            f"{self.base_url}/api/chat",
+            json=payload,
+            timeout=self.config.timeout,
+            stream=True
+        ))
+
+
+@dataclass
+class StreamStats:
+    """Latency and throughput of a streamed generation"""
+    time_to_first_token: Optional[float] = None  # seconds
+    tokens: int = 0
+    elapsed: float = 0.0  # seconds
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Generation rate measured from the first token onwards"""
+        if self.time_to_first_token is None:
+            return 0.0
+        generating = self.elapsed - self.time_to_first_token
+        return self.tokens / generating if generating > 0 else 0.0
+
+
+class TokenStream:
+    """
+    Iterator over the tokens of a streamed Ollama response
+
+    Each NDJSON chunk is yielded as soon as it is read, so the caller
+    sees the first token without waiting for the whole reply. Errors
+    are stored on `error` instead of raised, matching the dict-based
+    error reporting of OllamaClient.
+    """
+
+    def __init__(self, request: Callable[[], requests.Response]):
+        """Initialize with a callable that performs the streaming request"""
+        self._request = request
+        self.stats = StreamStats()
+        self.error: Optional[str] = None
+
+    @staticmethod
+    def iter_tokens(response: requests.Response) -> Iterator[str]:
+        """Yield the text of each chunk of a streamed generate/chat response"""
         for line in response.iter_lines():
             if line:
                 data = json.loads(line)
-                if "response" in data:
-                    full_response += data["response"]
-        
-        return {"response": full_response}
+                token = data.get("response")
+                if token is None:
+                    token = data.get("message", {}).get("content")
+                if token:
+                    yield token
+
+    def __iter__(self) -> Iterator[str]:
+        start = time.perf_counter()
+        try:
+            response = self._request()
+            with response:
+                if response.status_code != 200:
+                    self.error = f"API returned status {response.status_code}"
+                    return
+
+                for token in self.iter_tokens(response):
+                    if self.stats.time_to_first_token is None:
+                        self.stats.time_to_first_token = time.perf_counter() - start
+                    self.stats.tokens += 1
+                    yield token
+
+        except requests.Timeout:
+            self.error = "Request timeout - Ollama may be overloaded"
+        except requests.ConnectionError:
+            self.error = "Cannot connect to Ollama server"
+        except Exception as e:
+            self.error = f"Unexpected error: {str(e)}"
+        finally:
+            self.stats.elapsed = time.perf_counter() - start
+            REGISTRY.observe("llm_request_duration_seconds", self.stats.elapsed, endpoint="stream")
+            REGISTRY.inc("llm_requests_total", endpoint="stream")
+            REGISTRY.inc("llm_tokens_generated_total", self.stats.tokens, endpoint="stream")
+            if self.error is not None:
+                REGISTRY.inc("llm_errors_total", endpoint="stream")
 
 
 class ProductReviewAnalyzer:
     """High-level interface for analyzing product reviews with Ollama"""
 
+    # Header line opening each product's section of a batched response;
+    # case-sensitive so prose such as "Product 2 is..." is not a header
+    SECTION_PATTERN = re.compile(r'^[#* \t]*PRODUCT[ \t]+(\d+)\b.*$', re.MULTILINE)
+
     def __init__(self, client: Optional[OllamaClient] = None):
         """Initialize analyzer with Ollama client"""
         self.client = client or OllamaClient()
@@ -195,28 +558,38 @@ class ProductReviewAnalyzer:
         product_name: str,
         reviews: list[str],
         avg_rating: float,
-        review_count: int
+        review_count: int,
+        hierarchical: bool = False
     ) -> str:
         """
         Generate comprehensive insights for a product based on reviews
         
         Args:
             product_name: Product name
-            reviews: List of review texts
+            reviews: Review texts, or review dicts / Review objects (see select_reviews)
             avg_rating: Average product rating
             review_count: Total number of reviews
+            hierarchical: Summarize every review (map-reduce) instead of a
+                selection that fits one prompt
             
         Returns:
             AI-generated insights
         """
-        context = f"Product: {product_name}, Avg Rating: {avg_rating}/5, Total Reviews: {review_count}"
+        context = self._insights_context(product_name, avg_rating, review_count)
         
+        if hierarchical:
+            return self.client.analyze_product_reviews_map_reduce(product_name, reviews, context)
         return self.client.analyze_product_reviews(
             product_name,
             reviews,
             context
         )
 
+    @staticmethod
+    def _insights_context(product_name: str, avg_rating: float, review_count: int) -> str:
+        """Context line included in insight prompts"""
+        return f"Product: {product_name}, Avg Rating: {avg_rating}/5, Total Reviews: {review_count}"
+
     def answer_question(
         self,
         product_name: str,
@@ -229,12 +602,13 @@ class ProductReviewAnalyzer:
         Args:
             product_name: Product name
             question: User question
-            reviews: List of review texts
+            reviews: Review texts, or review dicts / Review objects (see select_reviews)
             
         Returns:
             AI-generated answer
         """
-        reviews_text = "\n".join([f"- {review}" for review in reviews[:10]])
+        relevant = select_reviews(reviews, query=question)
+        reviews_text = "\n".join([f"- {review}" for review in relevant])
         
         prompt = f"""Based on the following reviews for {product_name}, answer this question: {question}
 
@@ -243,13 +617,410 @@ Reviews:
 
 Provide a helpful, concise answer based on the reviews."""
 
-        result = self.client.generate(prompt)
+        result = self.client.generate_cached(prompt)
         
         if "response" in result:
             return result["response"]
         else:
             return result.get("error", "Failed to generate answer")
 
+    def generate_insights_batch(
+        self,
+        items: Iterable[Tuple[Any, list[str]]],
+        batch_size: int = Config.INSIGHT_BATCH_SIZE
+    ) -> Iterator["InsightResult"]:
+        """
+        Generate insights for many small products, several per LLM call
+        
+        Up to `batch_size` products share one structured prompt, which
+        saves the per-call preamble and round trip for the long tail of
+        products with only a few reviews. Each product's section is parsed
+        back out of the response; a product whose section is missing or
+        ambiguous is retried with a single-product call.
+        
+        Args:
+            items: (product, reviews) pairs; product is a name or an
+                object with title / rating / review_count attributes
+            batch_size: Max products per prompt
+            
+        Yields:
+            InsightResult objects in input order
+        """
+        batch = []
+        for product, reviews in items:
+            batch.append(self._describe(product, reviews))
+            if len(batch) >= batch_size:
+                yield from self._insights_for_batch(batch)
+                batch = []
+        if batch:
+            yield from self._insights_for_batch(batch)
+
+    def _insights_for_batch(self, batch: list[Tuple[str, list[str], float, int]]) -> Iterator["InsightResult"]:
+        """One batched call, with single-product fallback for unparsed sections"""
+        if len(batch) == 1:
+            yield self._single_insight(*batch[0])
+            return
+
+        start = time.perf_counter()
+        result = self.client.generate_cached(self._batch_prompt(batch))
+        sections = self.parse_sections(result["response"], len(batch)) if "response" in result else {}
+        # The shared call's time is split evenly between the products it answered
+        share = (time.perf_counter() - start) / max(1, len(sections))
+
+        for number, (product_name, reviews, avg_rating, review_count) in enumerate(batch, 1):
+            if number in sections:
+                yield InsightResult(product_name, insights=sections[number], elapsed=share)
+            else:
+                yield self._single_insight(product_name, reviews, avg_rating, review_count)
+
+    def _single_insight(
+        self,
+        product_name: str,
+        reviews: list[str],
+        avg_rating: float,
+        review_count: int
+    ) -> "InsightResult":
+        """Insights for one product as an InsightResult"""
+        start = time.perf_counter()
+        context = self._insights_context(product_name, avg_rating, review_count)
+        result = self.client.generate_cached(
+            self.client._review_analysis_prompt(product_name, reviews, context)
+        )
+
+        elapsed = time.perf_counter() - start
+        if "response" in result:
+            return InsightResult(product_name, insights=result["response"], elapsed=elapsed)
+        return InsightResult(
+            product_name,
+            error=result.get("error", "Failed to generate analysis"),
+            elapsed=elapsed
+        )
+
+    def _batch_prompt(self, batch: list[Tuple[str, list[str], float, int]]) -> str:
+        """Structured prompt covering several products"""
+        sections = []
+        for number, (product_name, reviews, avg_rating, review_count) in enumerate(batch, 1):
+            selected = select_reviews(reviews, token_budget=Config.BATCH_PRODUCT_REVIEW_TOKENS)
+            reviews_text = "\n".join([f"- {review}" for review in selected])
+            sections.append(f"""### PRODUCT {number}: {product_name}
+Context: {self._insights_context(product_name, avg_rating, review_count)}
+Reviews:
+{reviews_text}""")
+        products_text = "\n\n".join(sections)
+        
+        return f"""Analyze the reviews of each of the {len(batch)} products below. For every product provide:
+1. Overall sentiment summary
+2. Top 3 positive aspects mentioned
+3. Top 3 negative aspects mentioned
+4. Final recommendation
+
+Answer with exactly {len(batch)} sections in the same order. Start each section with
+a line of the form "### PRODUCT <number>" (for example "### PRODUCT 1") and do not
+write anything before the first section.
+
+{products_text}
+
+Provide a concise, professional analysis for each product."""
+
+    @classmethod
+    def parse_sections(cls, text: str, product_count: int) -> Dict[int, str]:
+        """
+        Split a batched response into {product number: analysis}
+        
+        Numbers outside 1..product_count, numbers that appear more than
+        once and empty sections are left out, so those products fall
+        back to their own call.
+        """
+        headers = list(cls.SECTION_PATTERN.finditer(text))
+        numbers = [int(header.group(1)) for header in headers]
+
+        sections = {}
+        for i, header in enumerate(headers):
+            number = numbers[i]
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+            body = text[header.end():end].strip()
+            if 1 <= number <= product_count and numbers.count(number) == 1 and body:
+                sections[number] = body
+        return sections
+
+    @staticmethod
+    def _describe(product: Any, reviews: list[str]) -> Tuple[str, list[str], float, int]:
+        """Unpack a (product, reviews) item into generate_insights arguments"""
+        if isinstance(product, str):
+            return product, reviews, 0.0, len(reviews)
+        return (
+            getattr(product, 'title', str(product)),
+            reviews,
+            getattr(product, 'rating', 0.0),
+            getattr(product, 'review_count', 0) or len(reviews)
+        )
+
+
+@dataclass
+class InsightResult:
+    """Outcome of one product in a bulk insight run"""
+    product_name: str
+    insights: Optional[str] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether insights were generated"""
+        return self.error is None
+
+
+class AsyncOllamaClient:
+    """
+    asyncio front end for OllamaClient
+
+    Calls run on a dedicated thread pool over the pooled keep-alive
+    session, so the event loop never blocks on HTTP. A semaphore caps
+    the number of requests in flight at `concurrency`.
+    """
+
+    def __init__(
+        self,
+        client: Optional[OllamaClient] = None,
+        concurrency: int = PerformanceConfig.POOL_SIZE
+    ):
+        """Initialize with a sync client and a concurrency limit"""
+        self.concurrency = max(1, concurrency)
+        # Size the connection pool so every in-flight request reuses a socket
+        self.client = client or OllamaClient(OllamaConfig(
+            pool_size=max(self.concurrency, PerformanceConfig.POOL_SIZE)
+        ))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="ollama"
+        )
+
+    async def _run(self, func, *args) -> Any:
+        """Run a blocking client call under the concurrency limit"""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def generate(self, prompt: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of OllamaClient.generate (non-streaming)"""
+        return await self._run(self.client.generate, prompt, model)
+
+    async def generate_cached(self, prompt: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of OllamaClient.generate_cached"""
+        return await self._run(self.client.generate_cached, prompt, model)
+
+    def stream_generate(self, prompt: str, model: Optional[str] = None) -> "AsyncTokenStream":
+        """Async iterator over generated tokens (see OllamaClient.stream_generate)"""
+        return AsyncTokenStream(self, self.client.stream_generate(prompt, model))
+
+    def stream_chat(
+        self,
+        messages: list[Dict[str, str]],
+        model: Optional[str] = None
+    ) -> "AsyncTokenStream":
+        """Async iterator over chat reply tokens"""
+        return AsyncTokenStream(self, self.client.stream_chat(messages, model))
+
+    async def chat(
+        self,
+        messages: list[Dict[str, str]],
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async version of OllamaClient.chat"""
+        return await self._run(self.client.chat, messages, model)
+
+    def close(self) -> None:
+        """
+        Shut down the thread pool and close pooled connections
+
+        Waits for calls already running on the pool, since they still
+        use the session and cache. From a coroutine use aclose(), which
+        waits without blocking the event loop.
+        """
+        self._executor.shutdown(wait=True)
+        self.client.close()
+
+    async def aclose(self) -> None:
+        """close() with the wait for running calls moved off the event loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self.client.close()
+
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+class AsyncTokenStream:
+    """
+    Async iterator over a TokenStream
+
+    Each blocking read runs on the client's thread pool; one concurrency
+    slot is held for the lifetime of the stream. To stop early, leave an
+    `async with` block around the loop (or call aclose()): the HTTP
+    response is closed and the slot released right away, instead of
+    whenever the abandoned iterator is garbage collected.
+    """
+
+    def __init__(self, client: AsyncOllamaClient, stream: TokenStream):
+        """Wrap a sync TokenStream for use with `async for`"""
+        self._client = client
+        self._stream = stream
+        self._tokens: Optional[AsyncIterator[str]] = None
+
+    @property
+    def stats(self) -> StreamStats:
+        """Time-to-first-token and throughput of the stream"""
+        return self._stream.stats
+
+    @property
+    def error(self) -> Optional[str]:
+        """Error message if the stream failed"""
+        return self._stream.error
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        if self._tokens is None:
+            self._tokens = self._iter_tokens()
+        return self._tokens
+
+    async def _iter_tokens(self) -> AsyncIterator[str]:
+        iterator = iter(self._stream)
+        done = object()
+        read = None
+
+        try:
+            async with self._client._semaphore:
+                while True:
+                    read = self._client._executor.submit(next, iterator, done)
+                    token = await asyncio.wrap_future(read)
+                    if token is done:
+                        return
+                    yield token
+        finally:
+            # Closing the sync stream closes its HTTP response; if a read was
+            # cancelled mid-flight, close once the worker thread is done with it
+            if read is not None and not read.done():
+                read.add_done_callback(lambda _: iterator.close())
+            else:
+                iterator.close()
+
+    async def aclose(self) -> None:
+        """Stop the stream, releasing its connection and concurrency slot"""
+        if self._tokens is not None:
+            await self._tokens.aclose()
+
+    async def __aenter__(self) -> "AsyncTokenStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+class AsyncProductReviewAnalyzer:
+    """Concurrent bulk insight generation on top of AsyncOllamaClient"""
+
+    def __init__(self, client: Optional[AsyncOllamaClient] = None):
+        """Initialize analyzer with an async Ollama client"""
+        self.client = client or AsyncOllamaClient()
+
+    async def generate_insights(
+        self,
+        product_name: str,
+        reviews: list[str],
+        avg_rating: float,
+        review_count: int
+    ) -> InsightResult:
+        """
+        Generate insights for one product
+
+        Failures are reported on the returned InsightResult rather than
+        raised, so one bad product does not abort a bulk run.
+        """
+        start = time.perf_counter()
+        try:
+            context = ProductReviewAnalyzer._insights_context(product_name, avg_rating, review_count)
+            prompt = OllamaClient._review_analysis_prompt(product_name, reviews, context)
+            result = await self.client.generate_cached(prompt)
+        except Exception as e:
+            result = {"error": f"Unexpected error: {str(e)}"}
+
+        elapsed = time.perf_counter() - start
+        if "response" in result:
+            return InsightResult(product_name, insights=result["response"], elapsed=elapsed)
+        return InsightResult(
+            product_name,
+            error=result.get("error", "Failed to generate analysis"),
+            elapsed=elapsed
+        )
+
+    async def generate_insights_bulk(
+        self,
+        items: Iterable[Tuple[Any, list[str]]],
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[InsightResult]:
+        """
+        Generate insights for many products concurrently
+        
+        Args:
+            items: (product, reviews) pairs; product is a name or an
+                object with title / rating / review_count attributes
+                (e.g. data_import.Product)
+            concurrency: Max products in flight (defaults to the client's limit)
+            
+        Yields:
+            InsightResult objects in completion order
+        """
+        limit = concurrency or self.client.concurrency
+        iterator = iter(items)
+        pending = set()
+        exhausted = object()
+
+        def schedule() -> bool:
+            item = next(iterator, exhausted)
+            if item is exhausted:
+                return False
+            pending.add(asyncio.ensure_future(self._generate_item(item)))
+            return True
+
+        try:
+            # Only `limit` items are pulled from the iterable at a time
+            while len(pending) < limit and schedule():
+                pass
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.discard(task)
+                    yield task.result()
+                    schedule()
+        finally:
+            # The consumer stopped early (break or exception): don't leave work running
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _generate_item(self, item: Any) -> InsightResult:
+        """generate_insights() for one (product, reviews) item; a malformed item becomes an error result"""
+        try:
+            product, reviews = item
+            arguments = ProductReviewAnalyzer._describe(product, reviews)
+        except Exception as e:
+            return InsightResult(self._item_name(item), error=f"Invalid item: {str(e)}")
+        return await self.generate_insights(*arguments)
+
+    @staticmethod
+    def _item_name(item: Any) -> str:
+        """Best-effort product name of a possibly malformed item"""
+        try:
+            product = item[0]
+        except (TypeError, IndexError, KeyError):
+            return str(item)
+        return product if isinstance(product, str) else getattr(product, 'title', str(product))
+
 
 if __name__ == "__main__":
     # Example usage
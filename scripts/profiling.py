@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Profiling - Opt-in per-stage CPU and allocation profiling for batch jobs
+Demonstrates cProfile and tracemalloc instrumentation of a pipeline
+
+The __main__ jobs of data_import.py and review_analyzer.py wrap each
+step in profiler.stage(...). With --profile every stage gets its own
+cProfile run and a tracemalloc comparison (which source lines allocated
+the memory still held at the end of the stage), and a hotspot summary
+across all stages is printed at the end. Without --profile the stages
+are plain no-op context managers.
+
+Usage:
+    python scripts/data_import.py --profile
+    python scripts/review_analyzer.py --profile --profile-top 20 --profile-dir profiles
+"""
+
+import argparse
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+
+# Frames kept per allocation traceback; 1 groups by allocating line
+TRACEMALLOC_FRAMES = 1
+
+
+@dataclass
+class StageProfile:
+    """CPU and allocation profile of one pipeline stage"""
+    name: str
+    seconds: float
+    stats: pstats.Stats
+    allocations: List[tracemalloc.StatisticDiff] = field(default_factory=list)
+    peak_bytes: int = 0
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the --profile options shared by the pipeline entry points"""
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile each stage with cProfile and tracemalloc")
+    parser.add_argument("--profile-top", type=int, default=10,
+                        help="Rows per hotspot and allocation table")
+    parser.add_argument("--profile-dir", default=None,
+                        help="Also save each stage's cProfile data (.prof) here")
+
+
+class PipelineProfiler:
+    """
+    Collects a StageProfile per stage and prints a report
+
+    Stages must not be nested: only one cProfile profiler can be active
+    at a time, so a stage opened inside another is not profiled on its own.
+    """
+
+    def __init__(self, enabled: bool = False, top_n: int = 10, output_dir: Optional[str] = None):
+        """Initialize; nothing is measured unless enabled"""
+        self.enabled = enabled
+        self.top_n = top_n
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.stages: List[StageProfile] = []
+        self._active = False
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "PipelineProfiler":
+        """Build from options added by add_profile_arguments()"""
+        return cls(args.profile, args.profile_top, args.profile_dir)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as one stage"""
+        if not self.enabled or self._active:
+            yield
+            return
+
+        self._active = True
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profiler = cProfile.Profile()
+
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self._active = False
+
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            allocations = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+            self.stages.append(StageProfile(
+                name=name,
+                seconds=elapsed,
+                stats=pstats.Stats(profiler, stream=io.StringIO()),
+                allocations=[diff for diff in allocations if diff.size_diff > 0][:self.top_n],
+                peak_bytes=peak
+            ))
+            if self.output_dir is not None:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(self.output_dir / f"{name}.prof"))
+
+    def report(self) -> str:
+        """Per-stage tables followed by the hotspot summary across all stages"""
+        if not self.stages:
+            return ""
+
+        lines = ["", "=" * 70, "PROFILE", "=" * 70]
+        total_seconds = sum(stage.seconds for stage in self.stages)
+
+        for stage in self.stages:
+            lines.append(f"\n▶ {stage.name}: {stage.seconds:.3f}s "
+                         f"({stage.seconds / total_seconds * 100:.0f}% of profiled time), "
+                         f"peak traced memory {stage.peak_bytes / 1e6:.1f} MB")
+            lines.append("  Top functions (own time):")
+            lines.extend(self._function_rows(stage.stats, stage.seconds))
+            if stage.allocations:
+                lines.append("  Top allocation sites (memory still held at stage end):")
+                for diff in stage.allocations:
+                    frame = diff.traceback[0]
+                    lines.append(f"    {diff.size_diff / 1024:>10.1f} KiB  {diff.count_diff:>8} blocks  "
+                                 f"{Path(frame.filename).name}:{frame.lineno}")
+
+        combined = pstats.Stats(stream=io.StringIO())
+        for stage in self.stages:
+            combined.add(stage.stats)
+
+        lines.append("\n" + "-" * 70)
+        lines.append(f"HOTSPOTS (top {self.top_n} by own time across {len(self.stages)} stages, "
+                     f"{total_seconds:.3f}s profiled)")
+        lines.append("-" * 70)
+        lines.extend(self._function_rows(combined, total_seconds))
+        if self.output_dir is not None:
+            lines.append(f"\ncProfile data saved to {self.output_dir}/<stage>.prof")
+        return "\n".join(lines)
+
+    def print_report(self) -> None:
+        """Print report() if anything was profiled"""
+        if self.stages:
+            print(self.report())
+
+    def _function_rows(self, stats: pstats.Stats, total_seconds: float) -> List[str]:
+        """Formatted top-N rows of a Stats object, sorted by own (tottime) time"""
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        rows = []
+        for (filename, lineno, function), (_, calls, tottime, cumtime, _) in entries[:self.top_n]:
+            share = tottime / total_seconds * 100 if total_seconds else 0.0
+            location = function if filename == '~' else f"{Path(filename).name}:{lineno}({function})"
+            rows.append(f"    {tottime:>8.3f}s {share:>5.1f}%  cum {cumtime:>8.3f}s  "
+                        f"{calls:>10} calls  {location}")
+        return rows
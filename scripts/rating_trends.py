@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Rating Trends - Time-bucketed rating aggregates per product
+Demonstrates pre-aggregated rollups for fast time-window queries
+
+Every review adds one to a rating counter in its day bucket, per
+product and for the whole corpus; week and month buckets are rolled up
+from the days when first queried. Dashboards read trend series straight
+from the buckets, and any window ("product 7, last 30 days") is
+answered by summing whole months plus the leftover days at either edge
+- a few dozen bucket lookups, however many reviews the window covers.
+Buckets are UTC calendar periods; weeks start on Monday.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from config import Config
+from review_store import MISSING_DATE, parse_review_date
+
+
+GRANULARITIES = ("day", "week", "month")
+
+_SECONDS_PER_DAY = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# 1970-01-01 was a Thursday; weeks start on Monday
+_WEEK_OFFSET = 3
+_RATINGS = range(Config.MIN_PRODUCT_RATING, Config.MAX_PRODUCT_RATING + 1)
+
+# Bucket key used for the all-products aggregates
+ALL_PRODUCTS = None
+
+# Distinct date strings remembered by track() before the cache is reset
+_DATE_CACHE_LIMIT = 100_000
+_UNSEEN = object()
+
+DateLike = Union[str, int, date, datetime, None]
+
+
+@dataclass
+class TrendPoint:
+    """Rating aggregate of one product (or the corpus) in one period"""
+    period: str  # ISO date the period starts on
+    total_reviews: int
+    average_rating: float
+    rating_distribution: Dict[int, int]
+
+
+def _summarize(counts: List[int]) -> Tuple[int, float, Dict[int, int]]:
+    """(total, average, distribution) of a per-rating count list"""
+    total = sum(counts)
+    rating_sum = sum(rating * count for rating, count in zip(_RATINGS, counts))
+    average = round(rating_sum / total, 2) if total else 0
+    return total, average, dict(zip(_RATINGS, counts))
+
+
+class RatingTrends:
+    """
+    Daily, weekly and monthly rating counts per product
+
+    Fill it while importing (track() passes a review stream through,
+    counting as it goes) or from a finished ReviewStore with
+    from_store(). Reviews without a parseable date, and ratings outside
+    Config.MIN_PRODUCT_RATING..MAX_PRODUCT_RATING, are counted in
+    `skipped` and left out of every bucket.
+    """
+
+    def __init__(self):
+        """Initialize empty buckets"""
+        # product_id (or ALL_PRODUCTS) -> epoch day -> per-rating counts
+        self._days: Dict[Any, Dict[int, List[int]]] = {}
+        # product_id -> (week buckets, month buckets), rolled up from the
+        # day buckets when first queried and again once they have changed
+        self._rollups: Dict[Any, Tuple[Dict[int, List[int]], Dict[int, List[int]]]] = {}
+        self._stale: set = set()
+        # date string -> epoch day (None if unparseable); dates repeat heavily
+        self._date_days: Dict[str, Optional[int]] = {}
+        self.total_reviews = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_reviews(cls, reviews: Iterable[Any]) -> "RatingTrends":
+        """Build from any iterable of Review objects"""
+        trends = cls()
+        for _ in trends.track(reviews):
+            pass
+        return trends
+
+    @classmethod
+    def from_store(cls, store: Any) -> "RatingTrends":
+        """Build from a ReviewStore's product, rating and date columns"""
+        trends = cls()
+        for product_id, rating, timestamp in zip(store.product_ids, store.ratings, store.dates):
+            trends.add(product_id, rating, timestamp)
+        return trends
+
+    def track(self, reviews: Iterable[Any]) -> Iterator[Any]:
+        """
+        Yield reviews unchanged, adding each to the buckets on the way
+
+        Usage:
+            reviews = list(trends.track(importer.iter_jsonl_reviews(path)))
+        """
+        date_days = self._date_days
+        for review in reviews:
+            day = date_days.get(review.date, _UNSEEN)
+            if day is _UNSEEN:
+                if len(date_days) >= _DATE_CACHE_LIMIT:
+                    date_days.clear()
+                timestamp = parse_review_date(review.date)
+                day = date_days[review.date] = None if timestamp == MISSING_DATE else timestamp // _SECONDS_PER_DAY
+            self._count(review.product_id, review.rating, day)
+            yield review
+
+    def add(self, product_id: Any, rating: int, timestamp: int) -> None:
+        """
+        Count one review
+
+        Args:
+            product_id: Product the review belongs to
+            rating: Star rating
+            timestamp: Review date as epoch seconds (MISSING_DATE if unknown)
+        """
+        self._count(product_id, rating, None if timestamp == MISSING_DATE else timestamp // _SECONDS_PER_DAY)
+
+    def _count(self, product_id: Any, rating: int, day: Optional[int]) -> None:
+        """Add one review to its product's and the corpus's day bucket"""
+        if day is None or rating not in _RATINGS:
+            self.skipped += 1
+            return
+        self.total_reviews += 1
+
+        index = rating - Config.MIN_PRODUCT_RATING
+        for owner in (product_id, ALL_PRODUCTS):
+            self._stale.add(owner)
+            days = self._days.get(owner)
+            if days is None:
+                days = self._days[owner] = {}
+            counts = days.get(day)
+            if counts is None:
+                counts = days[day] = [0] * len(_RATINGS)
+            counts[index] += 1
+
+    def _granularity_buckets(self, product_id: Any, granularity: str) -> Dict[int, List[int]]:
+        """One product's buckets of one granularity"""
+        days = self._days.get(product_id, {})
+        if granularity == "day":
+            return days
+
+        if product_id in self._stale or product_id not in self._rollups:
+            weeks: Dict[int, List[int]] = {}
+            months: Dict[int, List[int]] = {}
+            for day, counts in days.items():
+                for buckets, key in ((weeks, (day + _WEEK_OFFSET) // 7), (months, self._month_bounds(day)[0])):
+                    total = buckets.get(key)
+                    if total is None:
+                        buckets[key] = list(counts)
+                    else:
+                        for i, count in enumerate(counts):
+                            total[i] += count
+            self._rollups[product_id] = (weeks, months)
+            self._stale.discard(product_id)
+        return self._rollups[product_id][GRANULARITIES.index(granularity) - 1]
+
+    def products(self) -> List[Any]:
+        """Product ids with at least one dated review"""
+        return [owner for owner in self._days if owner is not ALL_PRODUCTS]
+
+    def window(
+        self,
+        product_id: Any = ALL_PRODUCTS,
+        start: DateLike = None,
+        end: DateLike = None,
+        days: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Rating aggregate of a product (or all products) over a date range
+
+        Args:
+            product_id: Product to query (default: every product)
+            start: First day included (ISO date, epoch seconds, date or
+                datetime); defaults to end - days, or the earliest review
+            end: Day after the last day included; defaults to tomorrow (UTC),
+                so days=30 means the last 30 days including today
+            days: Window length, used when start is not given
+
+        Returns:
+            Dictionary with start, end, total_reviews, average_rating and
+            rating_distribution (1-5)
+        """
+        end_day = self._day(end) if end is not None else self._day(datetime.now(timezone.utc)) + 1
+        if start is not None:
+            start_day = self._day(start)
+        elif days is not None:
+            start_day = end_day - days
+        else:
+            start_day = min(self._granularity_buckets(product_id, "day"), default=end_day)
+
+        counts = [0] * len(_RATINGS)
+        days_by_bucket = self._granularity_buckets(product_id, "day")
+        months_by_bucket = self._granularity_buckets(product_id, "month")
+        day = start_day
+        while day < end_day:
+            month, month_start, next_month_start = self._month_bounds(day)
+            if day == month_start and next_month_start <= end_day:
+                buckets = [months_by_bucket.get(month)]
+            else:
+                buckets = [days_by_bucket.get(d) for d in range(day, min(next_month_start, end_day))]
+            for bucket in buckets:
+                if bucket:
+                    for i, count in enumerate(bucket):
+                        counts[i] += count
+            day = next_month_start
+
+        total, average, distribution = _summarize(counts)
+        return {
+            'start': self._iso(start_day),
+            'end': self._iso(end_day),
+            'total_reviews': total,
+            'average_rating': average,
+            'rating_distribution': distribution
+        }
+
+    def series(
+        self,
+        product_id: Any = ALL_PRODUCTS,
+        granularity: str = "month",
+        start: DateLike = None,
+        end: DateLike = None
+    ) -> List[TrendPoint]:
+        """
+        Non-empty periods of a product (or all products), oldest first
+
+        Args:
+            product_id: Product to query (default: every product)
+            granularity: "day", "week" or "month"
+            start: Only periods starting on or after this date
+            end: Only periods starting before this date
+
+        Returns:
+            One TrendPoint per period that has reviews
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {GRANULARITIES}, not {granularity!r}")
+
+        start_day = self._day(start) if start is not None else None
+        end_day = self._day(end) if end is not None else None
+        points = []
+        for bucket, counts in sorted(self._granularity_buckets(product_id, granularity).items()):
+            first_day = self._bucket_start(granularity, bucket)
+            if (start_day is not None and first_day < start_day) or (end_day is not None and first_day >= end_day):
+                continue
+            total, average, distribution = _summarize(counts)
+            points.append(TrendPoint(self._iso(first_day), total, average, distribution))
+        return points
+
+    @staticmethod
+    def _month_bounds(day: int) -> Tuple[int, int, int]:
+        """Month bucket of an epoch day, with the epoch days that month and the next start on"""
+        first = date.fromordinal(day + _EPOCH_ORDINAL).replace(day=1)
+        following = (first + timedelta(days=32)).replace(day=1)
+        month = (first.year - 1970) * 12 + first.month - 1
+        return month, first.toordinal() - _EPOCH_ORDINAL, following.toordinal() - _EPOCH_ORDINAL
+
+    @staticmethod
+    def _bucket_start(granularity: str, bucket: int) -> int:
+        """Epoch day a bucket starts on"""
+        if granularity == "day":
+            return bucket
+        if granularity == "week":
+            return bucket * 7 - _WEEK_OFFSET
+        year, month = divmod(bucket, 12)
+        return date(1970 + year, month + 1, 1).toordinal() - _EPOCH_ORDINAL
+
+    @staticmethod
+    def _day(value: DateLike) -> int:
+        """Epoch day of an ISO date string, epoch seconds, date or datetime"""
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return int(value.timestamp()) // _SECONDS_PER_DAY
+        if isinstance(value, date):
+            return value.toordinal() - _EPOCH_ORDINAL
+        if isinstance(value, str):
+            timestamp = parse_review_date(value)
+            if timestamp == MISSING_DATE:
+                raise ValueError(f"Not an ISO date: {value!r}")
+            return timestamp // _SECONDS_PER_DAY
+        return int(value) // _SECONDS_PER_DAY
+
+    @staticmethod
+    def _iso(day: int) -> str:
+        """ISO date string of an epoch day"""
+        return date.fromordinal(day + _EPOCH_ORDINAL).isoformat()
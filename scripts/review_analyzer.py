@@ -5,10 +5,22 @@ Demonstrates NLP and data processing capabilities
 """
 
 import json
-import re
-from collections import Counter
-from typing import List, Dict, Any
-from dataclasses import dataclass
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from config import PerformanceConfig
+from document_frequency import DocumentFrequencyTable, corpus_fingerprint
+from metrics import REGISTRY
+from search_index import ReviewSearchIndex, SearchHit
+from sentiment import DEFAULT_LEXICON, POSITIVE, NEGATIVE, SentimentLexicon
+from topic_tokens import count_topic_phrases, count_topic_words, topic_phrases, topic_words
+from vectorized_stats import rating_histogram
+
+if TYPE_CHECKING:
+    from review_store import ReviewStore
 
 
 @dataclass
@@ -21,109 +33,557 @@ class ReviewMetrics:
     sentiment_summary: str
 
 
+@dataclass
+class ReviewCounts:
+    """
+    Aggregate counts for a set of reviews
+
+    Supports add/remove of single reviews and merging with another
+    aggregate, so a product summary can be kept up to date as reviews
+    arrive without recomputing it from the raw corpus.
+    """
+    total_reviews: int = 0
+    rating_counts: Counter = field(default_factory=Counter)
+    rating_sum: int = 0
+    word_counts: Counter = field(default_factory=Counter)
+    positive_count: int = 0
+    negative_count: int = 0
+
+    def merge(self, other: "ReviewCounts") -> "ReviewCounts":
+        """Fold another set of counts into this one"""
+        self.total_reviews += other.total_reviews
+        self.rating_counts.update(other.rating_counts)
+        self.rating_sum += other.rating_sum
+        self.word_counts.update(other.word_counts)
+        self.positive_count += other.positive_count
+        self.negative_count += other.negative_count
+        return self
+
+    def add(self, review: Dict, lexicon: SentimentLexicon = DEFAULT_LEXICON) -> None:
+        """Count a single review"""
+        self.add_values(review.get('review_text', ''), review.get('rating', 0), lexicon)
+
+    def remove(self, review: Dict, lexicon: SentimentLexicon = DEFAULT_LEXICON) -> None:
+        """Un-count a review previously passed to add()"""
+        self._apply(review.get('review_text', ''), review.get('rating', 0), lexicon, -1)
+
+    def add_values(self, text: str, rating: int, lexicon: SentimentLexicon = DEFAULT_LEXICON) -> None:
+        """Count a review given its text and rating (no dict needed)"""
+        self._apply(text, rating, lexicon, 1)
+
+    def _apply(self, text: str, rating: int, lexicon: SentimentLexicon, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) one review's contribution"""
+        self.total_reviews += sign
+        if rating:
+            self.rating_sum += sign * rating
+            self._bump(self.rating_counts, rating, sign)
+        self._apply_text(text, rating, lexicon, sign)
+
+    def _apply_text(self, text: str, rating: int, lexicon: SentimentLexicon, sign: int) -> None:
+        """Topic word and sentiment contribution of one review"""
+        if sign > 0:
+            count_topic_words((text,), self.word_counts)
+        else:
+            for word in topic_words(text):
+                self._bump(self.word_counts, word, sign)
+
+        polarity = lexicon.classify(text, rating)
+        if polarity == POSITIVE:
+            self.positive_count += sign
+        elif polarity == NEGATIVE:
+            self.negative_count += sign
+
+    @staticmethod
+    def _bump(counter: Counter, key: Any, sign: int) -> None:
+        """Adjust a counter entry, dropping it once it reaches zero"""
+        value = counter[key] + sign
+        if value > 0:
+            counter[key] = value
+        else:
+            del counter[key]
+
+
 class ReviewAnalyzer:
     """Analyzes product reviews to extract insights and patterns"""
 
-    # Common positive and negative keywords for sentiment analysis
-    POSITIVE_KEYWORDS = {
-        'excellent', 'great', 'amazing', 'fantastic', 'wonderful',
-        'love', 'perfect', 'best', 'outstanding', 'beautiful',
-        'fast', 'reliable', 'quality', 'worth', 'recommend'
-    }
-    
-    NEGATIVE_KEYWORDS = {
-        'poor', 'bad', 'terrible', 'awful', 'horrible',
-        'hate', 'worst', 'broken', 'disappointing', 'waste',
-        'slow', 'cheap', 'problem', 'issue', 'defective'
-    }
+    # Sentiment keywords come from SentimentKeywords in config.py
+    POSITIVE_KEYWORDS = DEFAULT_LEXICON.words(POSITIVE)
+    NEGATIVE_KEYWORDS = DEFAULT_LEXICON.words(NEGATIVE)
 
-    def __init__(self):
+    def __init__(self, lexicon: SentimentLexicon = None):
         """Initialize the review analyzer"""
         self.reviews = []
+        self.lexicon = lexicon or DEFAULT_LEXICON
+        # product_id -> reviews, kept in sync with self.reviews
+        self._product_index: Dict[Any, List[Dict]] = defaultdict(list)
+        self._indexed_count = 0
+        # id(review) -> position in self.reviews / in its product's list,
+        # so remove_review() does not scan the corpus
+        self._positions: Dict[int, int] = {}
+        self._product_positions: Dict[int, int] = {}
+        # Aggregates computed on first use, then updated incrementally
+        self._product_counts: Dict[Any, ReviewCounts] = {}
+        self._corpus_counts: Optional[ReviewCounts] = None
+        self._product_phrase_counts: Dict[Any, Counter] = {}
+        # Full-text index built on first search(), keyed by id(review)
+        self._search_index: Optional[ReviewSearchIndex] = None
+        self._search_doc_ids: Dict[int, int] = {}
+        # Corpus document frequencies, loaded or built on first use
+        # (phrases, table file) -> table
+        self._document_frequencies: Dict[Tuple[bool, str], DocumentFrequencyTable] = {}
+
+    def add_review(self, review: Dict) -> None:
+        """
+        Append a single review and index it by product
+
+        Reviews are tracked by identity, so adding the same dict object
+        twice raises ValueError (add a copy for a genuine duplicate).
+        """
+        self._sync_index()
+        if self._holds(self.reviews, self._positions.get(id(review)), review):
+            raise ValueError("Review is already in the analyzer")
+        self.reviews.append(review)
+        self._index_review(review, len(self.reviews) - 1)
+        self._indexed_count += 1
+
+    def remove_review(self, review: Dict) -> None:
+        """
+        Remove a review and un-count it from any cached aggregates
+
+        The review is matched by identity, so an equal duplicate stays.
+        Its slot in self.reviews (and in its product's list) is taken by
+        the last review, which keeps removal O(1) but does not preserve
+        order. Raises ValueError, leaving every index untouched, if the
+        review was never added.
+        """
+        self._sync_index()
+        product_id = review.get('product_id')
+        product_reviews = self._product_index.get(product_id, [])
+        position = self._positions.get(id(review))
+        product_position = self._product_positions.get(id(review))
+        if not (self._holds(self.reviews, position, review) and
+                self._holds(product_reviews, product_position, review)):
+            raise ValueError("Review is not in the analyzer")
+
+        self._swap_remove(self.reviews, position, self._positions)
+        self._indexed_count -= 1
+        self._swap_remove(product_reviews, product_position, self._product_positions)
+        if product_id in self._product_counts:
+            self._product_counts[product_id].remove(review, self.lexicon)
+        if self._corpus_counts is not None:
+            self._corpus_counts.remove(review, self.lexicon)
+        if product_id in self._product_phrase_counts:
+            phrase_counts = self._product_phrase_counts[product_id]
+            for phrase in topic_phrases(review.get('review_text', '')):
+                ReviewCounts._bump(phrase_counts, phrase, -1)
+        if self._search_index is not None:
+            doc_id = self._search_doc_ids.pop(id(review), None)
+            if doc_id is not None:
+                self._search_index.remove(doc_id, review.get('review_text', ''))
+        for table in self._document_frequencies.values():
+            table.remove_texts((review.get('review_text', ''),))
+
+    @staticmethod
+    def _holds(reviews: List[Dict], position: Optional[int], review: Dict) -> bool:
+        """Whether this very review object sits at `position` in the list"""
+        return position is not None and position < len(reviews) and reviews[position] is review
+
+    @staticmethod
+    def _swap_remove(reviews: List[Dict], position: int, positions: Dict[int, int]) -> None:
+        """Delete reviews[position] in O(1) by moving the last review into its slot"""
+        removed = reviews[position]
+        last = reviews.pop()
+        if last is not removed:
+            reviews[position] = last
+            positions[id(last)] = position
+        del positions[id(removed)]
+
+    def add_reviews(self, reviews: Iterable[Dict]) -> None:
+        """Append several reviews and index them by product"""
+        for review in reviews:
+            self.add_review(review)
+
+    def ingest_reviews(self, reviews: Iterable[Dict]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Add newly arrived reviews and return fresh summaries for the
+        products they belong to
+
+        Only the affected products' aggregates are touched, so the cost
+        is proportional to the new reviews, not the corpus.
+        """
+        affected = {}
+        for review in reviews:
+            self.add_review(review)
+            affected[review.get('product_id')] = True
+
+        return {product_id: self.generate_summary(product_id) for product_id in affected}
+
+    def _index_review(self, review: Dict, position: int) -> None:
+        """Add a review (at `position` in self.reviews) to the product index and any cached aggregates"""
+        product_id = review.get('product_id')
+        product_reviews = self._product_index[product_id]
+        self._positions[id(review)] = position
+        self._product_positions[id(review)] = len(product_reviews)
+        product_reviews.append(review)
+        if product_id in self._product_counts:
+            self._product_counts[product_id].add(review, self.lexicon)
+        if self._corpus_counts is not None:
+            self._corpus_counts.add(review, self.lexicon)
+        if product_id in self._product_phrase_counts:
+            count_topic_phrases((review.get('review_text', ''),), self._product_phrase_counts[product_id])
+        if self._search_index is not None:
+            self._search_doc_ids[id(review)] = self._search_index.add_review(review)
+        for table in self._document_frequencies.values():
+            table.add_texts((review.get('review_text', ''),))
+
+    def _sync_index(self) -> None:
+        """Index reviews appended to self.reviews directly since the last sync"""
+        if self._indexed_count > len(self.reviews):
+            # The list was replaced or truncated, so rebuild from scratch
+            self._product_index = defaultdict(list)
+            self._positions = {}
+            self._product_positions = {}
+            self._product_counts = {}
+            self._corpus_counts = None
+            self._product_phrase_counts = {}
+            self._search_index = None
+            self._search_doc_ids = {}
+            self._document_frequencies = {}
+            self._indexed_count = 0
+
+        for position in range(self._indexed_count, len(self.reviews)):
+            self._index_review(self.reviews[position], position)
+        self._indexed_count = len(self.reviews)
+
+    def get_product_reviews(self, product_id: Any) -> List[Dict]:
+        """Get all reviews for a product without scanning the full corpus"""
+        self._sync_index()
+        return self._product_index.get(product_id, [])
+
+    def search(
+        self,
+        query: str,
+        product_id: Any = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        limit: Optional[int] = 10
+    ) -> List[SearchHit]:
+        """
+        Find reviews by keyword without scanning the corpus
+
+        The index is built on the first call and then updated as reviews
+        are added or removed. See ReviewSearchIndex.search for the query
+        syntax ("quoted phrases" must match) and BM25 ranking.
+        """
+        self._sync_index()
+
+        if self._search_index is None:
+            with REGISTRY.timer(stage="search_index_build"):
+                self._search_index = ReviewSearchIndex(tokenizer=topic_words)
+                for review in self.reviews:
+                    self._search_doc_ids[id(review)] = self._search_index.add_review(review)
+
+        with REGISTRY.timer(stage="search"):
+            return self._search_index.search(query, product_id, min_rating, max_rating, limit)
 
     def load_reviews_from_json(self, filepath: str) -> None:
         """Load reviews from JSONL file"""
+        reviews = self.read_reviews_json(filepath)
+        if reviews is not None:
+            self.add_reviews(reviews)
+            print(f"✓ Loaded {len(self.reviews)} reviews from {filepath}")
+
+    @staticmethod
+    def read_reviews_json(filepath: str) -> Optional[List[Dict]]:
+        """
+        Parse a JSONL review file without indexing it
+
+        Returns the reviews before the first invalid line, or None if
+        the file does not exist.
+        """
+        reviews = []
         try:
             with open(filepath, 'r') as f:
                 for line in f:
                     if line.strip():
-                        self.reviews.append(json.loads(line))
-            print(f"✓ Loaded {len(self.reviews)} reviews from {filepath}")
+                        reviews.append(json.loads(line))
         except FileNotFoundError:
             print(f"✗ File not found: {filepath}")
+            return None
         except json.JSONDecodeError as e:
             print(f"✗ Invalid JSON format: {e}")
+        return reviews
+
+    def calculate_metrics(self, product_id: int = None, workers: Optional[int] = None) -> ReviewMetrics:
+        """
+        Calculate comprehensive review metrics
+
+        Args:
+            product_id: Restrict to one product (all reviews if not given)
+            workers: Shard the reviews across this many processes; the
+                result is identical to the serial computation
+        """
+        counts = self.get_review_counts(product_id, workers)
+
+        if not counts.total_reviews:
+            return ReviewMetrics(0, 0, {}, [], "No reviews found")
+
+        return self._metrics_from_counts(counts)
+
+    def get_review_counts(self, product_id: int = None, workers: Optional[int] = None) -> ReviewCounts:
+        """
+        Get the aggregate counts for a product (or the whole corpus)
+
+        The first call computes them from the raw reviews; afterwards they
+        are kept current by add_review/remove_review and returned as is.
+        """
+        self._sync_index()
+
+        if product_id:
+            cached = self._product_counts.get(product_id)
+        else:
+            cached = self._corpus_counts
+        if cached is not None:
+            return cached
+
+        reviews_to_analyze = self.get_product_reviews(product_id) if product_id else self.reviews
+
+        with REGISTRY.timer(stage="analyze"):
+            if workers and workers > 1 and len(reviews_to_analyze) >= PerformanceConfig.PARALLEL_MIN_REVIEWS:
+                counts = self._count_reviews_parallel(reviews_to_analyze, workers)
+            else:
+                counts = self._count_reviews(reviews_to_analyze)
+        REGISTRY.inc("reviews_analyzed_total", len(reviews_to_analyze))
 
-    def calculate_metrics(self, product_id: int = None) -> ReviewMetrics:
-        """Calculate comprehensive review metrics"""
-        reviews_to_analyze = self.reviews
-        
         if product_id:
-            reviews_to_analyze = [r for r in self.reviews if r.get('product_id') == product_id]
+            self._product_counts[product_id] = counts
+        else:
+            self._corpus_counts = counts
+        return counts
+
+    @REGISTRY.timed("store_metrics")
+    def calculate_store_metrics(self, store: "ReviewStore", product_id: int = None) -> ReviewMetrics:
+        """
+        Calculate metrics directly on a columnar ReviewStore
+
+        The rating histogram is computed in bulk from the store's typed
+        rating column (vectorized when NumPy is installed); text is
+        decoded one row at a time, so no per-review dicts are created.
+        """
+        rows = store.product_rows(product_id or None)
+        ratings = store.ratings if not product_id else [store.ratings[i] for i in rows]
+
+        rating_counts = rating_histogram(ratings)
+        rating_counts.pop(0, None)  # Unrated reviews, as in _count_reviews
+        counts = ReviewCounts(
+            total_reviews=len(rows),
+            rating_counts=Counter(rating_counts),
+            rating_sum=sum(rating * count for rating, count in rating_counts.items())
+        )
 
-        if not reviews_to_analyze:
+        for row in rows:
+            counts._apply_text(store.text(row), store.ratings[row], self.lexicon, 1)
+
+        if not counts.total_reviews:
             return ReviewMetrics(0, 0, {}, [], "No reviews found")
 
-        # Calculate average rating
-        ratings = [r.get('rating', 0) for r in reviews_to_analyze if r.get('rating')]
-        avg_rating = sum(ratings) / len(ratings) if ratings else 0
+        return self._metrics_from_counts(counts)
+
+    def _count_reviews(self, reviews: List[Dict]) -> ReviewCounts:
+        """Compute the mergeable partial counts for a list of reviews"""
+        ratings = [r.get('rating', 0) for r in reviews if r.get('rating')]
+        positive_count, negative_count = self.tally_sentiment(reviews)
+
+        return ReviewCounts(
+            total_reviews=len(reviews),
+            rating_counts=Counter(ratings),
+            rating_sum=sum(ratings),
+            word_counts=self._count_words(reviews),
+            positive_count=positive_count,
+            negative_count=negative_count
+        )
+
+    def _count_reviews_parallel(self, reviews: List[Dict], workers: int) -> ReviewCounts:
+        """
+        Shard reviews across a process pool and merge the partial counts
 
-        # Rating distribution
-        rating_dist = Counter(ratings)
-        rating_distribution = {i: rating_dist.get(i, 0) for i in range(1, 6)}
+        Shards are contiguous and merged in order, so Counter insertion
+        order (and therefore most_common tie-breaking) matches a serial run.
+        """
+        shard_count = workers * PerformanceConfig.SHARDS_PER_WORKER
+        shard_size = max(1, -(-len(reviews) // shard_count))
+        shards = [reviews[i:i + shard_size] for i in range(0, len(reviews), shard_size)]
 
-        # Extract common topics
-        common_topics = self._extract_topics(reviews_to_analyze)
+        counts = ReviewCounts()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(_count_shard, shards, [self.lexicon] * len(shards)):
+                counts.merge(partial)
+        return counts
 
-        # Sentiment analysis
-        sentiment = self._analyze_sentiment(reviews_to_analyze)
+    def _metrics_from_counts(self, counts: ReviewCounts) -> ReviewMetrics:
+        """Build ReviewMetrics from (possibly merged) partial counts"""
+        rated = sum(counts.rating_counts.values())
+        avg_rating = counts.rating_sum / rated if rated else 0
+        rating_distribution = {i: counts.rating_counts.get(i, 0) for i in range(1, 6)}
+        common_topics = [word for word, _ in counts.word_counts.most_common(10)]
 
         return ReviewMetrics(
             avg_rating=round(avg_rating, 2),
-            total_reviews=len(reviews_to_analyze),
+            total_reviews=counts.total_reviews,
             rating_distribution=rating_distribution,
             common_topics=common_topics[:5],
-            sentiment_summary=sentiment
+            sentiment_summary=self.summarize_sentiment(counts.positive_count, counts.negative_count)
+        )
+
+    def extract_topics(self, product_id: int = None, limit: int = 10, phrases: bool = False) -> List[str]:
+        """
+        Most common topics of a product's reviews (or of all reviews)
+
+        Args:
+            product_id: Optional product ID to filter by
+            limit: Number of topics to return
+            phrases: Return two-word phrases ("battery life") instead of words
+
+        Returns:
+            Topics, most common first
+        """
+        reviews = self.get_product_reviews(product_id) if product_id else self.reviews
+        return self._extract_topics(reviews, limit, phrases)
+
+    def distinctive_topics(
+        self,
+        product_id: int,
+        limit: int = 10,
+        phrases: bool = False,
+        table: DocumentFrequencyTable = None
+    ) -> List[str]:
+        """
+        Topics that set a product apart from the rest of the corpus
+
+        Terms are ranked by TF-IDF: how often the product's reviews use
+        them, discounted by how many reviews in the whole corpus do. The
+        product's word (or phrase) counts are cached aggregates, so this
+        is a lookup and a score, not a corpus pass.
+
+        Args:
+            product_id: Product to describe
+            limit: Number of topics to return
+            phrases: Rank two-word phrases instead of words
+            table: Document frequencies to score against (defaults to
+                document_frequencies())
+
+        Returns:
+            Topics, most distinctive first
+        """
+        if table is None:
+            table = self.document_frequencies(phrases)
+        if phrases:
+            term_counts = self._phrase_counts(product_id)
+        else:
+            term_counts = self.get_review_counts(product_id).word_counts
+        return [term for term, _ in table.score(term_counts, limit)]
+
+    def _phrase_counts(self, product_id: Any) -> Counter:
+        """A product's phrase counts, computed on first use and then kept current"""
+        counts = self._product_phrase_counts.get(product_id)
+        if counts is None:
+            texts = (review.get('review_text', '') for review in self.get_product_reviews(product_id))
+            counts = self._product_phrase_counts[product_id] = count_topic_phrases(texts)
+        return counts
+
+    def document_frequencies(
+        self,
+        phrases: bool = False,
+        path: Optional[str] = None,
+        rebuild: bool = False,
+        save: bool = False
+    ) -> DocumentFrequencyTable:
+        """
+        The corpus document-frequency table used by distinctive_topics()
+
+        Loaded from `path` (Config.TOPIC_DF_FILE / TOPIC_PHRASE_DF_FILE in
+        the data directory by default) if the table there was saved for
+        exactly the loaded reviews; otherwise counted from them in one
+        pass. Tables are cached per kind and path and kept current by
+        add_review/remove_review. Nothing is written unless `save` is set.
+
+        Args:
+            phrases: Word or two-word phrase frequencies
+            path: Table file instead of the Config default
+            rebuild: Ignore any cached or saved table and recount the loaded reviews
+            save: Write the table to `path`, with the corpus fingerprint
+        """
+        self._sync_index()
+        path = Path(path) if path else DocumentFrequencyTable.default_path(phrases)
+        key = (phrases, str(path))
+        table = None if rebuild else self._document_frequencies.get(key)
+        # Hashes every review id, so computed at most once per call
+        fingerprint = None
+
+        if table is None:
+            fingerprint = self._corpus_fingerprint()
+            table = None if rebuild else DocumentFrequencyTable.load(path, phrases=phrases)
+            if table is not None and table.fingerprint != fingerprint:
+                print(f"Warning: {path} was saved for a different set of reviews; recounting")
+                table = None
+            if table is None:
+                with REGISTRY.timer(stage="document_frequencies"):
+                    table = DocumentFrequencyTable.from_texts(
+                        (review.get('review_text', '') for review in self.reviews), phrases=phrases
+                    )
+                table.fingerprint = fingerprint
+            self._document_frequencies[key] = table
+
+        if save:
+            table.fingerprint = fingerprint or self._corpus_fingerprint()
+            table.save(path)
+            print(f"✓ Document frequencies of {table.document_count} reviews saved to {path}")
+        return table
+
+    def _corpus_fingerprint(self) -> str:
+        """corpus_fingerprint() of the loaded reviews (ids; product and text for reviews without one)"""
+        return corpus_fingerprint(
+            review['id'] if 'id' in review else (review.get('product_id'), review.get('review_text', ''))
+            for review in self.reviews
         )
 
-    def _extract_topics(self, reviews: List[Dict]) -> List[str]:
+    def _extract_topics(self, reviews: List[Dict], limit: int = 10, phrases: bool = False) -> List[str]:
         """Extract common topics from review text"""
-        all_words = []
-        
-        for review in reviews:
-            text = review.get('review_text', '').lower()
-            # Remove special characters and split
-            words = re.findall(r'\b\w+\b', text)
-            all_words.extend(words)
-
-        # Filter out common stop words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'is', 'was', 'are', 'be', 'been', 'it', 'this', 'that', 'with'
-        }
+        word_freq = self._count_words(reviews, phrases)
         
-        filtered_words = [w for w in all_words if w not in stop_words and len(w) > 3]
-        word_freq = Counter(filtered_words)
-        
-        return [word for word, _ in word_freq.most_common(10)]
+        return [word for word, _ in word_freq.most_common(limit)]
+
+    def _count_words(self, reviews: List[Dict], phrases: bool = False) -> Counter:
+        """Count topic-candidate words (or two-word phrases) across review text"""
+        texts = (review.get('review_text', '') for review in reviews)
+        return count_topic_phrases(texts) if phrases else count_topic_words(texts)
 
     def _analyze_sentiment(self, reviews: List[Dict]) -> str:
         """Analyze overall sentiment of reviews"""
+        return self.summarize_sentiment(*self.tally_sentiment(reviews))
+
+    def tally_sentiment(self, reviews: Iterable[Dict]) -> Tuple[int, int]:
+        """
+        Count positive and negative reviews
+
+        Tallies of several batches can be added up and passed to
+        summarize_sentiment(), so a corpus never has to be held at once.
+        """
         positive_count = 0
         negative_count = 0
 
         for review in reviews:
-            text = review.get('review_text', '').lower()
-            rating = review.get('rating', 0)
-
-            pos_matches = sum(1 for word in self.POSITIVE_KEYWORDS if word in text)
-            neg_matches = sum(1 for word in self.NEGATIVE_KEYWORDS if word in text)
+            polarity = self.lexicon.classify(review.get('review_text', ''), review.get('rating', 0))
 
-            if rating >= 4 or pos_matches > neg_matches:
+            if polarity == POSITIVE:
                 positive_count += 1
-            elif rating <= 2 or neg_matches > pos_matches:
+            elif polarity == NEGATIVE:
                 negative_count += 1
 
+        return positive_count, negative_count
+
+    def summarize_sentiment(self, positive_count: int, negative_count: int) -> str:
+        """Turn positive/negative review tallies into a sentiment label"""
         total = positive_count + negative_count
         if total == 0:
             return "Neutral"
@@ -139,9 +599,9 @@ class ReviewAnalyzer:
         else:
             return f"Negative ({positive_pct:.0f}%)"
 
-    def generate_summary(self, product_id: int = None) -> Dict[str, Any]:
+    def generate_summary(self, product_id: int = None, workers: Optional[int] = None) -> Dict[str, Any]:
         """Generate a complete review summary"""
-        metrics = self.calculate_metrics(product_id)
+        metrics = self.calculate_metrics(product_id, workers)
         
         return {
             "averageRating": metrics.avg_rating,
@@ -182,19 +642,53 @@ class ReviewAnalyzer:
         print("="*50 + "\n")
 
 
+def _count_shard(reviews: List[Dict], lexicon: SentimentLexicon) -> ReviewCounts:
+    """Process pool entry point: count one shard of reviews"""
+    return ReviewAnalyzer(lexicon)._count_reviews(reviews)
+
+
 if __name__ == "__main__":
-    # Example usage
+    import argparse
+    from profiling import PipelineProfiler, add_profile_arguments
+
+    parser = argparse.ArgumentParser(description="Analyze product reviews")
+    parser.add_argument("--reviews", default="data/reviews.jsonl", help="Reviews JSONL file")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = PipelineProfiler.from_args(args)
+
     analyzer = ReviewAnalyzer()
     
-    # Load reviews from the data file
-    analyzer.load_reviews_from_json("data/reviews.jsonl")
+    # Load reviews from the data file: JSON decoding and indexing are
+    # separate stages
+    with profiler.stage("parse_reviews"):
+        reviews = analyzer.read_reviews_json(args.reviews)
+    if reviews is not None:
+        with profiler.stage("index_reviews"):
+            analyzer.add_reviews(reviews)
+        print(f"✓ Loaded {len(analyzer.reviews)} reviews from {args.reviews}")
     
     # Generate analysis for all reviews
     if analyzer.reviews:
-        analyzer.print_summary()
+        if profiler.enabled:
+            # The summary tokenizes and matches sentiment keywords in one
+            # stage; when profiling, also time each on its own pass
+            with profiler.stage("tokenize_topics"):
+                analyzer.extract_topics()
+            with profiler.stage("sentiment_keywords"):
+                analyzer.tally_sentiment(analyzer.reviews)
+
+        with profiler.stage("print_summary"):
+            analyzer.print_summary()
         
         # Save summary to JSON
-        summary = analyzer.generate_summary()
+        with profiler.stage("summary"):
+            summary = analyzer.generate_summary()
         with open("review_analysis.json", "w") as f:
             json.dump(summary, f, indent=2)
         print("✓ Summary saved to review_analysis.json")
+    
+    metrics_path = REGISTRY.write()
+    if metrics_path:
+        print(f"✓ Metrics written to {metrics_path}")
+    profiler.print_report()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Review Selection - Pick the reviews worth sending to the LLM
+Demonstrates greedy relevance/diversity selection under a token budget
+
+Prompts used to quote the first N reviews, so the model saw whichever
+reviews happened to come first. select_reviews() instead scores every
+review locally (question relevance, helpful votes, how much it says)
+and greedily fills a token budget with maximal marginal relevance:
+each pick is penalized for overlapping earlier picks and rewarded for
+covering a rating band (positive / neutral / negative) not yet shown.
+"""
+
+import heapq
+import math
+import zlib
+from dataclasses import dataclass
+from typing import Any, FrozenSet, List, Optional, Sequence
+
+from config import Config
+from search_index import BM25_B, BM25_K1
+from topic_tokens import topic_words
+
+
+# Score weights; relevance only applies when there is a query
+RELEVANCE_WEIGHT = 0.5
+HELPFUL_WEIGHT = 0.2
+INFORMATIVE_WEIGHT = 0.15
+RATING_SPREAD_WEIGHT = 0.15
+# Trade-off between score and novelty in the greedy pick (1 = ignore overlap)
+DIVERSITY_LAMBDA = 0.7
+# Topic words at which a review counts as fully informative
+INFORMATIVE_WORDS = 25
+# Candidates considered by the quadratic greedy step
+CANDIDATE_POOL = 200
+
+CHARS_PER_TOKEN = 4
+# chunk_reviews() ends a chunk after about one review in this many
+CHUNK_BOUNDARY_EVERY = 8
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about 4 characters per token for English)"""
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+
+def _rating_band(rating: Optional[int]) -> Optional[int]:
+    """Collapse star ratings into negative (-1), neutral (0) and positive (1)"""
+    if not rating:
+        return None
+    return 1 if rating >= 4 else (-1 if rating <= 2 else 0)
+
+
+@dataclass
+class _Candidate:
+    """A review reduced to what the selector needs"""
+    text: str
+    rating: Optional[int]
+    helpful_votes: int
+    terms: List[str]
+    words: FrozenSet[str]
+    tokens: int
+    score: float = 0.0
+
+
+def review_text(review: Any) -> str:
+    """Text of a review given as a string, a review dict or a Review object"""
+    if isinstance(review, str):
+        return review
+    if isinstance(review, dict):
+        return review.get('review_text', review.get('text', ''))
+    return getattr(review, 'text', '')
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Shorten text to roughly max_tokens, marking the cut with an ellipsis"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[:max_tokens * CHARS_PER_TOKEN - 1].rstrip() + "…"
+
+
+def _as_candidate(review: Any, max_tokens: int) -> _Candidate:
+    """Accept a review text, a review dict or a Review object"""
+    if isinstance(review, (str, dict)):
+        rating = None if isinstance(review, str) else review.get('rating')
+        votes = 0 if isinstance(review, str) else review.get('helpful_votes', 0)
+    else:
+        rating, votes = getattr(review, 'rating', None), getattr(review, 'helpful_votes', 0)
+
+    # A single long review may not crowd out everything else
+    text = truncate_to_tokens(review_text(review), max_tokens)
+    terms = topic_words(text)
+    return _Candidate(text, rating, votes or 0, terms, frozenset(terms), estimate_tokens(text))
+
+
+def _relevance(candidates: List[_Candidate], query: str) -> List[float]:
+    """BM25 score of each candidate for the query, scaled so the best is 1"""
+    query_terms = set(topic_words(query))
+    if not query_terms:
+        return [0.0] * len(candidates)
+
+    total = len(candidates)
+    average_length = sum(len(c.terms) for c in candidates) / total or 1
+    frequencies = [
+        {term: c.terms.count(term) for term in query_terms if term in c.words}
+        for c in candidates
+    ]
+
+    scores = [0.0] * total
+    for term in query_terms:
+        df = sum(1 for tf in frequencies if term in tf)
+        if not df:
+            continue
+        idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+        for i, tf in enumerate(frequencies):
+            count = tf.get(term)
+            if count:
+                norm = 1 - BM25_B + BM25_B * len(candidates[i].terms) / average_length
+                scores[i] += idf * count * (BM25_K1 + 1) / (count + BM25_K1 * norm)
+
+    top = max(scores)
+    return [score / top for score in scores] if top else scores
+
+
+def _similarity(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    """Jaccard similarity of two topic-word sets"""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def select_reviews(
+    reviews: Sequence[Any],
+    query: Optional[str] = None,
+    token_budget: int = Config.PROMPT_REVIEW_TOKENS,
+    max_reviews: Optional[int] = None
+) -> List[str]:
+    """
+    Choose informative, diverse reviews that fit in a token budget
+
+    Args:
+        reviews: Review texts, review dicts (review_text / rating /
+            helpful_votes) or data_import.Review objects
+        query: Question the reviews should help answer (optional)
+        token_budget: Estimated tokens the selected texts may use
+        max_reviews: Optional cap on the number of reviews
+
+    Returns:
+        Selected review texts, most valuable first; the result does not
+        depend on the order of the input
+    """
+    # Any one review may use at most a third of the budget
+    per_review_tokens = max(1, token_budget // 3)
+    candidates = [_as_candidate(review, per_review_tokens) for review in reviews]
+    candidates = [c for c in candidates if c.text.strip()]
+    if not candidates:
+        return []
+
+    relevance = _relevance(candidates, query) if query else [0.0] * len(candidates)
+    max_votes = max(c.helpful_votes for c in candidates)
+    for c, relevant in zip(candidates, relevance):
+        c.score = (
+            RELEVANCE_WEIGHT * relevant
+            + HELPFUL_WEIGHT * (math.log1p(c.helpful_votes) / math.log1p(max_votes) if max_votes else 0.0)
+            + INFORMATIVE_WEIGHT * min(1.0, len(c.words) / INFORMATIVE_WORDS)
+        )
+
+    # Ties are broken by text so the choice is independent of input order
+    def rank(c: _Candidate):
+        return (-c.score, c.text)
+
+    pool = heapq.nsmallest(CANDIDATE_POOL, candidates, key=rank)
+    # Keep the best few of every rating band so spread is always possible
+    for band in (-1, 0, 1):
+        in_band = [c for c in candidates if _rating_band(c.rating) == band]
+        pool.extend(heapq.nsmallest(5, in_band, key=rank))
+    pool = sorted({id(c): c for c in pool}.values(), key=rank)
+
+    selected: List[_Candidate] = []
+    bands_shown = set()
+    remaining = token_budget
+    while pool and (max_reviews is None or len(selected) < max_reviews):
+        best, best_value = None, -math.inf
+        for c in pool:
+            if c.tokens > remaining:
+                continue
+            overlap = max((_similarity(c.words, s.words) for s in selected), default=0.0)
+            band = _rating_band(c.rating)
+            spread = RATING_SPREAD_WEIGHT if band is not None and band not in bands_shown else 0.0
+            value = DIVERSITY_LAMBDA * (c.score + spread) - (1 - DIVERSITY_LAMBDA) * overlap
+            if value > best_value:
+                best, best_value = c, value
+        if best is None:
+            break
+
+        selected.append(best)
+        bands_shown.add(_rating_band(best.rating))
+        remaining -= best.tokens
+        pool.remove(best)
+
+    return [c.text for c in selected]
+
+
+def chunk_reviews(reviews: Sequence[Any], token_budget: int) -> List[List[str]]:
+    """
+    Split reviews, in order, into chunks of at most token_budget tokens
+
+    Chunk boundaries are content-defined: a chunk ends after any review
+    whose text hash hits 1 in CHUNK_BOUNDARY_EVERY (or when the next
+    review would not fit). Inserting or appending reviews therefore
+    only changes the chunks around the new reviews, and the rest keep
+    their exact content - and their cached summaries.
+    """
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    used = 0
+
+    for review in reviews:
+        text = truncate_to_tokens(review_text(review), token_budget)
+        if not text.strip():
+            continue
+        tokens = estimate_tokens(text)
+        if chunk and used + tokens > token_budget:
+            chunks.append(chunk)
+            chunk, used = [], 0
+
+        chunk.append(text)
+        used += tokens
+        if zlib.crc32(text.encode('utf-8')) % CHUNK_BOUNDARY_EVERY == 0:
+            chunks.append(chunk)
+            chunk, used = [], 0
+
+    if chunk:
+        chunks.append(chunk)
+    return chunks
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Review Store - Compact columnar in-memory storage for large review sets
+Demonstrates array-backed columns and offset-indexed text storage
+
+Memory target: at most 64 bytes per review of fixed overhead, plus the
+UTF-8 size of the review's text, id and date. A list of Review
+dataclasses costs several hundred bytes per row before counting the
+strings.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from vectorized_stats import compute_statistics, grouped_statistics
+
+
+# Target fixed overhead per review in bytes (see memory_usage())
+TARGET_BYTES_PER_REVIEW = 64
+
+# Stored in the date column when a review has no parseable date
+MISSING_DATE = -(2 ** 63)
+
+# Binary snapshot format (see ReviewStore.save_snapshot)
+SNAPSHOT_EXTENSION = ".revsnap"
+SNAPSHOT_MAGIC = b"REVSNAP\x00"
+SNAPSHOT_VERSION = 2
+_HEADER_LENGTH = struct.Struct("<Q")
+
+# Column name -> attribute, in file order
+_SNAPSHOT_COLUMNS = (
+    ("product_id", "product_ids"),
+    ("rating", "ratings"),
+    ("helpful_votes", "helpful_votes"),
+    ("date", "dates"),
+    ("text_length", "text_lengths"),
+    ("text_offsets", "_text_offsets"),
+    ("text", "_text"),
+    ("id_offsets", "_id_offsets"),
+    ("id", "_ids"),
+    ("date_text_offsets", "_date_text_offsets"),
+    ("date_text", "_date_text"),
+    ("value_kind", "_value_kinds"),
+    ("reviewer_code", "_reviewer_codes"),
+)
+
+# _value_kinds bits: the id / date is stored as JSON (it was not a str)
+_JSON_ID = 1
+_JSON_DATE = 2
+
+
+def parse_review_date(value: Optional[str]) -> int:
+    """Convert an ISO date string to epoch seconds (naive dates are UTC)"""
+    if not value or not isinstance(value, str):
+        return MISSING_DATE
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return MISSING_DATE
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def format_review_date(timestamp: int) -> str:
+    """Convert epoch seconds from the date column back to an ISO string"""
+    if timestamp == MISSING_DATE:
+        return ''
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def _encode_value(value: Any) -> Tuple[bytes, bool]:
+    """UTF-8 bytes of a str, or of the JSON form of anything else (True if JSON)"""
+    if isinstance(value, str):
+        return value.encode('utf-8'), False
+    return json.dumps(value).encode('utf-8'), True
+
+
+def _text_field(review: Any, name: str) -> str:
+    """A string field of a review, with None read as '' (TypeError otherwise)"""
+    value = getattr(review, name)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise TypeError(f"{name} must be a string, not {type(value).__name__}")
+    return value
+
+
+class ReviewStore:
+    """
+    Columnar review storage
+
+    Numeric fields live in typed arrays (product_id, rating,
+    helpful_votes, date as epoch seconds, text length). Review text, ids
+    and the original date strings are concatenated into UTF-8 buffers
+    addressed by an offset table, and reviewer names are interned. Ids
+    and dates that are not strings are stored as JSON, so rows come back
+    exactly as they went in. Rows are only turned back into Review
+    objects on request.
+    """
+
+    def __init__(self):
+        """Initialize an empty store"""
+        self.product_ids = array('q')
+        self.ratings = array('b')
+        self.helpful_votes = array('i')
+        self.dates = array('q')
+        self.text_lengths = array('I')
+
+        # Offset-indexed UTF-8 text; row i spans _text_offsets[i]:_text_offsets[i + 1]
+        self._text = bytearray()
+        self._text_offsets = array('Q', [0])
+        self._ids = bytearray()
+        self._id_offsets = array('Q', [0])
+        # Dates as given; `dates` holds the parsed epoch seconds for filtering
+        self._date_text = bytearray()
+        self._date_text_offsets = array('Q', [0])
+        self._value_kinds = array('B')
+
+        # Interned reviewer names
+        self._reviewer_codes = array('I')
+        self._reviewers: List[str] = []
+        self._reviewer_lookup: Dict[str, int] = {}
+
+        # product_id -> row numbers (built lazily for snapshots)
+        self._product_rows: Optional[Dict[int, array]] = {}
+
+        # Set when the columns are views over a memory-mapped snapshot
+        self._mmap: Optional[mmap.mmap] = None
+        self._views: List[memoryview] = []
+
+    @classmethod
+    def from_reviews(cls, reviews: Iterable[Any]) -> "ReviewStore":
+        """Build a store from any iterable of Review objects (list or generator)"""
+        store = cls()
+        store.extend(reviews)
+        return store
+
+    def append(self, review: Any) -> None:
+        """
+        Add a Review (or any object with the same attributes)
+
+        A missing (None) text or reviewer is stored as ''. Raises
+        OverflowError (or TypeError) and leaves the store unchanged if a
+        numeric field does not fit its column or a string field is not a
+        string.
+        """
+        if self._mmap is not None:
+            raise ValueError("A snapshot-backed ReviewStore is read-only")
+
+        text = _text_field(review, 'text')
+        reviewer = _text_field(review, 'reviewer')
+        id_bytes, id_is_json = _encode_value(review.id)
+        date_bytes, date_is_json = _encode_value(review.date)
+        text_bytes = text.encode('utf-8')
+
+        numeric = (
+            (self.product_ids, review.product_id),
+            (self.ratings, review.rating),
+            (self.helpful_votes, review.helpful_votes),
+            (self.dates, parse_review_date(review.date)),
+            (self.text_lengths, len(text)),
+        )
+        appended = 0
+        try:
+            for column, value in numeric:
+                column.append(value)
+                appended += 1
+        except (OverflowError, TypeError):
+            # Keep the columns aligned: undo this row's partial append
+            for column, _ in numeric[:appended]:
+                column.pop()
+            raise
+
+        row = len(self.ratings) - 1
+
+        self._text += text_bytes
+        self._text_offsets.append(len(self._text))
+        self._ids += id_bytes
+        self._id_offsets.append(len(self._ids))
+        self._date_text += date_bytes
+        self._date_text_offsets.append(len(self._date_text))
+        self._value_kinds.append((_JSON_ID if id_is_json else 0) | (_JSON_DATE if date_is_json else 0))
+
+        code = self._reviewer_lookup.get(reviewer)
+        if code is None:
+            code = len(self._reviewers)
+            self._reviewers.append(reviewer)
+            self._reviewer_lookup[reviewer] = code
+        self._reviewer_codes.append(code)
+
+        rows = self._product_rows.get(review.product_id)
+        if rows is None:
+            rows = self._product_rows[review.product_id] = array('I')
+        rows.append(row)
+
+    def extend(self, reviews: Iterable[Any]) -> None:
+        """Add several reviews"""
+        for review in reviews:
+            self.append(review)
+
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+    def text(self, row: int) -> str:
+        """Decode the review text of a row"""
+        return str(self._text[self._text_offsets[row]:self._text_offsets[row + 1]], 'utf-8')
+
+    def review_id(self, row: int) -> Any:
+        """Decode the review id of a row, with the type it was added with"""
+        value = str(self._ids[self._id_offsets[row]:self._id_offsets[row + 1]], 'utf-8')
+        return json.loads(value) if self._value_kinds[row] & _JSON_ID else value
+
+    def review_date(self, row: int) -> Any:
+        """The date of a row exactly as it was added (see `dates` for epoch seconds)"""
+        value = str(self._date_text[self._date_text_offsets[row]:self._date_text_offsets[row + 1]], 'utf-8')
+        return json.loads(value) if self._value_kinds[row] & _JSON_DATE else value
+
+    def reviewer(self, row: int) -> str:
+        """Reviewer name of a row"""
+        return self._reviewers[self._reviewer_codes[row]]
+
+    def _product_index(self) -> Dict[int, array]:
+        """product_id -> row numbers, built on first use for snapshots"""
+        if self._product_rows is None:
+            index: Dict[int, array] = {}
+            for row, product_id in enumerate(self.product_ids):
+                rows = index.get(product_id)
+                if rows is None:
+                    rows = index[product_id] = array('I')
+                rows.append(row)
+            self._product_rows = index
+        return self._product_rows
+
+    def product_ids_present(self) -> List[int]:
+        """All product ids in first-seen order"""
+        return list(self._product_index())
+
+    def product_rows(self, product_id: Optional[int] = None) -> Iterable[int]:
+        """Row numbers for a product, or every row if product_id is None"""
+        if product_id is None:
+            return range(len(self))
+        return self._product_index().get(product_id, ())
+
+    def __getitem__(self, row: int):
+        """Materialize one row as a Review"""
+        from data_import import Review
+
+        if row < 0:
+            row += len(self)
+        return Review(
+            id=self.review_id(row),
+            product_id=self.product_ids[row],
+            rating=self.ratings[row],
+            text=self.text(row),
+            reviewer=self.reviewer(row),
+            date=self.review_date(row),
+            helpful_votes=self.helpful_votes[row]
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def statistics(self, product_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Same result as DataImporter.get_statistics, computed from the
+        numeric columns without decoding any text
+        """
+        if product_id is None:
+            return compute_statistics(self.ratings, self.helpful_votes, self.text_lengths)
+
+        rows = self.product_rows(product_id)
+        return compute_statistics(
+            [self.ratings[i] for i in rows],
+            [self.helpful_votes[i] for i in rows],
+            [self.text_lengths[i] for i in rows]
+        )
+
+    def grouped_statistics(self) -> Dict[int, Dict[str, Any]]:
+        """statistics() for every product at once, keyed by product_id"""
+        return grouped_statistics(self.product_ids, self.ratings, self.helpful_votes, self.text_lengths)
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """
+        Bytes used by the store's buffers
+
+        `fixed_bytes_per_review` covers the numeric columns, offset
+        tables, reviewer codes and product index, and is what
+        TARGET_BYTES_PER_REVIEW is measured against.
+        """
+        def size(buffer) -> int:
+            return len(buffer) * getattr(buffer, 'itemsize', 1)
+
+        fixed = sum(size(column) for column in (
+            self.product_ids, self.ratings, self.helpful_votes, self.dates,
+            self.text_lengths, self._text_offsets, self._id_offsets, self._date_text_offsets,
+            self._value_kinds, self._reviewer_codes
+        ))
+        fixed += sum(size(rows) for rows in (self._product_rows or {}).values())
+        variable = len(self._text) + len(self._ids) + len(self._date_text)
+        count = len(self)
+
+        return {
+            'reviews': count,
+            'fixed_bytes': fixed,
+            'text_id_and_date_bytes': variable,
+            'reviewer_names': len(self._reviewers),
+            'total_bytes': fixed + variable,
+            'fixed_bytes_per_review': fixed / count if count else 0.0,
+            'total_bytes_per_review': (fixed + variable) / count if count else 0.0
+        }
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Write the store as a binary columnar snapshot
+        
+        Layout: 8-byte magic, little-endian u64 header length, a JSON
+        header (format version, byte order, row count and each column's
+        type code, offset and length), then the raw column buffers, each
+        aligned to 8 bytes. Text, ids, date strings and reviewer names are
+        stored as UTF-8 blobs addressed by offset columns.
+        
+        Args:
+            path: Output file path (conventionally ending in .revsnap)
+        """
+        reviewer_blob = bytearray()
+        reviewer_offsets = array('Q', [0])
+        for name in self._reviewers:
+            reviewer_blob += name.encode('utf-8')
+            reviewer_offsets.append(len(reviewer_blob))
+
+        buffers = [(name, getattr(self, attribute)) for name, attribute in _SNAPSHOT_COLUMNS]
+        buffers += [("reviewer_offsets", reviewer_offsets), ("reviewer", reviewer_blob)]
+
+        columns = {}
+        position = 0
+        for name, buffer in buffers:
+            position = _align(position)
+            typecode = getattr(buffer, 'typecode', None) or getattr(buffer, 'format', 'B')
+            itemsize = getattr(buffer, 'itemsize', 1)
+            columns[name] = {'type': typecode, 'offset': position, 'count': len(buffer)}
+            position += len(buffer) * itemsize
+
+        header = json.dumps({
+            'format': 'review-snapshot',
+            'version': SNAPSHOT_VERSION,
+            'byteorder': sys.byteorder,
+            'row_count': len(self),
+            'columns': columns
+        }).encode('utf-8')
+        data_start = _align(len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size + len(header))
+
+        with open(path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            for name, buffer in buffers:
+                f.write(b'\0' * (data_start + columns[name]['offset'] - f.tell()))
+                f.write(memoryview(buffer).cast('B'))
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "ReviewStore":
+        """
+        Open a snapshot written by save_snapshot without parsing it
+        
+        The file is memory-mapped and every column is a typed memoryview
+        over the mapping, so opening is O(1) in the number of reviews and
+        pages are only read when a column is touched. The returned store
+        is read-only; call close() to release the mapping.
+        
+        Args:
+            path: Path to a .revsnap file
+            
+        Returns:
+            Read-only ReviewStore backed by the file
+        """
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if mapping[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a review snapshot: {path}")
+            header_start = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+            (header_length,) = _HEADER_LENGTH.unpack_from(mapping, len(SNAPSHOT_MAGIC))
+            header = json.loads(mapping[header_start:header_start + header_length])
+            if header.get('version') != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version: {header.get('version')}")
+            if header.get('byteorder') != sys.byteorder:
+                raise ValueError(f"Snapshot byte order {header.get('byteorder')} does not match this machine")
+        except Exception:
+            mapping.close()
+            raise
+
+        data_start = _align(header_start + header_length)
+        store = cls()
+        store._mmap = mapping
+        base = memoryview(mapping)
+        store._views.append(base)
+
+        def column(name: str) -> memoryview:
+            spec = header['columns'][name]
+            itemsize = struct.calcsize(spec['type'])
+            start = data_start + spec['offset']
+            raw = base[start:start + spec['count'] * itemsize]
+            view = raw.cast(spec['type']) if spec['type'] != 'B' else raw
+            store._views.extend((raw, view))
+            return view
+
+        for name, attribute in _SNAPSHOT_COLUMNS:
+            setattr(store, attribute, column(name))
+        store._reviewers = _OffsetStrings(column('reviewer'), column('reviewer_offsets'))
+        store._reviewer_lookup = {}
+        store._product_rows = None
+        return store
+
+    def close(self) -> None:
+        """Release the memory mapping of a snapshot-backed store"""
+        if self._mmap is None:
+            return
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+        self._mmap = None
+
+
+class _OffsetStrings(Sequence):
+    """Read-only list of strings decoded on access from a UTF-8 blob"""
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+
+def _align(position: int, boundary: int = 8) -> int:
+    """Round position up to a multiple of boundary"""
+    return -(-position // boundary) * boundary
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Review Search Index - Inverted index with BM25 ranking over review text
+Demonstrates information retrieval with incremental index maintenance
+
+Text is tokenized exactly like ReviewAnalyzer topic extraction
+(topic_tokens.topic_words: lowercase words, stop words and words of 3
+characters or fewer dropped), so a phrase query matches when its
+remaining words are adjacent in a review.
+"""
+
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from topic_tokens import topic_words
+
+
+# BM25 parameters (the common Lucene/Elasticsearch defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+@dataclass
+class SearchHit:
+    """One ranked search result"""
+    review: Any
+    score: float
+
+
+class ReviewSearchIndex:
+    """
+    Positional inverted index over review text
+
+    Reviews can be added and removed one at a time, so the index can be
+    kept current while reviews are loaded. Queries combine free terms
+    (any may match) and quoted phrases (all must match), optionally
+    filtered by product and rating range, and are ranked with BM25.
+    """
+
+    def __init__(self, tokenizer: Optional[Callable[[str], List[str]]] = None):
+        """Initialize an empty index"""
+        self.tokenize = tokenizer or topic_words
+        # term -> doc_id -> positions of the term in that document
+        self._postings: Dict[str, Dict[int, List[int]]] = defaultdict(dict)
+        self._docs: Dict[int, Tuple[Any, Any, Optional[int], int]] = {}
+        self._next_doc_id = 0
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, review: Any, text: str, product_id: Any = None, rating: Optional[int] = None) -> int:
+        """
+        Index one review
+
+        Args:
+            review: Object returned in search hits (e.g. the review dict)
+            text: Review text to index
+            product_id: Product the review belongs to (for filtering)
+            rating: Star rating (for filtering)
+
+        Returns:
+            Document ID to pass to remove()
+        """
+        doc_id = self._next_doc_id
+        self._next_doc_id += 1
+
+        tokens = self.tokenize(text)
+        for position, term in enumerate(tokens):
+            self._postings[term].setdefault(doc_id, []).append(position)
+
+        self._docs[doc_id] = (review, product_id, rating, len(tokens))
+        self._total_length += len(tokens)
+        return doc_id
+
+    def add_review(self, review: Dict) -> int:
+        """Index a review dict as used by ReviewAnalyzer"""
+        return self.add(review, review.get('review_text', ''), review.get('product_id'), review.get('rating'))
+
+    def remove(self, doc_id: int, text: str) -> None:
+        """Remove a document; text must be what it was indexed with"""
+        _, _, _, length = self._docs.pop(doc_id)
+        self._total_length -= length
+
+        for term in set(self.tokenize(text)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], **kwargs) -> "ReviewSearchIndex":
+        """Index plain review strings (each string is its own hit object)"""
+        index = cls(**kwargs)
+        for text in texts:
+            index.add(text, text)
+        return index
+
+    @staticmethod
+    def parse_query(query: str) -> Tuple[List[str], List[str]]:
+        """Split a query into free terms and "quoted phrases" (raw strings)"""
+        terms, phrases = [], []
+        for phrase, term in _QUERY_PATTERN.findall(query):
+            if phrase:
+                phrases.append(phrase)
+            elif term:
+                terms.append(term)
+        return terms, phrases
+
+    def search(
+        self,
+        query: str,
+        product_id: Any = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        limit: Optional[int] = 10
+    ) -> List[SearchHit]:
+        """
+        Ranked search
+
+        Args:
+            query: Words and/or "quoted phrases"; a review must contain every
+                phrase and, if there are no phrases, at least one word
+            product_id: Only return reviews of this product
+            min_rating: Only return reviews rated at least this
+            max_rating: Only return reviews rated at most this
+            limit: Maximum number of hits (None for all)
+
+        Returns:
+            SearchHit objects, best first (ties keep indexing order)
+        """
+        raw_terms, raw_phrases = self.parse_query(query)
+        terms = self.tokenize(' '.join(raw_terms))
+        phrases = [tokens for tokens in map(self.tokenize, raw_phrases) if tokens]
+
+        # Per-document term frequencies: words score by their own tf,
+        # phrases by the number of times the whole phrase occurs
+        features: List[Dict[int, int]] = []
+        for phrase in phrases:
+            matches = self._phrase_matches(phrase)
+            if not matches:
+                return []
+            features.append(matches)
+
+        if phrases:
+            candidates = set(features[0])
+            for matches in features[1:]:
+                candidates.intersection_update(matches)
+        else:
+            candidates = set()
+            for term in terms:
+                candidates.update(self._postings.get(term, ()))
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings:
+                features.append({doc_id: len(positions) for doc_id, positions in postings.items()})
+
+        candidates = [
+            doc_id for doc_id in candidates
+            if self._matches_filters(doc_id, product_id, min_rating, max_rating)
+        ]
+        if not candidates:
+            return []
+
+        scores = {doc_id: 0.0 for doc_id in candidates}
+        for frequencies in features:
+            idf = self._idf(len(frequencies))
+            for doc_id in candidates:
+                tf = frequencies.get(doc_id)
+                if tf:
+                    scores[doc_id] += idf * self._tf_weight(tf, self._docs[doc_id][3])
+
+        ranked = sorted(candidates, key=lambda doc_id: (-scores[doc_id], doc_id))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [SearchHit(self._docs[doc_id][0], scores[doc_id]) for doc_id in ranked]
+
+    def _phrase_matches(self, phrase: List[str]) -> Dict[int, int]:
+        """doc_id -> number of occurrences of the phrase"""
+        postings = [self._postings.get(term) for term in phrase]
+        if not all(postings):
+            return {}
+
+        # Start from the rarest term's documents
+        docs = set(min(postings, key=len))
+        for term_postings in postings:
+            docs.intersection_update(term_postings)
+
+        matches = {}
+        for doc_id in docs:
+            starts = set(postings[0][doc_id])
+            for offset, term_postings in enumerate(postings[1:], 1):
+                starts.intersection_update(p - offset for p in term_postings[doc_id])
+                if not starts:
+                    break
+            if starts:
+                matches[doc_id] = len(starts)
+        return matches
+
+    def _matches_filters(
+        self,
+        doc_id: int,
+        product_id: Any,
+        min_rating: Optional[int],
+        max_rating: Optional[int]
+    ) -> bool:
+        """Check a document against the product and rating filters"""
+        _, doc_product, rating, _ = self._docs[doc_id]
+        if product_id is not None and doc_product != product_id:
+            return False
+        if min_rating is not None and (rating is None or rating < min_rating):
+            return False
+        if max_rating is not None and (rating is None or rating > max_rating):
+            return False
+        return True
+
+    def _idf(self, document_frequency: int) -> float:
+        """BM25 inverse document frequency (always positive)"""
+        n = len(self._docs)
+        return math.log(1 + (n - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _tf_weight(self, tf: int, length: int) -> float:
+        """BM25 saturated term frequency with length normalization"""
+        average_length = self._total_length / len(self._docs) if self._docs else 0
+        norm = 1 - BM25_B + BM25_B * (length / average_length if average_length else 0)
+        return tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
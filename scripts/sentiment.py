@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Sentiment Lexicon - Single-pass keyword scoring for review text
+Demonstrates precompiled lookup tables for fast text classification
+"""
+
+import string
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import SentimentKeywords
+
+
+POSITIVE = 1
+NEGATIVE = -1
+NEUTRAL = 0
+
+
+@dataclass
+class SentimentScore:
+    """Keyword hit counts for a single piece of text"""
+    positive: int = 0
+    negative: int = 0
+    neutral: int = 0
+
+
+class SentimentLexicon:
+    """
+    Precompiled sentiment lexicon
+
+    Each review is tokenized once and every token is resolved with a
+    single dict lookup, so scoring is O(text length) regardless of how
+    many keywords are configured. Matching is on whole tokens, which
+    means "bad" no longer fires inside "badge".
+    """
+
+    # Punctuation becomes whitespace so str.split() yields the tokens;
+    # hyphens and apostrophes are kept to match "so-so" and "don't"
+    _PUNCTUATION = string.punctuation.replace("-", "").replace("'", "")
+    TRANSLATION_TABLE = str.maketrans({
+        **{c: " " for c in _PUNCTUATION + "\u201c\u201d\u2026\u2013\u2014"},
+        "\u2018": "'",
+        "\u2019": "'"
+    })
+    _EDGE_CHARS = "-'"
+
+    def __init__(
+        self,
+        positive: Iterable[str],
+        negative: Iterable[str],
+        neutral: Iterable[str] = ()
+    ):
+        """Build the token -> polarity lookup table"""
+        self._polarity: Dict[str, int] = {}
+        for word in neutral:
+            self._polarity[word.lower()] = NEUTRAL
+        for word in positive:
+            self._polarity[word.lower()] = POSITIVE
+        # Negative wins if a word is listed under both polarities
+        for word in negative:
+            self._polarity[word.lower()] = NEGATIVE
+
+    @classmethod
+    def from_config(cls) -> "SentimentLexicon":
+        """Create a lexicon seeded from SentimentKeywords in config.py"""
+        return cls(
+            SentimentKeywords.POSITIVE_KEYWORDS,
+            SentimentKeywords.NEGATIVE_KEYWORDS,
+            SentimentKeywords.NEUTRAL_KEYWORDS
+        )
+
+    def words(self, polarity: int) -> frozenset:
+        """Get all lexicon words with the given polarity"""
+        return frozenset(w for w, p in self._polarity.items() if p == polarity)
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split text into lowercase tokens"""
+        return text.lower().translate(self.TRANSLATION_TABLE).split()
+
+    def score(self, text: str) -> SentimentScore:
+        """Count positive, negative and neutral keyword hits in one pass"""
+        return SentimentScore(*self._count(text))
+
+    def _count(self, text: str) -> Tuple[int, int, int]:
+        """Hot path behind score(): (positive, negative, neutral) hit counts"""
+        positive = negative = neutral = 0
+        lookup = self._polarity.get
+        edge = self._EDGE_CHARS
+
+        for token in text.lower().translate(self.TRANSLATION_TABLE).split():
+            polarity = lookup(token)
+            if polarity is None:
+                # Retry without surrounding quotes/dashes, e.g. 'great'
+                if token[0] not in edge and token[-1] not in edge:
+                    continue
+                polarity = lookup(token.strip(edge))
+                if polarity is None:
+                    continue
+            if polarity == POSITIVE:
+                positive += 1
+            elif polarity == NEGATIVE:
+                negative += 1
+            else:
+                neutral += 1
+
+        return positive, negative, neutral
+
+    def classify(self, text: str, rating: Optional[int] = 0) -> int:
+        """
+        Classify a review as POSITIVE, NEGATIVE or NEUTRAL
+
+        A rating of 4+ or more positive than negative hits is positive;
+        otherwise a rating of 2 or below (including a missing rating) or
+        more negative hits is negative.
+        """
+        rating = rating or 0
+        if rating >= 4:
+            return POSITIVE
+
+        positive, negative, _ = self._count(text)
+        if positive > negative:
+            return POSITIVE
+        elif rating <= 2 or negative > positive:
+            return NEGATIVE
+        return NEUTRAL
+
+
+# Shared default instance, built once at import time
+DEFAULT_LEXICON = SentimentLexicon.from_config()
+
+
+__all__ = [
+    'SentimentLexicon',
+    'SentimentScore',
+    'DEFAULT_LEXICON',
+    'POSITIVE',
+    'NEGATIVE',
+    'NEUTRAL'
+]
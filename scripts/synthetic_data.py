@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data - Deterministic product and review corpus generator
+Demonstrates reproducible test-data generation at scale
+
+The corpus mimics real marketplace data closely enough for performance
+work: review counts per product follow a Zipf-like long tail, ratings
+have the usual J-shaped skew (mostly 5 stars, a bump at 1 star), text
+length is log-normal (median around 40 words, a few very long reviews)
+and the sentiment words used agree with the rating. The same seed
+always produces byte-identical output.
+"""
+
+import json
+import math
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from config import Config, SentimentKeywords
+
+
+# Named corpus sizes used by benchmark.py
+SCALES = {
+    '10k': 10_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000
+}
+
+# Share of reviews per star rating (J-shaped, as on most marketplaces)
+RATING_WEIGHTS = {5: 0.45, 4: 0.25, 3: 0.10, 2: 0.07, 1: 0.13}
+
+# Log-normal review length in words: median ~40, long tail
+LENGTH_MU = math.log(40)
+LENGTH_SIGMA = 0.8
+MAX_WORDS = Config.MAX_REVIEW_LENGTH // 6
+
+CATEGORIES = ["electronics", "jewelery", "men's clothing", "women's clothing", "home", "sports"]
+
+NOUNS = [
+    "battery", "screen", "camera", "charger", "sound", "speaker", "fabric",
+    "stitching", "size", "color", "material", "price", "shipping", "delivery",
+    "packaging", "instructions", "design", "weight", "handle", "strap",
+    "zipper", "button", "display", "keyboard", "cable", "warranty", "seller",
+    "customer service", "setup", "finish", "fit", "comfort", "noise", "motor"
+]
+
+FILLER = [
+    "i", "bought", "this", "for", "my", "the", "it", "is", "was", "and",
+    "after", "two", "weeks", "really", "very", "a", "bit", "but", "so",
+    "would", "again", "just", "use", "every", "day", "arrived", "with",
+    "overall", "not", "too", "much", "works", "as", "described", "feels"
+]
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Casey", "Riley", "Morgan", "Jamie", "Avery", "Quinn"]
+
+START_DATE = datetime(2022, 1, 1)
+DATE_SPAN_DAYS = 3 * 365
+
+
+class SyntheticCorpus:
+    """
+    Deterministic generator of products and reviews
+
+    Products and reviews are produced lazily, so a 10M-review corpus can
+    be streamed to disk without holding it in memory.
+    """
+
+    def __init__(self, seed: int = 42):
+        """Initialize the generator; equal seeds give identical corpora"""
+        self.seed = seed
+        self._ratings = list(RATING_WEIGHTS)
+        self._rating_cumulative = []
+        total = 0.0
+        for rating in self._ratings:
+            total += RATING_WEIGHTS[rating]
+            self._rating_cumulative.append(total)
+
+    def products(self, count: int) -> List[Dict[str, Any]]:
+        """Products in the fakestore.json shape"""
+        rng = random.Random(f"{self.seed}-products")
+        products = []
+        for product_id in range(1, count + 1):
+            noun = rng.choice(NOUNS)
+            products.append({
+                "id": product_id,
+                "title": f"{noun.title()} Model {product_id}",
+                "price": round(rng.lognormvariate(3.2, 0.9), 2),
+                "description": f"A {noun} for everyday use.",
+                "category": rng.choice(CATEGORIES),
+                "image": f"https://example.com/images/{product_id}.jpg"
+            })
+        return products
+
+    def iter_reviews(self, count: int, product_count: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield review dicts in the reviews.jsonl shape
+
+        Args:
+            count: Number of reviews
+            product_count: Number of products (defaults to one per 100 reviews)
+        """
+        rng = random.Random(f"{self.seed}-reviews")
+        product_count = product_count or max(1, count // 100)
+        # Zipf-like popularity: product k gets weight 1 / k
+        popularity = []
+        total = 0.0
+        for k in range(1, product_count + 1):
+            total += 1 / k
+            popularity.append(total)
+
+        positive = SentimentKeywords.POSITIVE_KEYWORDS
+        negative = SentimentKeywords.NEGATIVE_KEYWORDS
+        neutral = SentimentKeywords.NEUTRAL_KEYWORDS
+
+        for i in range(count):
+            product_id = self._pick(rng, popularity) + 1
+            rating = self._ratings[self._pick(rng, self._rating_cumulative)]
+            length = min(MAX_WORDS, max(3, int(rng.lognormvariate(LENGTH_MU, LENGTH_SIGMA))))
+
+            # Sentiment words roughly agree with the rating
+            tone = positive if rating >= 4 else (negative if rating <= 2 else neutral)
+            words = []
+            for _ in range(length):
+                roll = rng.random()
+                if roll < 0.12:
+                    words.append(rng.choice(tone))
+                elif roll < 0.15:
+                    words.append(rng.choice(positive if tone is negative else negative))
+                elif roll < 0.35:
+                    words.append(rng.choice(NOUNS))
+                else:
+                    words.append(rng.choice(FILLER))
+            text = ' '.join(words).capitalize() + '.'
+
+            yield {
+                "id": f"review_{i}",
+                "product_id": product_id,
+                "rating": rating,
+                "text": text,
+                "reviewer": f"{rng.choice(FIRST_NAMES)}{rng.randrange(10000)}",
+                "date": (START_DATE + timedelta(days=rng.randrange(DATE_SPAN_DAYS))).date().isoformat(),
+                "helpful_votes": int(rng.expovariate(0.3))
+            }
+
+    @staticmethod
+    def _pick(rng: random.Random, cumulative: List[float]) -> int:
+        """Index drawn from a cumulative weight table"""
+        target = rng.random() * cumulative[-1]
+        low, high = 0, len(cumulative) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if cumulative[middle] < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def write_reviews_jsonl(self, path: str, count: int, product_count: int = None) -> int:
+        """Stream a review corpus to a JSONL file and return the byte size"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for review in self.iter_reviews(count, product_count):
+                f.write(json.dumps(review, ensure_ascii=False) + '\n')
+        return path.stat().st_size
+
+    def write_products_json(self, path: str, count: int) -> None:
+        """Write products as a JSON array"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.products(count), f, indent=2)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic review corpus")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="data/synthetic_reviews.jsonl")
+    args = parser.parse_args()
+
+    size = SyntheticCorpus(args.seed).write_reviews_jsonl(args.output, SCALES[args.scale])
+    print(f"✓ Wrote {SCALES[args.scale]:,} reviews ({size / 1e6:.1f} MB) to {args.output}")
@@ -0,0 +1,6 @@
+"""Pytest setup: the utilities import each other as top-level modules"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,80 @@
+"""Tests for streaming, parallel and external-merge review import"""
+
+import json
+
+from data_import import DataImporter, _parse_jsonl_chunk, _split_on_newlines
+
+
+def write_jsonl(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return str(path)
+
+
+def review_line(review_id, text, **fields):
+    row = {"product_id": 1, "rating": 4, "text": text, "date": "2024-01-01", **fields}
+    if review_id is not None:
+        row["id"] = review_id
+    return json.dumps(row)
+
+
+def test_parallel_jsonl_parse_matches_serial(tmp_path, capsys):
+    lines = [review_line(i, "word " * (i % 7)) for i in range(12)]
+    lines[3] = review_line(None, "no id here")
+    lines[8] = '{"id": 8, "text": broken'
+    lines[10] = review_line(None, "another row without an id")
+    path = write_jsonl(tmp_path / "reviews.jsonl", lines)
+    importer = DataImporter(str(tmp_path))
+
+    serial = list(importer.iter_jsonl_reviews(path))
+    serial_out = capsys.readouterr().out
+    parallel = list(importer.iter_jsonl_reviews_parallel(path, workers=2, chunk_bytes=100))
+    parallel_out = capsys.readouterr().out
+
+    assert parallel == serial
+    assert [review.id for review in serial if isinstance(review.id, str)] == ["review_4", "review_11"]
+    warnings = [line for line in serial_out.splitlines() if line.startswith("Warning:")]
+    assert warnings and warnings[0].startswith("Warning: Invalid JSON on line 9:")
+    assert [line for line in parallel_out.splitlines() if line.startswith("Warning:")] == warnings
+
+
+def test_chunks_end_on_newlines_and_parse_every_line(tmp_path):
+    lines = [review_line(i, "x" * (i * 13)) for i in range(10)]
+    path = write_jsonl(tmp_path / "reviews.jsonl", lines)
+    data = (tmp_path / "reviews.jsonl").read_bytes()
+
+    ranges = _split_on_newlines(path, 64)
+    assert len(ranges) > 1
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    # Every chunk boundary falls right after a newline, so no line straddles two chunks
+    assert all(data[end - 1:end] == b"\n" for _, end in ranges)
+
+    chunks = [_parse_jsonl_chunk(path, start, end) for start, end in ranges]
+    assert sum(chunk.line_count for chunk in chunks) == len(lines)
+    assert [review.id for chunk in chunks for review in chunk.reviews] == list(range(10))
+
+
+def test_external_merge_matches_in_memory_merge(tmp_path, capsys):
+    first = write_jsonl(tmp_path / "first.jsonl", [review_line(i, f"first {i}") for i in range(40)])
+    second = write_jsonl(tmp_path / "second.jsonl", [
+        review_line(i, f"second {i}") for i in range(30, 70, 3)
+    ] + [review_line(5, "duplicate of first"), review_line("5", "string id is a distinct review")])
+    importer = DataImporter(str(tmp_path))
+
+    expected = importer.merge_reviews(first, second)
+    external = list(importer.iter_merged_reviews_external(first, second, memory_budget=256))
+
+    assert external == expected
+    assert len(expected) == 40 + len(range(42, 70, 3)) + 1
+    assert "Warning:" not in capsys.readouterr().out
+
+
+def test_external_merge_warns_when_partition_cap_exceeds_budget(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr("config.PerformanceConfig.MERGE_MAX_PARTITIONS", 2)
+    first = write_jsonl(tmp_path / "first.jsonl", [review_line(i, "text") for i in range(20)])
+    importer = DataImporter(str(tmp_path))
+
+    merged = list(importer.iter_merged_reviews_external(first, first, memory_budget=64))
+
+    assert merged == importer.merge_reviews(first)
+    assert "need more than 2 partitions" in capsys.readouterr().out
@@ -0,0 +1,41 @@
+"""Tests for MinHash/LSH near-duplicate detection and its importer hooks"""
+
+import json
+
+from data_import import DataImporter, Review
+from near_duplicates import NearDuplicateDetector
+
+
+TEXT = "The charging cable stopped working after two weeks of light daily use"
+
+
+def test_reviews_sharing_an_id_are_indexed_separately():
+    detector = NearDuplicateDetector()
+    reviews = [
+        Review(id=None, product_id=1, rating=5, text=TEXT, reviewer="a", date=""),
+        Review(id=None, product_id=2, rating=4, text="Bright lamp with a sturdy base and warm light", reviewer="b",
+               date=""),
+        Review(id="copy", product_id=1, rating=5, text=TEXT + " now", reviewer="c", date=""),
+    ]
+
+    kept = list(detector.filter(reviews))
+
+    assert kept == reviews[:2]
+    assert detector.stats()["indexed"] == 2
+
+
+def test_importers_drop_near_duplicates(tmp_path):
+    rows = [
+        {"id": 1, "product_id": 1, "rating": 2, "text": TEXT, "date": "2024-01-01"},
+        {"id": 2, "product_id": 1, "rating": 2, "text": TEXT.replace("two", "three"), "date": "2024-01-02"},
+        {"id": 3, "product_id": 2, "rating": 5, "text": "Bright lamp with a sturdy base", "date": "2024-01-03"},
+    ]
+    path = tmp_path / "reviews.jsonl"
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    importer = DataImporter(str(tmp_path))
+
+    reviews = importer.import_jsonl_reviews(str(path), near_duplicate_threshold=0.5)
+    store = importer.load_review_store(str(path), near_duplicate_threshold=0.5)
+
+    assert [review.id for review in reviews] == [1, 3]
+    assert [review.id for review in store] == [1, 3]
@@ -0,0 +1,215 @@
+"""Tests for the Ollama client and insight generation against MockOllamaServer"""
+
+import asyncio
+import io
+import socket
+import time
+from types import SimpleNamespace
+
+import requests
+
+from llm_cache import LLMCache
+from mock_ollama import MockOllamaServer
+from ollama_integration import (
+    AsyncOllamaClient,
+    AsyncProductReviewAnalyzer,
+    OllamaClient,
+    OllamaConfig,
+    ProductReviewAnalyzer,
+    TokenStream,
+)
+
+
+def make_client(server, **config):
+    return OllamaClient(OllamaConfig(host="http://127.0.0.1", port=server.port, **config), cache=False)
+
+
+def test_parse_sections_ignores_product_prose():
+    text = "### PRODUCT 1\nProduct 1: solid\nProduct 2 is mentioned here\n\n**PRODUCT 2**\nfine"
+    assert ProductReviewAnalyzer.parse_sections(text, 2) == {
+        1: "Product 1: solid\nProduct 2 is mentioned here",
+        2: "fine",
+    }
+    # A header cannot continue onto the next line
+    assert ProductReviewAnalyzer.parse_sections("### PRODUCT\n1\nbody", 1) == {}
+
+
+def test_parse_sections_reads_mock_output():
+    prompt = "### PRODUCT 1: Cable\nreviews\n\n### PRODUCT 2: Lamp\nreviews"
+    with MockOllamaServer(latency=0) as server:
+        sections = ProductReviewAnalyzer.parse_sections(server.response_text(prompt), 2)
+    assert sorted(sections) == [1, 2]
+    assert sections[1].startswith("Cable:")
+
+
+def test_batched_insights_use_one_call_per_batch():
+    items = [(f"Product {i}", [f"Review of product {i}"]) for i in range(1, 21)]
+    with MockOllamaServer(latency=0) as server:
+        client = make_client(server)
+        try:
+            results = list(ProductReviewAnalyzer(client).generate_insights_batch(items, batch_size=8))
+        finally:
+            client.close()
+        assert server.request_count == 3
+    assert [result.product_name for result in results] == [name for name, _ in items]
+    assert all(result.ok for result in results)
+
+
+def test_bulk_insights_report_malformed_items_as_errors():
+    items = [
+        ("Cable", ["Works well"]),
+        ("Bad", None),
+        (SimpleNamespace(title="Lamp", rating=4.5, review_count=1), 5),
+        None,
+        ("Desk", ["Sturdy"]),
+    ]
+
+    async def run(server):
+        async with AsyncOllamaClient(make_client(server), concurrency=2) as client:
+            return [result async for result in AsyncProductReviewAnalyzer(client).generate_insights_bulk(items)]
+
+    with MockOllamaServer(latency=0) as server:
+        results = {result.product_name: result for result in asyncio.run(run(server))}
+    assert len(results) == 5
+    assert results["Cable"].ok and results["Desk"].ok
+    assert not results["Bad"].ok and not results["Lamp"].ok and not results["None"].ok
+
+
+def test_bulk_insights_cancel_pending_work_on_early_exit():
+    items = [(f"Product {i}", [f"Review {i}"]) for i in range(10)]
+
+    async def run(server):
+        async with AsyncOllamaClient(make_client(server), concurrency=4) as client:
+            results = AsyncProductReviewAnalyzer(client).generate_insights_bulk(items)
+            # Stop after the second result, while the tasks scheduled behind the first are in flight
+            seen = 0
+            async for _ in results:
+                seen += 1
+                if seen == 2:
+                    break
+            await results.aclose()
+            await asyncio.sleep(0.05)
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    with MockOllamaServer(latency=0.5) as server:
+        leftover = asyncio.run(run(server))
+    assert leftover == []
+    assert server.request_count < len(items)
+
+
+def test_async_close_waits_for_running_calls_before_closing_the_session():
+    events = []
+    sync_client = OllamaClient(OllamaConfig(), cache=False)
+
+    def slow_generate(prompt, model=None):
+        time.sleep(0.2)
+        events.append("generated")
+        return {"response": prompt}
+
+    close_session = sync_client.close
+    sync_client.generate = slow_generate
+    sync_client.close = lambda: (events.append("closed"), close_session())
+
+    async def run():
+        client = AsyncOllamaClient(sync_client, concurrency=1)
+        call = asyncio.ensure_future(client.generate("hi"))
+        await asyncio.sleep(0.05)  # The call is now running on the pool
+        await client.aclose()
+        return await call
+
+    assert asyncio.run(run()) == {"response": "hi"}
+    assert events == ["generated", "closed"]
+
+
+def test_read_timeout_is_reported_once_as_timeout():
+    with MockOllamaServer(latency=1.0) as server:
+        client = make_client(server, timeout=0.5, retry_delay=0)
+        try:
+            result = client.generate("slow prompt")
+        finally:
+            client.close()
+        assert server.request_count == 1
+    assert result["error"] == "Request timeout - Ollama may be overloaded"
+
+
+def test_token_stream_closes_error_responses():
+    response = requests.Response()
+    response.status_code = 503
+    response.raw = io.BytesIO(b"overloaded")
+
+    stream = TokenStream(lambda: response)
+
+    assert list(stream) == []
+    assert stream.error == "API returned status 503"
+    assert response.raw.closed
+
+
+def test_streamed_generate_closes_error_responses():
+    response = requests.Response()
+    response.status_code = 503
+    response.raw = io.BytesIO(b"overloaded")
+    client = OllamaClient(OllamaConfig(), cache=False)
+    client.session.post = lambda *args, **kwargs: response
+
+    assert client.generate("hi", stream=True) == {"error": "API returned status 503"}
+    assert response.raw.closed
+    client.close()
+
+
+def test_async_token_stream_releases_slot_when_stopped_early():
+    async def run(server):
+        async with AsyncOllamaClient(make_client(server), concurrency=1) as client:
+            async with client.stream_generate("a long story") as stream:
+                async for _ in stream:
+                    break
+            # The only concurrency slot is free again
+            return stream.stats.tokens, client._semaphore.locked()
+
+    with MockOllamaServer(latency=0, tokens_per_second=50, response_tokens=200) as server:
+        tokens, locked = asyncio.run(run(server))
+    assert tokens == 1
+    assert not locked
+
+
+def _unused_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def test_down_server_is_reported_without_retrying_probes():
+    client = OllamaClient(OllamaConfig(host="http://127.0.0.1", port=_unused_port(), retry_delay=0.5), cache=False)
+    try:
+        start = time.perf_counter()
+        assert client.is_available() is False
+        assert client.list_models() == []
+        assert time.perf_counter() - start < 0.5
+    finally:
+        client.close()
+
+
+def test_generation_reports_down_server():
+    client = make_client(SimpleNamespace(port=_unused_port()), max_retries=2, retry_delay=0)
+    try:
+        result = client.generate("hello")
+    finally:
+        client.close()
+    assert result["error"] == "Cannot connect to Ollama server"
+
+
+def test_cache_hits_defer_access_writes_until_close(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "cache.db"))
+    client = OllamaClient(OllamaConfig(), cache=cache)
+    cache.set("m", "p", {"response": "cached"})
+    stamp = lambda: cache._connect().execute("SELECT accessed_at FROM llm_cache").fetchone()[0]
+    written = stamp()
+
+    time.sleep(0.01)
+    assert client.generate_cached("p", model="m") == {"response": "cached"}
+    assert stamp() == written  # a hit is a pure read
+
+    client.close()
+    assert cache._conn is None
+    reopened = LLMCache(path=str(tmp_path / "cache.db"))
+    assert reopened._connect().execute("SELECT accessed_at FROM llm_cache").fetchone()[0] > written
+    reopened.close()
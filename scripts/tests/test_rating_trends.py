@@ -0,0 +1,87 @@
+"""Tests for day/week/month rating rollups and date-window queries"""
+
+import json
+
+from data_import import DataImporter, Review
+from rating_trends import RatingTrends
+
+
+# (date, product_id, rating) around a year and a month boundary
+ROWS = [
+    ("2023-12-30", 1, 5),  # Saturday
+    ("2023-12-31", 1, 3),  # Sunday, same week
+    ("2024-01-01", 1, 4),  # Monday: new week, month and year
+    ("2024-01-31", 2, 2),  # Wednesday
+    ("2024-02-01", 1, 1),  # Thursday: same week, new month
+    ("2024-02-29", 2, 5),
+]
+
+
+def make_trends():
+    return RatingTrends.from_reviews(
+        Review(id=i, product_id=product, rating=rating, text="", reviewer="", date=day)
+        for i, (day, product, rating) in enumerate(ROWS)
+    )
+
+
+def totals(points):
+    return [(point.period, point.total_reviews) for point in points]
+
+
+def test_weeks_and_months_roll_up_across_boundaries():
+    trends = make_trends()
+
+    assert totals(trends.series(granularity="week")) == [
+        ("2023-12-25", 2), ("2024-01-01", 1), ("2024-01-29", 2), ("2024-02-26", 1),
+    ]
+    assert totals(trends.series(granularity="month")) == [
+        ("2023-12-01", 2), ("2024-01-01", 2), ("2024-02-01", 2),
+    ]
+    week = trends.series(1, granularity="week")[2]
+    assert (week.period, week.total_reviews, week.average_rating) == ("2024-01-29", 1, 1.0)
+    assert trends.series(granularity="month")[0].rating_distribution == {1: 0, 2: 0, 3: 1, 4: 0, 5: 1}
+
+    # Rollups are rebuilt after new reviews land in an already rolled-up period
+    trends.add(1, 4, 1704585600)  # 2024-01-07, Sunday
+    assert totals(trends.series(granularity="week"))[1] == ("2024-01-01", 2)
+    assert totals(trends.series(granularity="month"))[1] == ("2024-01-01", 3)
+
+
+def test_window_end_is_exclusive():
+    trends = make_trends()
+
+    january = trends.window(start="2024-01-01", end="2024-02-01")
+    assert (january['start'], january['end'], january['total_reviews']) == ("2024-01-01", "2024-02-01", 2)
+    assert january['average_rating'] == 3.0
+
+    # A whole month plus leftover days at both edges
+    assert trends.window(start="2023-12-31", end="2024-02-02")['total_reviews'] == 4
+    # No start: from the earliest review up to (not including) end
+    assert trends.window(end="2024-01-01")['total_reviews'] == 2
+    assert trends.window(end="2024-03-01", days=29)['total_reviews'] == 2
+    assert trends.window(1, start="2024-01-01", end="2024-01-01")['total_reviews'] == 0
+    assert trends.window(2, end="2030-01-01")['total_reviews'] == 2
+
+
+def test_importer_trends_count_only_kept_rows(tmp_path, capsys):
+    rows = [
+        {"id": 1, "product_id": 1, "rating": 5, "text": "solid sturdy cable works well", "date": "2024-01-01"},
+        {"id": 2, "product_id": 1, "rating": 5, "text": "solid sturdy cable works well", "date": "2024-01-02"},
+        {"id": 3, "product_id": 2 ** 70, "rating": 1, "text": "does not fit the store", "date": "2024-01-03"},
+        {"id": 4, "product_id": 1, "rating": 2, "text": "stopped charging after a week", "date": "2024-01-04"},
+    ]
+    path = tmp_path / "reviews.jsonl"
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    importer = DataImporter(str(tmp_path))
+
+    trends = RatingTrends()
+    store = importer.load_review_store(str(path), trends=trends, near_duplicate_threshold=0.8)
+    capsys.readouterr()
+
+    assert [review.id for review in store] == [1, 4]
+    assert trends.total_reviews == 2
+    assert trends.window(end="2024-02-01")['rating_distribution'] == {1: 0, 2: 1, 3: 0, 4: 0, 5: 1}
+
+    trends = RatingTrends()
+    reviews = importer.import_jsonl_reviews(str(path), trends=trends, near_duplicate_threshold=0.8)
+    assert trends.total_reviews == len(reviews) == 3
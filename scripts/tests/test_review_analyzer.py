@@ -0,0 +1,193 @@
+"""Tests for ReviewAnalyzer's cached aggregates, search and topics"""
+
+import json
+
+import pytest
+
+from benchmark import legacy_topic_counts
+from document_frequency import DocumentFrequencyTable
+from review_analyzer import ReviewAnalyzer
+from topic_tokens import count_topic_words
+
+
+REVIEWS = [
+    {'product_id': 1, 'rating': 5, 'review_text': 'Great battery life, the battery life lasts days'},
+    {'product_id': 1, 'rating': 4, 'review_text': 'Bluetooth pairing works and the battery life is fine'},
+    {'product_id': 2, 'rating': 2, 'review_text': 'Customer service never replied about the broken zipper'},
+]
+
+
+def make_analyzer():
+    analyzer = ReviewAnalyzer()
+    analyzer.add_reviews(dict(review) for review in REVIEWS)
+    return analyzer
+
+
+def test_search_after_distinctive_topics_keeps_document_frequencies(tmp_path):
+    analyzer = make_analyzer()
+    table = analyzer.document_frequencies(path=str(tmp_path / "df.json"))
+    analyzer.distinctive_topics(1)
+    assert table.document_count == len(REVIEWS)
+
+    first = analyzer.search("battery")
+    second = analyzer.search("battery")
+
+    assert [hit.review for hit in first] == [hit.review for hit in second]
+    assert table.document_count == len(REVIEWS)
+
+
+def test_remove_review_matches_identity_and_leaves_duplicates():
+    analyzer = make_analyzer()
+    duplicate = dict(REVIEWS[0])
+    analyzer.add_review(duplicate)
+    analyzer.search("battery")
+    analyzer.get_review_counts(1)
+
+    analyzer.remove_review(duplicate)
+
+    assert len(analyzer.reviews) == len(REVIEWS)
+    assert all(review is not duplicate for review in analyzer.reviews)
+    assert all(review is not duplicate for review in analyzer.get_product_reviews(1))
+    assert analyzer.get_review_counts(1).total_reviews == 2
+    assert len(analyzer.search("battery")) == 2
+
+
+def test_adding_the_same_review_object_twice_is_rejected():
+    analyzer = make_analyzer()
+    review = analyzer.reviews[0]
+    analyzer.get_review_counts(1)
+
+    with pytest.raises(ValueError):
+        analyzer.add_review(review)
+
+    assert len(analyzer.reviews) == len(REVIEWS)
+    assert analyzer.get_review_counts(1).total_reviews == 2
+    # The position maps still point at the one copy
+    analyzer.remove_review(review)
+    assert review not in analyzer.reviews
+    assert analyzer.get_product_reviews(1) == [REVIEWS[1]]
+    assert analyzer.get_review_counts(1).total_reviews == 1
+
+
+def test_remove_unknown_review_changes_nothing():
+    analyzer = make_analyzer()
+    analyzer.search("battery")
+    stranger = dict(REVIEWS[0])
+
+    with pytest.raises(ValueError):
+        analyzer.remove_review(stranger)
+
+    assert len(analyzer.reviews) == len(REVIEWS)
+    assert len(analyzer.get_product_reviews(1)) == 2
+    assert len(analyzer.search("battery")) == 2
+
+
+def test_remove_review_keeps_positions_consistent():
+    analyzer = make_analyzer()
+    extra = [{'product_id': 1, 'rating': 3, 'review_text': f'Review number {i}'} for i in range(20)]
+    analyzer.add_reviews(extra)
+    analyzer.reviews.append({'product_id': 2, 'rating': 1, 'review_text': 'Appended directly'})
+
+    for review in extra[::3] + [analyzer.reviews[0]]:
+        analyzer.remove_review(review)
+    remaining = list(analyzer.reviews)
+    for review in remaining:
+        analyzer.remove_review(review)
+
+    assert analyzer.reviews == []
+    assert analyzer.get_product_reviews(1) == [] and analyzer.get_product_reviews(2) == []
+
+
+def test_document_frequencies_are_saved_only_on_request(tmp_path):
+    path = tmp_path / "df.json"
+    analyzer = make_analyzer()
+
+    analyzer.document_frequencies(path=str(path))
+    assert not path.exists()
+
+    analyzer.document_frequencies(path=str(path), save=True)
+    assert json.loads(path.read_text())["document_count"] == len(REVIEWS)
+
+
+def test_saved_document_frequencies_for_another_corpus_are_recounted(tmp_path):
+    path = str(tmp_path / "df.json")
+    make_analyzer().document_frequencies(path=path, save=True)
+
+    same = make_analyzer()
+    assert same.document_frequencies(path=path).document_count == len(REVIEWS)
+
+    other = make_analyzer()
+    other.add_review({'product_id': 3, 'rating': 5, 'review_text': 'Sturdy desk'})
+    assert other.document_frequencies(path=path).document_count == len(REVIEWS) + 1
+
+
+def test_document_frequencies_are_cached_per_path(tmp_path):
+    analyzer = make_analyzer()
+    first = analyzer.document_frequencies(path=str(tmp_path / "a.json"))
+
+    assert analyzer.document_frequencies(path=str(tmp_path / "a.json")) is first
+    assert analyzer.document_frequencies(path=str(tmp_path / "b.json")) is not first
+
+
+def test_phrase_counts_are_cached_and_kept_current(tmp_path):
+    analyzer = make_analyzer()
+    analyzer.document_frequencies(phrases=True, path=str(tmp_path / "phrases.json"))
+    counts = analyzer._phrase_counts(1)
+    assert counts["battery life"] == 3
+
+    review = {'product_id': 1, 'rating': 5, 'review_text': 'Battery life is great'}
+    analyzer.add_review(review)
+    assert analyzer._phrase_counts(1) is counts and counts["battery life"] == 4
+    analyzer.remove_review(review)
+    assert counts["battery life"] == 3
+
+
+def test_parallel_counts_match_serial(monkeypatch):
+    monkeypatch.setattr("config.PerformanceConfig.PARALLEL_MIN_REVIEWS", 0)
+    reviews = [
+        dict(review, rating=(i % 5) + 1 if i % 9 else 0)
+        for i in range(20) for review in REVIEWS
+    ]
+    serial, parallel = ReviewAnalyzer(), ReviewAnalyzer()
+    serial.add_reviews(dict(review) for review in reviews)
+    parallel.add_reviews(dict(review) for review in reviews)
+
+    for product_id in (None, 1):
+        expected = serial.get_review_counts(product_id)
+        counts = parallel.get_review_counts(product_id, workers=2)
+        assert counts == expected
+        # Same insertion order, so most_common ties break the same way
+        assert list(counts.word_counts) == list(expected.word_counts)
+        assert counts.word_counts.most_common(10) == expected.word_counts.most_common(10)
+
+
+def test_distinctive_topics_uses_an_empty_table_it_is_given():
+    analyzer = make_analyzer()
+    assert analyzer.distinctive_topics(1, table=DocumentFrequencyTable()) == []
+    assert not analyzer._document_frequencies
+
+
+def test_document_frequencies_fingerprints_the_corpus_once(tmp_path, monkeypatch):
+    analyzer = make_analyzer()
+    calls = []
+    fingerprint = analyzer._corpus_fingerprint
+    monkeypatch.setattr(analyzer, "_corpus_fingerprint", lambda: calls.append(1) or fingerprint())
+
+    analyzer.document_frequencies(path=str(tmp_path / "df.json"), save=True)
+    assert len(calls) == 1
+
+
+def test_topic_counts_match_the_original_tokenizer():
+    texts = [review['review_text'] for review in REVIEWS] + [
+        "Ünïcode CAFÉ crème, naïve_user's 2024 review: the the battery... batteryx",
+        "snake_case_word and 12345 numbers; it's \t tabs\nnewlines don't-split abcd",
+        "",
+    ]
+    analyzer = ReviewAnalyzer()
+    analyzer.add_reviews({'product_id': 1, 'rating': 3, 'review_text': text} for text in texts)
+
+    expected = legacy_topic_counts(texts)
+    counts = count_topic_words(texts)
+    assert counts == expected
+    assert list(counts) == list(expected)
+    assert analyzer.extract_topics(limit=50) == [word for word, _ in expected.most_common(50)]
@@ -0,0 +1,126 @@
+"""Tests for the columnar ReviewStore and its binary snapshots"""
+
+import json
+
+import pytest
+
+from data_import import DataImporter, Review
+from review_store import MISSING_DATE, ReviewStore
+
+
+REVIEWS = [
+    Review(id=101, product_id=1, rating=5, text="Great cable", reviewer="ann", date="2024-03-01"),
+    Review(id="r-2", product_id=1, rating=2, text="Frayed", reviewer="bob", date="2024-03-02T10:15:00Z",
+           helpful_votes=3),
+    Review(id=None, product_id=2, rating=4, text="Bright lamp ☀", reviewer="ann", date="not a date"),
+]
+
+
+def test_rows_round_trip_with_original_ids_and_dates(tmp_path):
+    store = ReviewStore.from_reviews(REVIEWS)
+    assert list(store) == REVIEWS
+    assert store.dates[2] == MISSING_DATE
+
+    path = str(tmp_path / "reviews.revsnap")
+    store.save_snapshot(path)
+    snapshot = ReviewStore.load_snapshot(path)
+    try:
+        assert list(snapshot) == REVIEWS
+        assert list(snapshot.dates) == list(store.dates)
+    finally:
+        snapshot.close()
+
+
+def test_out_of_range_values_are_skipped_with_a_warning(tmp_path, capsys):
+    path = tmp_path / "reviews.jsonl"
+    rows = [
+        {"id": "ok-1", "product_id": 1, "rating": 5, "text": "fine", "date": "2024-01-01"},
+        {"id": "huge", "product_id": 2 ** 70, "rating": 5, "text": "overflow", "date": "2024-01-01"},
+        {"id": "ok-2", "product_id": 1, "rating": 4, "text": "also fine", "date": "2024-01-02"},
+    ]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+
+    store = DataImporter(str(tmp_path)).load_review_store(str(path))
+
+    assert [review.id for review in store] == ["ok-1", "ok-2"]
+    assert len(store.product_ids) == len(store.ratings) == len(store.dates) == 2
+    assert "Warning: Review huge" in capsys.readouterr().out
+
+
+def test_jsonl_snapshot_jsonl_round_trip(tmp_path):
+    records = [
+        {"id": 7, "product_id": 1, "rating": 5, "text": "Works", "reviewer": "ann",
+         "date": "2024-03-01", "helpful_votes": 2},
+        {"id": "r-8", "product_id": 2, "rating": 1, "text": "Broke in a week ✗", "reviewer": "bob",
+         "date": "2024-03-02T10:15:00Z", "helpful_votes": 0},
+        {"id": 9, "product_id": 1, "rating": 3, "text": "", "reviewer": "cy",
+         "date": "", "helpful_votes": 11},
+    ]
+    source = tmp_path / "source.jsonl"
+    source.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    importer = DataImporter(str(tmp_path))
+
+    assert importer.export_reviews_snapshot(importer.load_review_store(str(source)), "reviews.revsnap")
+    snapshot = str(tmp_path / "reviews.revsnap")
+    assert importer.export_reviews_jsonl(importer.iter_reviews(snapshot), "round_trip.jsonl")
+
+    round_trip = (tmp_path / "round_trip.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in round_trip] == records
+
+    # Every snapshot row is an exact-ID duplicate of its source line
+    assert len(importer.merge_reviews(str(source), snapshot)) == len(records)
+    assert len(list(importer.iter_merged_reviews_external(str(source), snapshot))) == len(records)
+
+
+def test_null_text_and_reviewer_load_as_empty_strings(tmp_path, capsys):
+    path = tmp_path / "reviews.jsonl"
+    rows = [
+        {"id": 1, "product_id": 1, "rating": 5, "text": None, "reviewer": None, "date": "2024-01-01"},
+        {"id": 2, "product_id": 1, "rating": 4, "text": ["not", "text"], "date": "2024-01-02"},
+        {"id": 3, "product_id": 1, "rating": 3, "text": "fine", "date": "2024-01-03"},
+    ]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+
+    store = DataImporter(str(tmp_path)).load_review_store(str(path))
+
+    assert [review.id for review in store] == [1, 3]
+    assert (store.text(0), store.reviewer(0)) == ("", "")
+    assert "Warning: Review 2" in capsys.readouterr().out
+
+    snapshot_path = str(tmp_path / "reviews.revsnap")
+    store.save_snapshot(snapshot_path)
+    snapshot = ReviewStore.load_snapshot(snapshot_path)
+    try:
+        assert list(snapshot) == list(store)
+    finally:
+        snapshot.close()
+
+
+def test_numpy_statistics_match_pure_python_fallback(tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    import vectorized_stats
+
+    store = ReviewStore.from_reviews(
+        Review(id=i, product_id=i % 3 * 7, rating=(i * 7) % 5 + 1, text="x" * (i % 11), reviewer="r",
+               date="2024-01-01", helpful_votes=(2 ** 31 - 1) if i % 4 == 0 else i)
+        for i in range(1, 31)
+    )
+    store.append(Review(id="solo", product_id=99, rating=-1, text="", reviewer="r", date=""))
+    empty = ReviewStore()
+
+    def results():
+        return (
+            store.statistics(), store.grouped_statistics(), store.statistics(product_id=7),
+            store.statistics(product_id=12345), empty.statistics(), empty.grouped_statistics(),
+        )
+
+    vectorized = results()
+    monkeypatch.setattr(vectorized_stats, "HAS_NUMPY", False)
+    fallback = results()
+
+    # Exact equality, including float averages such as 10/3
+    assert vectorized == fallback
+    assert fallback[0] == DataImporter(str(tmp_path)).get_statistics(list(store))
+    assert fallback[3] == fallback[4] == {'total_reviews': 0, 'average_rating': 0, 'rating_distribution': {}}
+    assert fallback[5] == {}
+    assert fallback[1][99]['rating_distribution'] == {-1: 1}
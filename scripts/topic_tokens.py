@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Topic Tokens - Tokenizer shared by topics, search and review selection
+Demonstrates streaming tokenization with precompiled patterns
+
+Topic candidates are lowercase words of 4+ characters that are not stop
+words; phrases are two such words separated only by whitespace. The
+analyzer's topic counts, the document-frequency tables, the search
+index and prompt review selection all tokenize text this way.
+"""
+
+import re
+from collections import Counter
+from itertools import chain, filterfalse
+from typing import Iterable, List
+
+
+# Words ignored when extracting topics
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'is', 'was', 'are', 'be', 'been', 'it', 'this', 'that', 'with'
+})
+
+
+# Topic candidates are words of 4+ characters; matching them directly
+# leaves the short words out of the token stream altogether
+_TOPIC_WORD_PATTERN = re.compile(r'\w{4,}')
+# Two such words separated only by whitespace; the lookahead lets the
+# second word start the next pair, so "great battery life" gives two
+_TOPIC_PHRASE_PATTERN = re.compile(r'\b(\w{4,})(?=\s+(\w{4,})\b)')
+_is_stop_word = STOP_WORDS.__contains__
+
+
+def topic_words(text: str) -> List[str]:
+    """Topic-candidate words of a single review text"""
+    return [w for w in _TOPIC_WORD_PATTERN.findall(text.lower()) if w not in STOP_WORDS]
+
+
+def topic_phrases(text: str) -> List[str]:
+    """Two-word phrases ("battery life") of adjacent topic-candidate words"""
+    return [
+        f"{first} {second}" for first, second in _TOPIC_PHRASE_PATTERN.findall(text.lower())
+        if first not in STOP_WORDS and second not in STOP_WORDS
+    ]
+
+
+def count_topic_words(texts: Iterable[str], counter: Counter = None) -> Counter:
+    """
+    Count topic-candidate words across many texts
+
+    Tokens stream from the compiled pattern straight into the counter,
+    so no per-corpus (or per-review) word list is ever built.
+
+    Args:
+        texts: Review texts
+        counter: Counter to add to (a new one by default)
+
+    Returns:
+        The updated counter
+    """
+    counter = Counter() if counter is None else counter
+    tokens = chain.from_iterable(map(_TOPIC_WORD_PATTERN.findall, map(str.lower, texts)))
+    counter.update(filterfalse(_is_stop_word, tokens))
+    return counter
+
+
+def count_topic_phrases(texts: Iterable[str], counter: Counter = None) -> Counter:
+    """Count two-word topic phrases across many texts (see count_topic_words)"""
+    counter = Counter() if counter is None else counter
+    counter.update(chain.from_iterable(map(topic_phrases, texts)))
+    return counter
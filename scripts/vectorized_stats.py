@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Vectorized Statistics - NumPy backend for review statistics
+Demonstrates bulk histogram and reduction operations over columns
+
+NumPy is optional: every function falls back to a pure-Python loop
+when it is not installed, with identical results.
+"""
+
+from typing import Any, Dict, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+HAS_NUMPY = np is not None
+
+
+def _empty_statistics() -> Dict[str, Any]:
+    """Statistics for an empty review set (matches DataImporter.get_statistics)"""
+    return {
+        'total_reviews': 0,
+        'average_rating': 0,
+        'rating_distribution': {}
+    }
+
+
+def rating_histogram(ratings: Sequence[int]) -> Dict[int, int]:
+    """Count of each rating value present"""
+    if not HAS_NUMPY:
+        histogram = {}
+        for rating in ratings:
+            histogram[rating] = histogram.get(rating, 0) + 1
+        return histogram
+
+    values = np.asarray(ratings, dtype=np.int64)
+    if values.size == 0:
+        return {}
+    offset = int(values.min())
+    counts = np.bincount(values - offset)
+    return {int(i) + offset: int(c) for i, c in enumerate(counts) if c}
+
+
+def compute_statistics(
+    ratings: Sequence[int],
+    helpful_votes: Sequence[int],
+    text_lengths: Sequence[int]
+) -> Dict[str, Any]:
+    """
+    Review statistics from column data
+
+    Returns the same dictionary as DataImporter.get_statistics.
+    """
+    total = len(ratings)
+    if total == 0:
+        return _empty_statistics()
+
+    if not HAS_NUMPY:
+        return {
+            'total_reviews': total,
+            'average_rating': sum(ratings) / total,
+            'min_rating': min(ratings),
+            'max_rating': max(ratings),
+            'rating_distribution': rating_histogram(ratings),
+            'total_helpful_votes': sum(helpful_votes),
+            'average_text_length': sum(text_lengths) / total
+        }
+
+    rating_values = np.asarray(ratings, dtype=np.int64)
+    return {
+        'total_reviews': total,
+        'average_rating': int(rating_values.sum()) / total,
+        'min_rating': int(rating_values.min()),
+        'max_rating': int(rating_values.max()),
+        'rating_distribution': rating_histogram(rating_values),
+        'total_helpful_votes': int(np.asarray(helpful_votes, dtype=np.int64).sum()),
+        'average_text_length': int(np.asarray(text_lengths, dtype=np.int64).sum()) / total
+    }
+
+
+def grouped_statistics(
+    product_ids: Sequence[int],
+    ratings: Sequence[int],
+    helpful_votes: Sequence[int],
+    text_lengths: Sequence[int]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Per-product statistics for every product in one call
+
+    With NumPy the columns are grouped once (unique + bincount) instead
+    of looping over reviews once per product.
+    """
+    if len(product_ids) == 0:
+        return {}
+
+    if not HAS_NUMPY:
+        groups: Dict[int, list] = {}
+        for i, product_id in enumerate(product_ids):
+            groups.setdefault(product_id, []).append(i)
+        return {
+            product_id: compute_statistics(
+                [ratings[i] for i in rows],
+                [helpful_votes[i] for i in rows],
+                [text_lengths[i] for i in rows]
+            )
+            for product_id, rows in groups.items()
+        }
+
+    products, group = np.unique(np.asarray(product_ids, dtype=np.int64), return_inverse=True)
+    rating_values = np.asarray(ratings, dtype=np.int64)
+    group_count = len(products)
+
+    totals = np.bincount(group, minlength=group_count)
+    rating_sums = np.bincount(group, weights=rating_values, minlength=group_count)
+    vote_sums = np.bincount(group, weights=np.asarray(helpful_votes, dtype=np.int64), minlength=group_count)
+    length_sums = np.bincount(group, weights=np.asarray(text_lengths, dtype=np.int64), minlength=group_count)
+
+    min_ratings = np.full(group_count, np.iinfo(np.int64).max)
+    max_ratings = np.full(group_count, np.iinfo(np.int64).min)
+    np.minimum.at(min_ratings, group, rating_values)
+    np.maximum.at(max_ratings, group, rating_values)
+
+    # 2-D histogram: one row per product, one column per rating value
+    offset = int(rating_values.min())
+    width = int(rating_values.max()) - offset + 1
+    histogram = np.bincount(group * width + (rating_values - offset), minlength=group_count * width)
+    histogram = histogram.reshape(group_count, width)
+
+    result = {}
+    for g, product_id in enumerate(products.tolist()):
+        total = int(totals[g])
+        result[product_id] = {
+            'total_reviews': total,
+            'average_rating': int(rating_sums[g]) / total,
+            'min_rating': int(min_ratings[g]),
+            'max_rating': int(max_ratings[g]),
+            'rating_distribution': {
+                r + offset: int(c) for r, c in enumerate(histogram[g].tolist()) if c
+            },
+            'total_helpful_votes': int(vote_sums[g]),
+            'average_text_length': int(length_sums[g]) / total
+        }
+    return result